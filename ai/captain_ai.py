@@ -1,112 +1,52 @@
 # ai/captain_ai.py
 from core.ai_manager import AIManager
-from core.context_manager import CAPTAINContextManager
-from typing import Dict, List, Any
-import json
+from core.context_manager import CAPTAINContextManager, compact_json
+from core.section_parser import parse_sections, sections_to_lists, sections_to_text
+from typing import Callable, Dict, Iterator, List, Any, Optional, Tuple
+from config import CAPTAIN_REPORT_CONCURRENCY, LLM_CALL_TIMEOUT_SECONDS
+import asyncio
 
 class CaptainAI:
     def __init__(self, ai_manager: AIManager, context_manager: CAPTAINContextManager):
         self.ai_manager = ai_manager
         self.context_manager = context_manager
+        self.last_context_report: Dict[str, Any] = {}
 
     def generate_job_search_overview(self) -> str:
-        context = self.context_manager.get_context_for_captain()
-        
-        prompt = """Provide a comprehensive overview of the user's current job search status. Use the following information:
+        return self.ai_manager.generate_response("job_search_overview", self._job_search_overview_context())
 
-Active Job Applications:
-{active_applications}
+    def stream_job_search_overview(self) -> Iterator[str]:
+        return self.ai_manager.stream_response("job_search_overview", self._job_search_overview_context())
 
-Recent Resume Changes:
-{recent_resume_changes}
-
-Job Market Trends:
-{job_market_trends}
-
-Overall Application Success Rate:
-{success_rate}
-
-Analyze this information and provide:
-1. Summary of active applications and their statuses
-2. Insights on application success rate and areas for improvement
-3. Suggestions for new job opportunities based on the user's profile
-4. Advice on resume improvements or skills to develop
-5. Motivational message and next steps for the user's job search
-6. Gamification update (e.g., "Job Search Level" or "Application Streaks")
-
-Your response should be strategic, insightful, and actionable, with a focus on motivation and progress."""
-
-        return self.ai_manager.generate_response("job_search_overview", {
-            "active_applications": json.dumps(context['all_applications'], indent=2),
+    def _job_search_overview_context(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if context is None:
+            context = self._build_context()
+        return {
+            "active_applications": context['applications'],
             "recent_resume_changes": context['master_resume'],
-            "job_market_trends": json.dumps(context['global_insights'].get('job_market_trends', {}), indent=2),
+            "job_market_trends": context['job_market_trends'],
             "success_rate": self.context_manager.get_application_success_rate()
-        })
+        }
 
     def suggest_weekend_project(self) -> Dict[str, str]:
-        context = self.context_manager.get_context_for_captain()
-        
-        prompt = """Based on the user's current job applications, resume, and market trends, suggest a weekend project that would enhance their skills and job prospects. Consider the following information:
-
-Active Job Applications:
-{active_applications}
-
-Recent Resume Changes:
-{recent_resume_changes}
-
-Job Market Trends:
-{job_market_trends}
-
-Skill Gaps Identified:
-{skill_gaps}
-
-Provide a weekend project suggestion in the following format:
-1. Project Title:
-2. Skills Developed:
-3. Relevance to Job Search:
-4. Project Description:
-5. Expected Outcomes:
-6. How to Showcase in Applications/Interviews:
-7. Resources Needed:
-8. Estimated Time Commitment:"""
-
-        response = self.ai_manager.generate_response("weekend_project", {
-            "active_applications": json.dumps(context['all_applications'], indent=2),
+        response = self.ai_manager.generate_response("weekend_project", self._weekend_project_context())
+        return self._parse_weekend_project(response)
+
+    def _weekend_project_context(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if context is None:
+            context = self._build_context()
+        return {
+            "active_applications": context['applications'],
             "recent_resume_changes": context['master_resume'],
-            "job_market_trends": json.dumps(context['global_insights'].get('job_market_trends', {}), indent=2),
-            "skill_gaps": json.dumps(context['global_insights'].get('skill_gaps', {}), indent=2)
-        })
+            "job_market_trends": context['job_market_trends'],
+            "skill_gaps": context['skill_gaps']
+        }
 
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        project = {}
-        current_section = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.')):
-                current_section = line[3:].strip(':')
-                project[current_section] = ""
-            elif current_section and line.strip():
-                project[current_section] += line.strip() + " "
-        
-        return project
+    def _parse_weekend_project(self, response: str) -> Dict[str, str]:
+        return sections_to_text(parse_sections(response))
 
     def simulate_first_day(self, job_id: str) -> Dict[str, str]:
         job = self.context_manager.get_job_application(job_id)
-        
-        prompt = """Based on the job description and company information for the {job_title} position at {company}, create a simulation of what the user's first day might look like. Include:
-
-1. Arrival and Onboarding Process:
-2. Key People to Meet:
-3. Main Tasks and Responsibilities:
-4. Potential Challenges and How to Address Them:
-5. Tips for Making a Great First Impression:
-6. What to Prepare Before the First Day:
-7. Expected Outcomes from the First Day:
-8. How This Experience Aligns with Career Goals:
-
-Use the following job details to inform your simulation:
-{job_description_summary}
-{company_culture_info}"""
 
         response = self.ai_manager.generate_response("first_day_simulation", {
             "job_title": job['position'],
@@ -114,131 +54,106 @@ Use the following job details to inform your simulation:
             "job_description_summary": job.get('description_summary', 'No summary available'),
             "company_culture_info": job.get('company_culture', 'No company culture information available')
         })
-        
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        simulation = {}
-        current_section = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.')):
-                current_section = line[3:].strip(':')
-                simulation[current_section] = ""
-            elif current_section and line.strip():
-                simulation[current_section] += line.strip() + " "
-        
-        return simulation
-
-    def generate_weekly_goals(self) -> List[str]:
-        context = self.context_manager.get_context_for_captain()
-        
-        prompt = """Based on the current job search status, generate a list of weekly goals:
-
-Job Applications:
-{applications}
 
-Resume:
-{resume}
+        return sections_to_text(parse_sections(response))
 
-Please provide a list of 5 specific, actionable weekly goals to improve the job search process.
-
-Weekly goals:"""
+    def generate_weekly_goals(self) -> List[str]:
+        response = self.ai_manager.generate_response("weekly_goals", self._applications_and_resume_context())
+        return self._parse_weekly_goals(response)
 
-        response = self.ai_manager.generate_response("weekly_goals", {
-            "applications": json.dumps(context['all_applications'], indent=2),
-            "resume": context['master_resume']
-        })
+    def _parse_weekly_goals(self, response: str) -> List[str]:
         return response.split('\n')
 
     def provide_motivation(self) -> str:
-        applications = self.context_manager.get_all_job_applications()
-        success_rate = self.context_manager.get_application_success_rate()
-        
-        prompt = """Provide a motivational message based on the following job search status:
-
-Number of Applications: {num_applications}
-Application Success Rate: {success_rate:.2%}
-
-Please give an encouraging and motivational message to keep the job seeker inspired and focused on their goals.
-
-Motivational message:"""
+        stats = self.context_manager.get_application_stats()
+        average_days = stats["time_to_response"]["average_days"]
 
         return self.ai_manager.generate_response("motivation", {
-            "num_applications": len(applications),
-            "success_rate": success_rate
+            "num_applications": stats["total_applications"],
+            "success_rate": stats["success_rate"],
+            "status_counts": compact_json(stats["status_counts"]),
+            "average_response_days": f"{average_days:.1f}" if average_days is not None else "No responses yet"
         })
 
     def suggest_skill_improvement(self) -> Dict[str, List[str]]:
-        context = self.context_manager.get_context_for_captain()
-        
-        prompt = """Based on the current job applications and resume, suggest skills to improve:
-
-Job Applications:
-{applications}
-
-Resume:
-{resume}
-
-Please provide suggestions for skill improvement in the following categories:
-1. Technical Skills
-2. Soft Skills
-3. Industry Knowledge
+        response = self.ai_manager.generate_response("skill_improvement", self._applications_and_resume_context())
+        return self._parse_skill_improvement(response)
 
-For each category, list 3-5 specific skills or areas of knowledge to focus on.
-
-Skill improvement suggestions:"""
-
-        response = self.ai_manager.generate_response("skill_improvement", {
-            "applications": json.dumps(context['all_applications'], indent=2),
-            "resume": context['master_resume']
-        })
-        
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        suggestions = {}
-        current_category = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.')):
-                current_category = line[3:].strip(':')
-                suggestions[current_category] = []
-            elif current_category and line.strip():
-                suggestions[current_category].append(line.strip())
-        
-        return suggestions
+    def _parse_skill_improvement(self, response: str) -> Dict[str, List[str]]:
+        return sections_to_lists(parse_sections(response))
 
     def generate_long_term_career_plan(self) -> Dict[str, str]:
-        context = self.context_manager.get_context_for_captain()
-        
-        prompt = """Based on the current resume and job applications, generate a long-term career plan:
-
-Resume:
-{resume}
-
-Job Applications:
-{applications}
-
-Please provide a 5-year career plan, including:
-1. Career goals
-2. Skill development roadmap
-3. Potential job positions to target
-4. Industry trends to watch
-5. Networking and personal branding strategies
-
-Long-term career plan:"""
-
-        response = self.ai_manager.generate_response("long_term_career_plan", {
-            "resume": context['master_resume'],
-            "applications": json.dumps(context['all_applications'], indent=2)
-        })
-        
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        plan = {}
-        current_section = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.', '5.')):
-                current_section = line[3:].strip(':')
-                plan[current_section] = ""
-            elif current_section and line.strip():
-                plan[current_section] += line.strip() + " "
-        
-        return plan
+        response = self.ai_manager.generate_response("long_term_career_plan", self._applications_and_resume_context())
+        return self._parse_long_term_career_plan(response)
+
+    def _parse_long_term_career_plan(self, response: str) -> Dict[str, str]:
+        return sections_to_text(parse_sections(response))
+
+    def stream_report_section(self, name: str) -> Iterator[Tuple[str, str]]:
+        # Yields (title, body) pairs of one sectioned report as each numbered section completes
+        contexts: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "weekend_project": self._weekend_project_context,
+            "skill_improvement": self._applications_and_resume_context,
+            "long_term_career_plan": self._applications_and_resume_context,
+        }
+        if name not in contexts:
+            raise ValueError(f"Report section '{name}' is not streamable")
+        separator = "\n" if name == "skill_improvement" else " "
+        for title, lines in self.ai_manager.stream_sections(name, contexts[name]()):
+            yield title, separator.join(lines)
+
+    def _applications_and_resume_context(self, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if context is None:
+            context = self._build_context()
+        return {
+            "applications": context['applications'],
+            "resume": context['master_resume']
+        }
+
+    def _build_context(self) -> Dict[str, Any]:
+        # Compact, token-budgeted snapshot; the truncation report is kept for the UI and debugging
+        resume_summary = self.ai_manager.resume_summarizer.get_summary(self.context_manager.get_master_resume())
+        context = self.context_manager.build_captain_context(resume=resume_summary)
+        self.last_context_report = context['truncation_report']
+        return context
+
+    def generate_full_report(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        return asyncio.run(self.agenerate_full_report(max_concurrency, timeout))
+
+    async def agenerate_full_report(self, max_concurrency: Optional[int] = None, timeout: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        # Every section is built from the same context snapshot and requested concurrently,
+        # so a full refresh costs roughly one round trip instead of five. Building the context can block on
+        # a resume summary (an LLM round trip), so it runs off the event loop.
+        context = await asyncio.to_thread(self._build_context)
+        applications_and_resume = self._applications_and_resume_context(context)
+        sections: Dict[str, Tuple[Dict[str, Any], Callable[[str], Any]]] = {
+            "job_search_overview": (self._job_search_overview_context(context), lambda response: response),
+            "weekend_project": (self._weekend_project_context(context), self._parse_weekend_project),
+            "weekly_goals": (applications_and_resume, self._parse_weekly_goals),
+            "skill_improvement": (applications_and_resume, self._parse_skill_improvement),
+            "long_term_career_plan": (applications_and_resume, self._parse_long_term_career_plan),
+        }
+
+        semaphore = asyncio.Semaphore(max_concurrency or CAPTAIN_REPORT_CONCURRENCY)
+        timeout = timeout or LLM_CALL_TIMEOUT_SECONDS
+
+        async def run_section(prompt_name: str, prompt_context: Dict[str, Any], parse: Callable[[str], Any]) -> Any:
+            async with semaphore:
+                response = await asyncio.wait_for(self.ai_manager.agenerate_response(prompt_name, prompt_context), timeout)
+            return parse(response)
+
+        results = await asyncio.gather(
+            *(run_section(name, prompt_context, parse) for name, (prompt_context, parse) in sections.items()),
+            return_exceptions=True
+        )
+
+        # A failed or timed-out section does not discard the ones that completed
+        report = {"sections": {}, "errors": {}}
+        for name, result in zip(sections, results):
+            if isinstance(result, asyncio.TimeoutError):
+                report["errors"][name] = f"Timed out after {timeout} seconds"
+            elif isinstance(result, Exception):
+                report["errors"][name] = str(result)
+            else:
+                report["sections"][name] = result
+        return report
@@ -1,7 +1,8 @@
 from core.ai_manager import AIManager
 from core.context_manager import CAPTAINContextManager
-from typing import Dict, Any, List
-import json
+from core.conversation_memory import job_scope
+from core.resume_formatter import EXPERIENCE_SECTION, SKILLS_SECTION
+from typing import Dict, Any, Iterator, List, Optional, Union
 
 class JobOpportunityAI:
     def __init__(self, ai_manager: AIManager, context_manager: CAPTAINContextManager):
@@ -9,202 +10,120 @@ class JobOpportunityAI:
         self.context_manager = context_manager
 
     def generate_navigator_name(self, job_title: str, company: str) -> str:
-        prompt = f"Generate a unique and memorable name for an AI assistant specializing in the {job_title} position at {company}. The name should be professional yet friendly, and relate to the job or industry."
         return self.ai_manager.generate_response("navigator_name", {"job_title": job_title, "company": company})
 
-    def initialize_navigator(self, navigator_name: str, job_title: str, company: str) -> None:
-        system_template = f'''You are {navigator_name}, an AI assistant specializing in the {job_title} position at {company}. Your role is to guide the user through their application process, provide insights about the job and company, and optimize their application strategy.
-
-Key Responsibilities:
-1. Analyze job descriptions and align with user's resume
-2. Suggest resume enhancements to the Resume Tab
-3. Provide application status updates and next steps
-4. Offer interview preparation advice and potential questions
-5. Share insights about the company culture and job responsibilities
-6. Identify skill gaps and suggest improvement strategies
-
-You are part of the CAPTAIN system. Collaborate with the Resume Tab and Captain for a comprehensive job search strategy. Always maintain a professional, supportive, and encouraging tone.'''
-
-        self.ai_manager.create_prompt_template("navigator_system", system_template, [])
-
-    def analyze_job_description(self, job_id: str, job_description: str) -> Dict[str, List[str]]:
-        job_data = self.context_manager.get_job_application(job_id)
-        resume_summary = self.context_manager.get_master_resume()
-
-        prompt = f'''Analyze the following job description for the {job_data['position']} position at {job_data['company']}. Identify key requirements, skills, and qualifications. Then, compare these to the user's master resume and suggest specific tailoring strategies.
-
-Job Description:
-{job_description}
-
-Master Resume Summary:
-{resume_summary}
-
-Provide your analysis in the following format:
-1. Key Requirements:
-2. Essential Skills:
-3. Desired Qualifications:
-4. Resume Tailoring Suggestions:
-5. Skill Gap Analysis:
-6. Application Strategy Recommendations:'''
-
-        response = self.ai_manager.generate_response("job_analysis", {
-            "job_title": job_data['position'],
-            "company": job_data['company'],
-            "job_description": job_description,
-            "resume_summary": resume_summary
+    def initialize_navigator(self, navigator_name: str, job_title: str, company: str) -> str:
+        return self.ai_manager.format_prompt("navigator_system", {
+            "navigator_name": navigator_name,
+            "job_title": job_title,
+            "company": company
         })
 
-        sections = response.split('\n\n')
-        result = {}
-        for section in sections:
-            key, value = section.split(':', 1)
-            result[key.strip()] = [item.strip() for item in value.strip().split('\n')]
-
-        return result
+    def stream_navigator_chat(self, job_id: str, user_input: str) -> Iterator[str]:
+        # Every job keeps its own conversation, so the navigator only remembers what was said about this job
+        job = self.context_manager.get_job_application(job_id)
+        system_prompt = self.initialize_navigator(job.get("navigator_name", "Navigator"), job["position"], job["company"])
+        return self.ai_manager.stream_chat(user_input, job_scope(job_id), system_prompt)
+
+    def clear_navigator_chat(self, job_id: str) -> None:
+        self.ai_manager.conversations.clear(job_scope(job_id))
+
+    def rank_jobs(self, top_k: Optional[int] = None, status: Union[str, List[str], None] = None) -> List[Dict[str, Any]]:
+        # Local triage: no LLM calls, so it is cheap enough to run before any per-job analysis
+        ranking = self.context_manager.rank_applications_for_resume(top_k=top_k, status=status)
+        return [{"job_id": job_id, "company": job.get("company"), "position": job.get("position"),
+                 "status": job.get("status"), "score": round(score, 3)}
+                for job_id, score in ranking
+                for job in (self.context_manager.get_job_application(job_id),)]
+
+    def _get_analysis_job(self, job_id: str) -> Dict[str, Any]:
+        # Near-duplicates are analyzed as their canonical posting, so the prompts match and cached answers are reused
+        return self.context_manager.get_job_application(self.context_manager.get_canonical_job_id(job_id))
+
+    def analyze_job_description(self, job_id: str, job_description: str, save: bool = True) -> Dict[str, List[str]]:
+        # A near-duplicate is analyzed as its canonical posting, with the canonical description, so the prompt and
+        # its cached answer are shared. With save, the analysis is stored on the canonical posting and on job_id;
+        # callers that write applications from one thread only (batch ingestion) pass save=False and store it themselves
+        canonical_id = self.context_manager.get_canonical_job_id(job_id)
+        job_data = self.context_manager.get_job_application(canonical_id)
+        if canonical_id != job_id and "analysis" in job_data:
+            analysis = job_data["analysis"]
+        else:
+            resume_summary = self.ai_manager.resume_summarizer.get_summary(self.context_manager.get_master_resume())
+            analysis = self.ai_manager.generate_structured("job_analysis", {
+                "job_title": job_data['position'],
+                "company": job_data['company'],
+                "job_description": job_data.get('description') or job_description,
+                "resume_summary": resume_summary
+            })
+            if save:
+                self.context_manager.update_job_application(canonical_id, {"analysis": analysis})
+        if save and canonical_id != job_id:
+            self.context_manager.update_job_application(job_id, {"analysis": analysis})
+        return analysis
 
     def update_application_status(self, job_id: str, new_status: str) -> Dict[str, str]:
         job_data = self.context_manager.get_job_application(job_id)
         previous_status = job_data.get('status', 'Not Started')
 
-        prompt = f'''The user has updated their application status for the {job_data['position']} position at {job_data['company']}. The new status is: {new_status}
-
-Previous status: {previous_status}
-
-Based on this status change, provide the following:
-1. Congratulations or encouragement message
-2. Suggested next steps
-3. Potential challenges to prepare for
-4. Questions to ask the user about their experience so far
-5. Reminders of any important information or documents they might need next
-6. Advice on how to stand out in the next stage of the process'''
-
-        response = self.ai_manager.generate_response("status_update", {
+        result = self.ai_manager.generate_structured("status_update", {
             "job_title": job_data['position'],
             "company": job_data['company'],
             "new_status": new_status,
             "previous_status": previous_status
         })
 
-        sections = response.split('\n\n')
-        result = {}
-        for section in sections:
-            key, value = section.split(':', 1)
-            result[key.strip()] = value.strip()
-
         self.context_manager.update_job_application(job_id, {'status': new_status})
 
         return result
 
     def suggest_skills_to_resume(self, job_id: str) -> Dict[str, List[str]]:
-        job_data = self.context_manager.get_job_application(job_id)
-        resume_skills = self.context_manager.get_master_resume()
+        job_data = self._get_analysis_job(job_id)
+        resume_skills = self.context_manager.get_resume_sections(SKILLS_SECTION, EXPERIENCE_SECTION)
 
-        prompt = f'''Based on the job description for {job_data['position']} at {job_data['company']}, identify skills or experiences from the user's master resume that should be highlighted or added. If there are gaps, suggest potential weekend projects or learning opportunities.
-
-Job Description Key Points:
-{job_data.get('description_summary', 'No summary available')}
-
-Current Resume Skills:
-{resume_skills}
-
-Provide your suggestions in the following format:
-1. Skills to Highlight:
-2. Experiences to Emphasize:
-3. Suggested Additions to Resume:
-4. Recommended Weekend Projects:
-5. Learning Opportunities:
-6. How These Improvements Align with Job Requirements:'''
-
-        response = self.ai_manager.generate_response("skill_suggestion", {
+        return self.ai_manager.generate_structured("skill_suggestion", {
             "job_title": job_data['position'],
             "company": job_data['company'],
             "job_description_summary": job_data.get('description_summary', 'No summary available'),
             "current_resume_skills": resume_skills
         })
 
-        sections = response.split('\n\n')
-        result = {}
-        for section in sections:
-            key, value = section.split(':', 1)
-            result[key.strip()] = [item.strip() for item in value.strip().split('\n')]
-
-        return result
-
     def suggest_networking_strategies(self, job_id: str) -> List[str]:
-        job = self.context_manager.get_job_application(job_id)
-
-        prompt = f"""Suggest networking strategies for the following job application:
-
-Position: {job['position']}
-Company: {job['company']}
+        job = self._get_analysis_job(job_id)
 
-Please provide a list of networking strategies that could help with this job application. Consider both online and offline networking opportunities."""
-
-        response = self.ai_manager.generate_response("networking_strategies", {"job": job})
+        response = self.ai_manager.generate_response("networking_strategies", {
+            "job_title": job['position'],
+            "company": job['company']
+        })
         return response.split('\n')
 
     def generate_application_strategy(self, job_id: str) -> str:
-        job = self.context_manager.get_job_application(job_id)
+        job = self._get_analysis_job(job_id)
         resume = self.context_manager.get_master_resume()
 
-        prompt = f"""Generate an application strategy for the following job:
-
-Position: {job['position']}
-Company: {job['company']}
-Job Description: {job['description']}
-
-Candidate's Resume:
-{resume['content']}
-
-Please provide a comprehensive application strategy, including:
-1. Key points to emphasize in the application
-2. Suggested changes or additions to the resume
-3. Cover letter writing tips
-4. Preparation for potential interview questions
-5. Research to conduct about the company
-6. Any additional steps to stand out as a candidate
-
-Your strategy:"""
-
-        return self.ai_manager.generate_response("application_strategy", {"job": job, "resume": resume})
+        return self.ai_manager.generate_response("application_strategy", {
+            "job_title": job['position'],
+            "company": job['company'],
+            "job_description": job['description'],
+            "resume": resume
+        })
 
     def simulate_interview_questions(self, job_id: str) -> List[Dict[str, str]]:
-        job = self.context_manager.get_job_application(job_id)
+        job = self._get_analysis_job(job_id)
         resume = self.context_manager.get_master_resume()
 
-        prompt = f"""Generate a set of potential interview questions and suggested answers for the following job:
-
-Position: {job['position']}
-Company: {job['company']}
-Job Description: {job['description']}
-
-Candidate's Resume:
-{resume['content']}
-
-Please provide 5 likely interview questions and suggested answers. Format your response as a JSON list of objects, each with 'question' and 'suggested_answer' keys.
-
-Interview questions and answers:"""
-
-        response = self.ai_manager.generate_response("interview_questions", {"job": job, "resume": resume})
-        return json.loads(response)
+        response = self.ai_manager.generate_structured("interview_questions", {
+            "job_title": job['position'],
+            "company": job['company'],
+            "job_description": job['description'],
+            "resume": resume
+        })
+        return response["questions"]
 
     def analyze_company_culture(self, job_id: str) -> Dict[str, str]:
-        job = self.context_manager.get_job_application(job_id)
-
-        prompt = f"""Analyze the company culture for {job['company']} based on the following job description:
-
-{job['description']}
-
-Please provide insights on:
-1. Work environment
-2. Company values
-3. Team dynamics
-4. Growth opportunities
-5. Work-life balance
-
-Format your response as a JSON object with these categories as keys.
-
-Company culture analysis:"""
+        job = self._get_analysis_job(job_id)
 
-        response = self.ai_manager.generate_response("company_culture", {"job": job})
-        return json.loads(response)
\ No newline at end of file
+        return self.ai_manager.generate_structured("company_culture", {
+            "company": job['company'],
+            "job_description": job['description']
+        })
\ No newline at end of file
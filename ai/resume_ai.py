@@ -1,9 +1,35 @@
 from core.ai_manager import AIManager
 from core.context_manager import CAPTAINContextManager
+from core.conversation_memory import RESUME_SCOPE
+from core.resume_formatter import format_resume_text
 from core.resume_manager import ResumeManager
-from typing import Dict, List
+from core.resume_patch import ResumePatchError, apply_patch, diff_resumes, list_section_paths, parse_patch
+from typing import Dict, Iterator, List
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+# Top-level numbered headers of a resume_edit response. Only these titles start a section, so numbered
+# lines inside the resume itself stay part of it
+_EDIT_RESPONSE_HEADER = re.compile(r"^(?:#{1,6}[ \t]*)?(?:\*\*)?\d{1,2}[.)][ \t]*(?:\*\*)?[ \t]*"
+                                   r"(Updated Resume|Explanation of Changes|Potential Impact|Additional Suggestions)"
+                                   r"\b[^\n]*$", re.MULTILINE | re.IGNORECASE)
+_CODE_FENCE = re.compile(r"^```[a-z]*\n(.*?)\n```$", re.DOTALL)
+
+
+def parse_edit_response(response: str) -> Dict[str, str]:
+    # Section bodies are kept verbatim (blank lines, indentation) since the resume is Markdown
+    headers = list(_EDIT_RESPONSE_HEADER.finditer(response))
+    sections = {}
+    for header, following in zip(headers, headers[1:] + [None]):
+        body = response[header.end():following.start() if following else len(response)].strip()
+        fenced = _CODE_FENCE.match(body)
+        title = " ".join(word.capitalize() if word != "of" else word for word in header.group(1).lower().split())
+        sections[title] = fenced.group(1).strip() if fenced else body
+    return sections
+
+
 class ResumeAI:
     def __init__(self, ai_manager: AIManager, context_manager: CAPTAINContextManager, resume_manager: ResumeManager):
         self.ai_manager = ai_manager
@@ -17,80 +43,79 @@ class ResumeAI:
 
     def suggest_improvements(self) -> List[str]:
         resume_content = self.resume_manager.get_resume()
-        prompt = f"""Analyze the following resume and provide improvement suggestions:
-
-{resume_content}
-
-Provide your suggestions in the following format:
-1. Overall strengths of the resume
-2. Areas for improvement
-3. Suggestions for additional information to include
-4. Formatting and structure recommendations
-5. Industry-specific advice
-6. Quantifiable achievements to highlight
-
-Your suggestions:"""
-        suggestions = self.ai_manager.generate_response("resume_improvements", {"resume": resume_content})
+        suggestions = self.ai_manager.generate_response("resume_improvements", {"resume_content": resume_content})
         return suggestions.split('\n')
 
-    def update_resume(self, new_content: str):
-        self.resume_manager.update_resume(new_content)
-        self.context_manager.update_master_resume(new_content)
+    def format_resume(self, resume_content: str) -> str:
+        # The rules handle well-formed resumes locally; the model only sees the sections they could not structure
+        formatted = format_resume_text(resume_content)
+        if formatted.name is None or not formatted.sections:
+            return self.ai_manager.generate_response("format_resume", {"resume_content": resume_content})
+        for title, raw in list(formatted.unresolved.items()):
+            body = self.ai_manager.generate_response("format_resume_section", {"section_title": title, "section_content": raw})
+            formatted.resolve(title, re.sub(r'^\s*##[ \t]+.*\n', '', body))
+        return formatted.to_markdown()
+
+    def update_resume(self, new_content: str, message: str = "") -> List[str]:
+        # Both managers hold the same parsed document; the returned section titles are the ones that changed
+        changed = self.context_manager.update_master_resume(new_content, message)
+        self.resume_manager.update_resume(self.context_manager.get_resume_document())
+        return changed
 
     def edit_resume(self, edit_request: str) -> Dict[str, str]:
         current_resume = self.resume_manager.get_resume()
-        prompt = f"""You are editing the user's master resume. The current version is:
-
-{current_resume}
-
-The user has requested the following change:
-
-{edit_request}
-
-Implement this change by providing a complete, updated version of the resume. Make sure to include all sections, even those not affected by the edit. Your response should be the entire updated resume in Markdown format.
+        try:
+            return self.patch_resume(edit_request)
+        except ResumePatchError as e:
+            logger.warning("Falling back to full resume regeneration: %s", e)
+        except Exception as e:
+            return {"error": f"An error occurred while editing the resume: {str(e)}"}
 
-After the updated resume, provide a brief explanation of the changes made."""
+        try:
+            response = self.ai_manager.generate_response("resume_edit", {"current_resume": current_resume, "edit_request": edit_request})
+            sections = parse_edit_response(response)
+            if not sections.get("Updated Resume"):
+                return {"error": "The edit response did not contain an updated resume; nothing was changed."}
+
+            # Only the resume itself is committed, never the explanation and suggestions around it
+            self.update_resume(sections["Updated Resume"], edit_request)
+            updated_resume = self.resume_manager.get_resume()
+
+            return {
+                "Updated Resume": updated_resume,
+                "Explanation of Changes": sections.get("Explanation of Changes", "Changes applied as requested."),
+                "Diff": diff_resumes(current_resume, updated_resume),
+                "Message": "Resume has been updated successfully."
+            }
+        except Exception as e:
+            return {"error": f"An error occurred while editing the resume: {str(e)}"}
 
-        result = self.ai_manager.generate_response("resume_edit", {"prompt": prompt})
-        
-        # Split the response into updated resume and explanation
-        parts = result.split("\n\nExplanation of changes:")
-        updated_resume = parts[0].strip()
-        explanation = parts[1].strip() if len(parts) > 1 else "Changes applied as requested."
-        
-        # Update the entire resume with the new content
-        self.update_resume(updated_resume)
+    def patch_resume(self, edit_request: str) -> Dict[str, str]:
+        # The model only returns the edits, so output tokens scale with the change rather than the document
+        current_resume = self.resume_manager.get_resume()
+        response = self.ai_manager.generate_response("resume_patch", {
+            "current_resume": current_resume,
+            "section_paths": "\n".join(f"- {path}" for path in list_section_paths(current_resume)),
+            "edit_request": edit_request
+        })
+        patch = parse_patch(response)
+        self.update_resume(apply_patch(current_resume, patch["operations"]), patch.get("explanation", edit_request))
+        updated_resume = self.resume_manager.get_resume()
 
         return {
             "Updated Resume": updated_resume,
-            "Explanation of Changes": explanation,
+            "Explanation of Changes": patch.get("explanation", "Changes applied as requested."),
+            "Diff": diff_resumes(current_resume, updated_resume),
+            "Message": "Resume has been updated successfully."
         }
-        
-        return result
-
-    def edit_resume(self, edit_request: str) -> Dict[str, str]:
-        current_resume = self.resume_manager.get_resume()
-        prompt = f"""You are editing the user's master resume. The current version is:
-
-{current_resume}
-
-The user has requested the following change:
-
-{edit_request}
 
-Implement this change by providing a complete, updated version of the resume. Make sure to include all sections, even those not affected by the edit. Your response should be the entire updated resume in Markdown format."""
-
-        try:
-            response = self.ai_manager.generate_response("resume_edit", {"current_resume": current_resume, "edit_request": edit_request})
-            
-            # Update the entire resume with the new content
-            self.update_resume(response)
+    def chat_about_resume(self, user_input: str) -> str:
+        return self.ai_manager.chat(user_input, RESUME_SCOPE, self._resume_chat_system_prompt())
 
-            return {"Updated Resume": response, "Message": "Resume has been updated successfully."}
-        except Exception as e:
-            return {"error": f"An error occurred while editing the resume: {str(e)}"}
+    def stream_chat_about_resume(self, user_input: str) -> Iterator[str]:
+        return self.ai_manager.stream_chat(user_input, RESUME_SCOPE, self._resume_chat_system_prompt())
 
-    def chat_about_resume(self, user_input: str) -> str:
-        current_resume = self.resume_manager.get_resume()
-        response = self.ai_manager.generate_response("resume_chat", {"resume_content": current_resume, "user_input": user_input})
-        return response
+    def _resume_chat_system_prompt(self) -> str:
+        # The resume rides in the system prompt, summarized when long, rather than being repeated in every stored turn
+        context = self.ai_manager.prepare_context("resume_chat_system", {"resume_content": self.resume_manager.get_resume()})
+        return self.ai_manager.format_prompt("resume_chat_system", context)
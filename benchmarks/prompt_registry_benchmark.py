@@ -0,0 +1,53 @@
+# benchmarks/prompt_registry_benchmark.py
+#
+# Measures the per-call overhead that the compiled prompt registry removes:
+# building a PromptTemplate and LLMChain on every generate_response call versus
+# looking up the runnable compiled once at startup.
+#
+# Run from the repository root:  python -m benchmarks.prompt_registry_benchmark
+
+import timeit
+from langchain.chains import LLMChain
+from langchain.prompts import PromptTemplate
+from langchain_community.chat_models.fake import FakeListChatModel
+from core.prompt_registry import PromptRegistry, parse_input_variables
+import prompts
+
+ITERATIONS = 2000
+PROMPT_NAME = "job_search_overview"
+CONTEXT = {
+    "active_applications": "[]",
+    "recent_resume_changes": "# Jane Doe",
+    "job_market_trends": "{}",
+    "success_rate": 0.25,
+}
+
+
+def per_call_construction(llm, template: str):
+    prompt = PromptTemplate(template=template, input_variables=parse_input_variables(template))
+    return LLMChain(llm=llm, prompt=prompt)
+
+
+def main():
+    llm = FakeListChatModel(responses=["ok"])
+    template = prompts.PROMPT_TEMPLATES[PROMPT_NAME]
+
+    startup = timeit.timeit(lambda: PromptRegistry(prompts.PROMPT_TEMPLATES), number=10) / 10
+    registry = PromptRegistry(prompts.PROMPT_TEMPLATES)
+    registry.get_chain(PROMPT_NAME, llm)
+
+    build = timeit.timeit(lambda: per_call_construction(llm, template), number=ITERATIONS) / ITERATIONS
+    lookup = timeit.timeit(lambda: registry.get_chain(PROMPT_NAME, llm), number=ITERATIONS) / ITERATIONS
+
+    invoke_old = timeit.timeit(lambda: per_call_construction(llm, template).run(**CONTEXT), number=ITERATIONS // 10) / (ITERATIONS // 10)
+    invoke_new = timeit.timeit(lambda: registry.get_chain(PROMPT_NAME, llm).invoke(CONTEXT), number=ITERATIONS // 10) / (ITERATIONS // 10)
+
+    print(f"Registry startup ({len(registry.names())} prompts): {startup * 1e3:.2f} ms (once per process)")
+    print(f"Chain construction per call:  {build * 1e6:8.1f} us")
+    print(f"Compiled chain lookup:        {lookup * 1e6:8.1f} us")
+    print(f"Call with fake LLM, per-call construction: {invoke_old * 1e6:8.1f} us")
+    print(f"Call with fake LLM, compiled chain:        {invoke_new * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,10 +19,119 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 DATA_DIR = "data"
 RESUME_FILE = os.path.join(DATA_DIR, "resume.md")
 JOB_APPLICATIONS_FILE = os.path.join(DATA_DIR, "job_applications.json")
+STATE_DB_FILE = os.path.join(DATA_DIR, "captain.db")
+HISTORY_DIR = os.path.join(DATA_DIR, "history")
+VECTOR_INDEX_DIR = os.path.join(DATA_DIR, "vectors")
+INGESTION_CHECKPOINT_DIR = os.path.join(DATA_DIR, "ingestion")
+SESSION_DATA_DIR = os.path.join(DATA_DIR, "sessions")
+RESUME_INGESTION_CACHE_DIR = os.path.join(DATA_DIR, "resume_cache")
+
+# Application history log
+HISTORY_SEGMENT_SIZE = 4096
+HISTORY_RETENTION_DAYS = 730
 
 # LLM Configuration
 LLM_TEMPERATURE = 0.7
 LLM_MODEL = "gpt-4o-mini"
+# Ask the model for JSON-mode responses on prompts that have an output schema
+LLM_JSON_MODE = True
+
+# LLM response cache
+LLM_CACHE_DIR = os.path.join(DATA_DIR, "llm_cache")
+LLM_CACHE_MEMORY_ENTRIES = 256
+LLM_CACHE_DISK_ENTRIES = 5000
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Prompts whose output is expected to differ between calls are never cached
+LLM_UNCACHED_PROMPTS = ["navigator_name", "motivation"]
+
+# Concurrency and timeouts for fanned-out LLM calls
+LLM_CALL_TIMEOUT_SECONDS = 60
+
+# LLM transport: every call goes through one pooled client per model with these limits.
+# LLM_CALL_TIMEOUT_SECONDS is the deadline for a call including its retries; each HTTP attempt gets its own timeout
+LLM_API_BASE = os.getenv("OPENAI_API_BASE") or None
+LLM_REQUEST_TIMEOUT_SECONDS = 30
+LLM_MAX_RETRIES = 4
+LLM_BACKOFF_SECONDS = 1.0
+LLM_MAX_BACKOFF_SECONDS = 20.0
+LLM_MAX_CONNECTIONS = 20
+LLM_CIRCUIT_FAILURE_THRESHOLD = 5
+LLM_CIRCUIT_RESET_SECONDS = 30
+# Completion tokens assumed per call when charging the tokens-per-minute bucket
+LLM_COMPLETION_TOKEN_ESTIMATE = 500
+LLM_DEFAULT_RATE_LIMITS = {"requests_per_minute": 60, "tokens_per_minute": 60000}
+LLM_RATE_LIMITS = {
+    "gpt-4o-mini": {"requests_per_minute": 500, "tokens_per_minute": 200000},
+    "gpt-4o": {"requests_per_minute": 500, "tokens_per_minute": 30000},
+}
+CAPTAIN_REPORT_CONCURRENCY = 3
+
+# Token budget for the application/resume context packed into Captain prompts
+CAPTAIN_CONTEXT_TOKEN_BUDGET = 6000
+
+# Chat memory per conversation scope: recent turns up to the window, older ones folded into a bounded summary
+CHAT_MEMORY_WINDOW_TOKENS = 2000
+CHAT_MEMORY_SUMMARY_TOKENS = 400
+
+# Browser sessions kept in memory; idle or least recently used ones are saved to their store and dropped
+SESSION_MAX_ACTIVE = 32
+SESSION_IDLE_SECONDS = 30 * 60
+# Sessions are keyed on the logged-in user when Gradio auth is enabled. With SESSION_PER_BROWSER set, anonymous
+# browsers get their own store through a long-lived cookie; turning it off puts every anonymous visitor on the
+# single-user store under DATA_DIR, which only suits a local single-user install
+SESSION_PER_BROWSER = True
+SESSION_COOKIE_NAME = "captain_session"
+SESSION_COOKIE_MAX_AGE_DAYS = 365
+
+# Batch job-posting ingestion (python -m core.job_ingestion)
+JOB_INGESTION_CONCURRENCY = 4
+JOB_INGESTION_REQUESTS_PER_MINUTE = 60
+JOB_INGESTION_CHECKPOINT_EVERY = 25
+
+# Tailored resume variants (python -m core.resume_tailoring). Only these master resume sections are sent
+# and edited; request rates are governed by the LLM transport's limits
+RESUME_TAILORING_CONCURRENCY = 8
+RESUME_TAILORING_SECTIONS = ["Professional Summary", "Work Experience", "Skills"]
+RESUME_TAILORING_DESCRIPTION_TOKENS = 1500
+
+# Near-duplicate posting detection (MinHash/LSH). "link" adds a duplicate with duplicate_of set to the
+# canonical job_id; "merge" records it on the canonical application instead of adding it
+DEDUP_JACCARD_THRESHOLD = 0.8
+DEDUP_NUM_PERMUTATIONS = 128
+DEDUP_SHINGLE_SIZE = 5
+DEDUP_MODE = "link"
+
+# Number of applications listed at a time in the job applications dropdown
+JOB_LIST_PAGE_SIZE = 100
+
+# Resume uploads: text is extracted page by page in worker processes. Larger files are refused and
+# pages past the limit are ignored
+RESUME_EXTRACTION_WORKERS = 2
+RESUME_EXTRACTION_TIMEOUT_SECONDS = 120
+RESUME_MAX_UPLOAD_BYTES = 20 * 1024 * 1024
+RESUME_MAX_PAGES = 40
+
+# Resume version history: every version is a delta against an ancestor, with a full snapshot every
+# RESUME_SNAPSHOT_INTERVAL versions (a power of two) so checkouts apply at most log2 of it in deltas
+RESUME_SNAPSHOT_INTERVAL = 32
+RESUME_VERSION_CACHE_SIZE = 16
+# Number of versions offered in the resume tab's history dropdown
+RESUME_HISTORY_LIST_SIZE = 50
+
+# Resume summarization: resumes longer than the threshold are replaced by a cached,
+# section-by-section summary in every prompt variable listed below
+RESUME_SUMMARY_THRESHOLD = 2000
+RESUME_SECTION_SUMMARY_MIN_LENGTH = 300
+RESUME_SUMMARY_VARIABLES = ["resume_content", "resume", "resume_summary", "current_resume_skills", "recent_resume_changes"]
+# Prompts that must see the full resume text
+RESUME_SUMMARY_EXEMPT_PROMPTS = ["format_resume", "resume_edit", "resume_patch", "summarize_resume_section"]
+
+# Local embedding index for resume-to-job matching. Set CAPTAIN_EMBEDDING_MODEL to a
+# sentence-transformers model available offline; otherwise hashed TF-IDF vectors are used
+EMBEDDING_MODEL = os.getenv("CAPTAIN_EMBEDDING_MODEL", "")
+EMBEDDING_HASH_DIMENSIONS = 2048
+EMBEDDING_CHUNK_CHARS = 1500
+
 # Gradio app configuration
 from gradio.themes import Base, Size, Color
 
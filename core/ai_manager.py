@@ -1,379 +1,289 @@
 # core/ai_manager.py
 
-from langchain_openai import ChatOpenAI
-from langchain.prompts import PromptTemplate, ChatPromptTemplate
-from langchain.schema import SystemMessage, HumanMessage
-from langchain_core.output_parsers import StrOutputParser
-from langchain.memory import ConversationBufferMemory
-from typing import List, Dict, Any
-import os
-from config import LLM_MODEL, LLM_TEMPERATURE, OPENAI_API_KEY
+import json
+import logging
+from typing import Dict, Any, Iterator, List, Optional
+from langchain.prompts import ChatPromptTemplate, HumanMessagePromptTemplate, SystemMessagePromptTemplate
+from langchain.chat_models import ChatOpenAI
+from langchain.chains import LLMChain
+from langchain.schema import BaseMessage, HumanMessage, SystemMessage
+from config import (LLM_UNCACHED_PROMPTS, LLM_JSON_MODE, LLM_COMPLETION_TOKEN_ESTIMATE,
+                    RESUME_SUMMARY_VARIABLES, RESUME_SUMMARY_EXEMPT_PROMPTS)
+from core.conversation_memory import CAPTAIN_SCOPE, ConversationMemory
+from core.llm_transport import LLMTransport, get_transport
+from core.prompt_registry import PromptRegistry, get_default_registry
+from core.response_cache import ResponseCache, make_cache_key
+from core.resume_summarizer import ResumeSummarizer
+from core.section_parser import Section, iter_sections, parse_sections, sections_to_lists
+from core.single_flight import SingleFlight
+from core.structured_output import StructuredOutputError, TolerantJSONParser, format_instructions, parse_structured
+from utils.token_counter import count_tokens
+import asyncio
+
+logger = logging.getLogger(__name__)
 
 class AIManager:
-    def __init__(self):
-        # self.llm = ChatOpenAI(temperature=0.1, model_name="gpt4o-mini", api_key=os.getenv("OPENAI_API_KEY"))
-        self.system_message = SystemMessage(content="You are an AI assistant for the CAPTAIN job application system.")
-        self.llm = ChatOpenAI(model_name=LLM_MODEL, temperature=LLM_TEMPERATURE, api_key=OPENAI_API_KEY)
-        self.memory = ConversationBufferMemory(return_messages=True)
-
-    def create_chain(self, prompt_template: str):
-        prompt = ChatPromptTemplate.from_messages([
-            self.system_message,
-            ("human", prompt_template)
-        ])
-        return prompt | self.llm | StrOutputParser()
-
-    def generate_response(self, prompt: str, context: Dict[str, Any]) -> str:
-        # If the resume content is too long, summarize it
-        if 'resume_content' in context and len(context['resume_content']) > 2000:
-            context['resume_content'] = self.summarize_text(context['resume_content'])
-
-        chain = self.create_chain(prompt)
-        response = chain.invoke(context)
-        self.memory.save_context({"input": prompt.format(**context)}, {"output": response})
-        return response
-
-    def summarize_text(self, text: str, max_length: int = 2000) -> str:
-        if len(text) <= max_length:
-            return text
-
-        summarize_prompt = f"Summarize the following text in no more than {max_length} characters:\n\n{text}"
-        summary = self.llm([HumanMessage(content=summarize_prompt)]).content
-        return summary[:max_length]
-
-    def analyze_resume(self, resume_content: str) -> Dict[str, Any]:
-        prompt = """Analyze the following resume in Markdown format and provide insights:
+    def __init__(self, response_cache: Optional[ResponseCache] = None, prompt_registry: Optional[PromptRegistry] = None,
+                 llm: Optional[ChatOpenAI] = None, resume_summarizer: Optional[ResumeSummarizer] = None,
+                 transport: Optional[LLMTransport] = None, single_flight: Optional[SingleFlight] = None):
+        # The client, cache, registry and summarizer are thread-safe and can be shared between sessions;
+        # every call goes through the process-wide transport, which owns the pooled client and the rate limits
+        self.transport = transport if transport is not None else get_transport()
+        self.llm = llm if llm is not None else self.transport.llm
+        # Identical requests already in flight (double clicks, several sessions) share one upstream call
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+        self.conversations = ConversationMemory(summarize=self._summarize_conversation)
+        self.prompt_registry = prompt_registry if prompt_registry is not None else get_default_registry()
+        self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        self.uncached_prompts = set(LLM_UNCACHED_PROMPTS)
+        self.resume_summarizer = resume_summarizer if resume_summarizer is not None else ResumeSummarizer(self)
+
+    @property
+    def prompt_templates(self):
+        return self.prompt_registry.get_templates()
+
+    def create_prompt_template(self, name: str, template: str, input_variables: List[str], cacheable: bool = True):
+        self.prompt_registry.register(name, template, input_variables)
+        if cacheable:
+            self.uncached_prompts.discard(name)
+        else:
+            self.uncached_prompts.add(name)
+
+    def create_chain(self, prompt_name: str, json_mode: bool = False):
+        # Compiled once per prompt and reused; runnables are safe to share between threads
+        return self.prompt_registry.get_chain(prompt_name, self.llm, json_mode)
 
-Resume:
-{resume_content}
-
-Please provide:
-1. Overall strengths
-2. Areas for improvement
-3. Suggested additions or modifications
-4. Industry-specific advice
-
-Your analysis:"""
+    def create_chat_chain(self, system_template: str, human_template: str) -> LLMChain:
+        chat_prompt = ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(system_template),
+            HumanMessagePromptTemplate.from_template(human_template)
+        ])
+        return LLMChain(llm=self.llm, prompt=chat_prompt)
 
-        response = self.generate_response(prompt, {"resume_content": resume_content})
-        
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        analysis = {}
-        current_section = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.')):
-                current_section = line[3:].strip()
-                analysis[current_section] = []
-            elif current_section and line.strip():
-                analysis[current_section].append(line.strip())
-
-        return analysis
-
-    def analyze_job_description(self, job_description: str, resume: str) -> Dict[str, Any]:
-        prompt = """Analyze the following job description and compare it to the given resume:
-
-Job Description:
-{job_description}
-
-Resume:
-{resume}
-
-Please provide:
-1. Key requirements of the job
-2. Skills that match between the job and resume
-3. Skills or experiences missing from the resume
-4. Suggestions for tailoring the resume to this job
-
-Your analysis:"""
-
-        response = self.generate_response(prompt, {
-            "job_description": job_description,
-            "resume": resume
-        })
+    def generate_response(self, prompt_name: str, context: Dict[str, Any]) -> str:
+        print(f"Generating response for prompt: {prompt_name}")
+        print(f"Context keys: {context.keys()}")
+        if 'resume_content' in context:
+            print(f"Resume content length: {len(context['resume_content'])}")
         
-        # Parse the response into a structured format
-        lines = response.split('\n')
-        analysis = {}
-        current_section = ""
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.')):
-                current_section = line[3:].strip()
-                analysis[current_section] = []
-            elif current_section and line.strip():
-                analysis[current_section].append(line.strip())
-
-        return analysis
-
-    def generate_job_search_overview(self, applications: List[Dict], resume: str) -> str:
-        prompt = """Generate a job search overview based on the following information:
-
-Job Applications:
-{applications}
+        self.prompt_registry.validate_context(prompt_name, context)
+        context = self.prepare_context(prompt_name, context)
 
-Resume:
-{resume}
+        cache_key = self.get_cache_key(prompt_name, context)
+        if cache_key is not None:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
 
-Please provide:
-1. Summary of active applications
-2. Overall application success rate
-3. Suggestions for improvement
-4. Next steps in the job search
+        chain = self.create_chain(prompt_name)
 
-Your overview:"""
+        def request() -> str:
+            response = self.transport.call(lambda: chain.invoke(context), self._estimate_tokens(prompt_name, context))
+            if cache_key is not None:
+                self.response_cache.set(cache_key, response)
+            return response
 
-        return self.generate_response(prompt, {
-            "applications": json.dumps(applications, indent=2),
-            "resume": resume
-        })
+        return request() if cache_key is None else self.single_flight.do(("text", cache_key), request)
 
-    def suggest_weekend_project(self, applications: List[Dict], resume: str) -> str:
-        prompt = """Suggest a weekend project based on the user's job applications and resume:
+    async def agenerate_response(self, prompt_name: str, context: Dict[str, Any]) -> str:
+        self.prompt_registry.validate_context(prompt_name, context)
+        # Summaries are normally ready already; if not, wait for them off the event loop
+        context = await asyncio.to_thread(self.prepare_context, prompt_name, context)
 
-Job Applications:
-{applications}
+        cache_key = self.get_cache_key(prompt_name, context)
+        if cache_key is not None:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                return cached_response
 
-Resume:
-{resume}
+        chain = self.create_chain(prompt_name)
 
-Please provide a weekend project suggestion that will enhance the user's skills and job prospects. Include:
-1. Project title
-2. Skills developed
-3. Relevance to job search
-4. Brief project description
-5. Expected outcome
-6. How to showcase in applications/interviews
+        async def request() -> str:
+            response = await self.transport.acall(lambda: chain.ainvoke(context), self._estimate_tokens(prompt_name, context))
+            if cache_key is not None:
+                self.response_cache.set(cache_key, response)
+            return response
 
-Your suggestion:"""
+        return await request() if cache_key is None else await self.single_flight.ado(("text", cache_key), request)
 
-        return self.generate_response(prompt, {
-            "applications": json.dumps(applications, indent=2),
-            "resume": resume
-        })
+    def stream_response(self, prompt_name: str, context: Dict[str, Any]) -> Iterator[str]:
+        self.prompt_registry.validate_context(prompt_name, context)
+        context = self.prepare_context(prompt_name, context)
 
-    def simulate_first_day(self, job_description: str, company_info: str) -> str:
-        prompt = """Simulate the first day at a new job based on the following information:
+        cache_key = self.get_cache_key(prompt_name, context)
+        if cache_key is not None:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                yield cached_response
+                return
 
-Job Description:
-{job_description}
+        chain = self.create_chain(prompt_name)
 
-Company Information:
-{company_info}
+        def request() -> Iterator[str]:
+            chunks = []
+            for chunk in self.transport.stream(lambda: chain.stream(context), self._estimate_tokens(prompt_name, context)):
+                chunks.append(chunk)
+                yield chunk
+            if cache_key is not None:
+                self.response_cache.set(cache_key, "".join(chunks))
+
+        yield from request() if cache_key is None else self.single_flight.stream(("stream", cache_key), request)
+
+    def stream_sections(self, prompt_name: str, context: Dict[str, Any]) -> Iterator[Section]:
+        # Numbered sections of the response, each yielded as soon as the next one starts
+        return iter_sections(self.stream_response(prompt_name, context))
+
+    def generate_structured(self, prompt_name: str, context: Dict[str, Any], schema: Optional[Dict[str, Any]] = None) -> Any:
+        # JSON-mode call validated against the prompt's schema. A response that does not validate gets one
+        # targeted repair call instead of a full regeneration, and only responses that validate are cached
+        schema = schema if schema is not None else self._get_schema(prompt_name)
+        self.prompt_registry.validate_context(prompt_name, context)
+        context = self.prepare_context(prompt_name, context)
+
+        cache_key = self.get_cache_key(prompt_name, context)
+        if cache_key is not None:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                try:
+                    return parse_structured(cached_response, schema)
+                except StructuredOutputError:
+                    self.response_cache.invalidate(cache_key)
+
+        chain = self.create_chain(prompt_name, json_mode=LLM_JSON_MODE)
+
+        def request() -> str:
+            return self.transport.call(lambda: chain.invoke(context), self._estimate_tokens(prompt_name, context))
+
+        # The raw response is what gets shared, so every caller parses its own copy of the result
+        response = request() if cache_key is None else self.single_flight.do(("json", cache_key), request)
+        return self._parse_or_repair(response, schema, cache_key)
+
+    def stream_structured(self, prompt_name: str, context: Dict[str, Any], schema: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        # Yields progressively more complete (unvalidated) partial values, then the validated result last
+        schema = schema if schema is not None else self._get_schema(prompt_name)
+        self.prompt_registry.validate_context(prompt_name, context)
+        context = self.prepare_context(prompt_name, context)
+
+        cache_key = self.get_cache_key(prompt_name, context)
+        if cache_key is not None:
+            cached_response = self.response_cache.get(cache_key)
+            if cached_response is not None:
+                try:
+                    yield parse_structured(cached_response, schema)
+                    return
+                except StructuredOutputError:
+                    self.response_cache.invalidate(cache_key)
+
+        chain = self.create_chain(prompt_name, json_mode=LLM_JSON_MODE)
+
+        def request() -> Iterator[str]:
+            return self.transport.stream(lambda: chain.stream(context), self._estimate_tokens(prompt_name, context))
+
+        parser, chunks, last_partial = TolerantJSONParser(), [], None
+        for chunk in request() if cache_key is None else self.single_flight.stream(("json_stream", cache_key), request):
+            chunks.append(chunk)
+            parser.feed(chunk)
+            partial = parser.partial()
+            if partial is not None and partial != last_partial:
+                last_partial = partial
+                yield partial
+        yield self._parse_or_repair("".join(chunks), schema, cache_key)
+
+    def _get_schema(self, prompt_name: str) -> Dict[str, Any]:
+        schema = self.prompt_registry.get_schema(prompt_name)
+        if schema is None:
+            raise ValueError(f"Prompt template '{prompt_name}' has no output schema")
+        return schema
+
+    def _parse_or_repair(self, response: str, schema: Dict[str, Any], cache_key: Optional[str]) -> Any:
+        try:
+            result = parse_structured(response, schema)
+        except StructuredOutputError as e:
+            logger.info("Repairing structured response: %s", e)
+            repair_context = {"schema": format_instructions(schema), "response": response, "error": str(e)}
+            chain = self.create_chain("repair_json", json_mode=LLM_JSON_MODE)
+            response = self.transport.call(lambda: chain.invoke(repair_context),
+                                           self._estimate_tokens("repair_json", repair_context))
+            # A second failure propagates; the caller gets a StructuredOutputError rather than a guess
+            result = parse_structured(response, schema)
+        if cache_key is not None:
+            self.response_cache.set(cache_key, response)
+        return result
 
-Please provide a simulation of the first day, including:
-1. Arrival and onboarding process
-2. Key people to meet
-3. Main tasks and responsibilities
-4. Potential challenges and how to address them
-5. Tips for making a great first impression
+    def prepare_context(self, prompt_name: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        # Long resumes are swapped for their cached per-version summary instead of being re-summarized per call
+        if prompt_name in RESUME_SUMMARY_EXEMPT_PROMPTS:
+            return context
+        prepared = dict(context)
+        for variable in RESUME_SUMMARY_VARIABLES:
+            if isinstance(prepared.get(variable), str):
+                prepared[variable] = self.resume_summarizer.get_summary(prepared[variable])
+        return prepared
+
+    def get_cache_key(self, prompt_name: str, context: Dict[str, Any]) -> Optional[str]:
+        if prompt_name in self.uncached_prompts:
+            return None
+        template = self.prompt_registry.get_template(prompt_name).template
+        return make_cache_key(template, self.llm.model_name, self.llm.temperature, context)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return self.response_cache.get_stats()
+
+    def get_transport_stats(self) -> Dict[str, Any]:
+        return self.transport.get_stats()
+
+    def _estimate_tokens(self, prompt_name: str, context: Dict[str, Any]) -> int:
+        # What the call is charged against the tokens-per-minute bucket before it is sent
+        return count_tokens(self.prompt_registry.format(prompt_name, context)) + LLM_COMPLETION_TOKEN_ESTIMATE
+
+    def _estimate_message_tokens(self, messages: List[BaseMessage]) -> int:
+        return sum(count_tokens(message.content) for message in messages) + LLM_COMPLETION_TOKEN_ESTIMATE
+
+    def chat(self, user_input: str, scope: str = CAPTAIN_SCOPE, system_prompt: Optional[str] = None) -> str:
+        messages = self._chat_messages(user_input, scope, system_prompt)
+        response = self.transport.call(lambda: self.llm.invoke(messages), self._estimate_message_tokens(messages))
+        self.conversations.record(scope, user_input, response.content)
+        return response.content
 
-Your simulation:"""
+    async def achat(self, user_input: str, scope: str = CAPTAIN_SCOPE, system_prompt: Optional[str] = None) -> str:
+        messages = self._chat_messages(user_input, scope, system_prompt)
+        response = await self.transport.acall(lambda: self.llm.ainvoke(messages), self._estimate_message_tokens(messages))
+        self.conversations.record(scope, user_input, response.content)
+        return response.content
 
-        return self.generate_response(prompt, {
-            "job_description": job_description,
-            "company_info": company_info
+    def stream_chat(self, user_input: str, scope: str = CAPTAIN_SCOPE, system_prompt: Optional[str] = None) -> Iterator[str]:
+        messages = self._chat_messages(user_input, scope, system_prompt)
+        chunks = []
+        for chunk in self.transport.stream(lambda: self.llm.stream(messages), self._estimate_message_tokens(messages)):
+            chunks.append(chunk.content)
+            yield chunk.content
+        # Memory is only updated once the full reply has arrived, so an aborted stream leaves no half turn behind
+        self.conversations.record(scope, user_input, "".join(chunks))
+
+    def _chat_messages(self, user_input: str, scope: str, system_prompt: Optional[str]) -> List[BaseMessage]:
+        messages: List[BaseMessage] = [SystemMessage(content=system_prompt)] if system_prompt else []
+        return messages + self.conversations.messages(scope) + [HumanMessage(content=user_input)]
+
+    def _summarize_conversation(self, summary: str, transcript: str, max_tokens: int) -> str:
+        return self.generate_response("summarize_conversation", {
+            "summary": summary or "(none yet)",
+            "transcript": transcript,
+            "max_tokens": max_tokens
         })
 
-import json
-from typing import Dict, Any, List
-from langchain.prompts import PromptTemplate, ChatPromptTemplate, HumanMessagePromptTemplate, SystemMessagePromptTemplate
-from langchain.chat_models import ChatOpenAI
-from langchain.chains import LLMChain
-from langchain.memory import ConversationBufferMemory
-from langchain.schema import HumanMessage, AIMessage
-from config import OPENAI_API_KEY, LLM_TEMPERATURE
-
-class AIManager:
-    def __init__(self):
-        self.llm = ChatOpenAI(model_name=LLM_MODEL, temperature=LLM_TEMPERATURE, api_key=OPENAI_API_KEY)
-        self.memory = ConversationBufferMemory(return_messages=True)
-        self.prompt_templates = {}
-        
-        # Add the resume_chat prompt template
-        self.create_prompt_template(
-            "resume_chat",
-            "You are an AI assistant specializing in resume advice. The user's current resume is:\n\n{resume_content}\n\nUser: {user_input}\nAI Assistant:",
-            ["resume_content", "user_input"]
-        )
-        
-        # Add the resume_edit prompt template
-        self.create_prompt_template(
-            "resume_edit",
-            """You are editing the user's master resume. The current version is:
-
-{current_resume}
-
-The user has requested the following change:
-
-{edit_request}
-
-Implement this change while maintaining the overall structure and formatting of the resume. Provide your response in the following format:
-
-1. Updated Resume Section:
-[Provide the updated section here]
-
-2. Explanation of Changes:
-[Explain what was changed and why]
-
-3. Potential Impact:
-[Discuss how this change might affect the overall resume and job applications]
-
-4. Additional Suggestions:
-[Offer any related improvements or cautions]""",
-            ["current_resume", "edit_request"]
-        )
-        
-        # Add the format_resume prompt template
-        self.create_prompt_template(
-            "format_resume",
-            """Format and improve the following resume content:
-
-{resume_content}
-
-Please format the resume using the following guidelines:
-1. Use Markdown formatting throughout.
-2. Start with the candidate's name as a top-level header (# Name).
-# [Candidate Name]
-3. Structure the resume with the following sections, using second-level headers:
-## Contact Information
-## Professional Summary
-## Work Experience
-## Education
-## Skills
-4. Under each section header, use the following formatting:
-Contact Information:
-
-Use a single line for each piece of contact information.
-Include only available information; do not leave blank lines.
-Format:
-- Email: [email address]
-- Phone: [phone number]
-- Location: [city, state/province, country]
-- LinkedIn: [profile URL] (if available)
-Professional Summary:
-
-Write a brief paragraph (3-5 sentences) summarizing key qualifications and career objectives.
-Use italics for emphasis on key points:
-*[Key skill or qualification]*
-Work Experience:
-
-List each job in reverse chronological order.
-Use third-level headers (###) for job titles and companies:
-Copy### [Job Title] at [Company Name]
-
-Include employment dates on the same line as the job title:
-Copy### [Job Title] at [Company Name] (Month Year - Month Year or Present)
-
-Use bullet points (-) for responsibilities and achievements.
-Start each bullet point with a strong action verb.
-Highlight key achievements or metrics in bold:
-Copy- Increased sales by **25%** through implementation of new marketing strategies
-
-
-Education:
-
-List degrees in reverse chronological order.
-Use the following format:
-Copy- [Degree Name], [Major] - [University Name], [Graduation Year]
-
-Include any relevant coursework, honors, or GPA if noteworthy:
-Copy- Relevant coursework: [Course names]
-- Honors: [Honor or award names]
-- GPA: [X.XX] (if 3.5 or above)
-
-
-Skills:
-
-Group skills into categories (e.g., Technical Skills, Soft Skills, Languages).
-Use a bullet point list for each category:
-Copy- Technical Skills: [Skill 1], [Skill 2], [Skill 3]
-- Soft Skills: [Skill 1], [Skill 2], [Skill 3]
-- Languages: [Language 1] (Fluent), [Language 2] (Intermediate)
-5. Ensure consistent spacing:
-Add a blank line before and after each section header.
-Add a blank line between each job entry in the Work Experience section.
-6. If a section has no content, omit it entirely rather than leaving it empty.
-7. Use consistent capitalization for job titles, degree names, and skill categories.
-8. Limit the use of special characters and formatting to maintain a clean, professional appearance.
-
-Provide the formatted and improved resume:""",
-            ["resume_content"]
-        )
-
-    def create_prompt_template(self, name: str, template: str, input_variables: List[str]):
-        self.prompt_templates[name] = PromptTemplate(template=template, input_variables=input_variables)
-
-    def create_chain(self, prompt_name: str) -> LLMChain:
-        if prompt_name not in self.prompt_templates:
-            raise ValueError(f"Prompt template '{prompt_name}' not found")
-        return LLMChain(llm=self.llm, prompt=self.prompt_templates[prompt_name])
-
-    def create_chat_chain(self, system_template: str, human_template: str) -> LLMChain:
-        chat_prompt = ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(system_template),
-            HumanMessagePromptTemplate.from_template(human_template)
-        ])
-        return LLMChain(llm=self.llm, prompt=chat_prompt)
-
-    def generate_response(self, prompt_name: str, context: Dict[str, Any]) -> str:
-        print(f"Generating response for prompt: {prompt_name}")
-        print(f"Context keys: {context.keys()}")
-        if 'resume_content' in context:
-            print(f"Resume content length: {len(context['resume_content'])}")
-        
-        if prompt_name not in self.prompt_templates:
-            raise ValueError(f"Prompt template '{prompt_name}' not found")
-        
-        chain = self.create_chain(prompt_name)
-        return chain.run(**context)
-
-    def chat(self, user_input: str) -> str:
-        messages = self.memory.chat_memory.messages + [HumanMessage(content=user_input)]
-        response = self.llm(messages)
-        self.memory.chat_memory.add_user_message(user_input)
-        self.memory.chat_memory.add_ai_message(response.content)
-        return response.content
+    def format_prompt(self, prompt_name: str, context: Dict[str, Any]) -> str:
+        return self.prompt_registry.format(prompt_name, context)
 
     def analyze_resume(self, resume_content: str) -> Dict[str, List[str]]:
-        prompt_name = "resume_analysis"
-        if prompt_name not in self.prompt_templates:
-            self.create_prompt_template(
-                prompt_name,
-                "Analyze the following resume:\n\n{resume_content}\n\nProvide analysis in the following categories:\n1. Strengths\n2. Areas for Improvement\n3. Suggested Additions\n4. Formatting Recommendations\n5. Industry-Specific Advice",
-                ["resume_content"]
-            )
-        response = self.generate_response(prompt_name, {"resume_content": resume_content})
+        response = self.generate_response("resume_analysis", {"resume_content": resume_content})
         return self._parse_list_response(response)
 
     def analyze_job_description(self, job_description: str, resume: str) -> Dict[str, List[str]]:
-        prompt_name = "job_description_analysis"
-        if prompt_name not in self.prompt_templates:
-            self.create_prompt_template(
-                prompt_name,
-                "Analyze the following job description and compare it to the resume:\n\nJob Description:\n{job_description}\n\nResume:\n{resume}\n\nProvide analysis in the following categories:\n1. Key Requirements\n2. Matching Skills\n3. Missing Skills\n4. Tailoring Suggestions",
-                ["job_description", "resume"]
-            )
-        response = self.generate_response(prompt_name, {"job_description": job_description, "resume": resume})
+        response = self.generate_response("job_description_analysis", {"job_description": job_description, "resume": resume})
         return self._parse_list_response(response)
 
     def generate_job_search_overview(self, applications: List[Dict], resume: str) -> str:
-        prompt_name = "job_search_overview"
-        if prompt_name not in self.prompt_templates:
-            self.create_prompt_template(
-                prompt_name,
-                "Generate a job search overview based on the following information:\n\nJob Applications:\n{applications}\n\nResume:\n{resume}\n\nProvide an overview including:\n1. Summary of active applications\n2. Overall application success rate\n3. Suggestions for improvement\n4. Next steps in the job search",
-                ["applications", "resume"]
-            )
-        return self.generate_response(prompt_name, {"applications": json.dumps(applications), "resume": resume})
+        return self.generate_response("applications_overview", {"applications": json.dumps(applications), "resume": resume})
 
     def _parse_list_response(self, response: str) -> Dict[str, List[str]]:
-        lines = response.strip().split('\n')
-        result = {}
-        current_category = None
-        for line in lines:
-            if line.startswith(('1.', '2.', '3.', '4.', '5.')):
-                current_category = line[3:].strip()
-                result[current_category] = []
-            elif current_category and line.strip():
-                result[current_category].append(line.strip())
-        return result
+        return sections_to_lists(parse_sections(response))
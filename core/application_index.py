@@ -0,0 +1,160 @@
+# core/application_index.py
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+INDEXED_FIELDS = ("status", "company", "position")
+TIMESTAMP_FIELDS = ("added_at", "updated_at")
+
+FilterValue = Union[str, Iterable[str], None]
+
+
+def normalize_value(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower()
+
+
+class ApplicationIndex:
+    """Secondary indexes over job applications: value sets for status/company/position, sorted timestamp lists."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        self._values: Dict[str, Dict[str, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+        self._keys: Dict[str, Dict[str, Optional[str]]] = {field: {} for field in INDEXED_FIELDS}
+        # (timestamp, job_id) pairs kept sorted so ranges and newest-first pages are bisected, not scanned
+        self._timelines: Dict[str, List[Tuple[float, str]]] = {field: [] for field in TIMESTAMP_FIELDS}
+        self._timestamps: Dict[str, Dict[str, float]] = {field: {} for field in TIMESTAMP_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._timestamps["added_at"])
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._timestamps["added_at"]
+
+    def add(self, job_id: str, data: Dict[str, Any], timestamp: float) -> None:
+        with self._lock:
+            if job_id in self:
+                self.remove(job_id)
+            self._set_timestamp("added_at", job_id, timestamp)
+            self.update(job_id, data, timestamp)
+
+    def update(self, job_id: str, data: Dict[str, Any], timestamp: float) -> None:
+        with self._lock:
+            for field in INDEXED_FIELDS:
+                self._set_value(field, job_id, normalize_value(data.get(field)))
+            self._set_timestamp("updated_at", job_id, timestamp)
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            for field in INDEXED_FIELDS:
+                self._set_value(field, job_id, None)
+                self._keys[field].pop(job_id, None)
+            for field in TIMESTAMP_FIELDS:
+                previous = self._timestamps[field].pop(job_id, None)
+                if previous is not None:
+                    self._remove_from_timeline(field, previous, job_id)
+
+    def rebuild(self, applications: Dict[str, Dict[str, Any]], events: Iterable[Dict[str, Any]]) -> None:
+        # First and last history events give each application its added/updated times
+        added_at: Dict[str, float] = {}
+        updated_at: Dict[str, float] = {}
+        for event in events:
+            job_id = event.get("job_id")
+            if job_id in applications:
+                added_at.setdefault(job_id, event["timestamp"])
+                updated_at[job_id] = event["timestamp"]
+        with self._lock:
+            self.reset()
+            for job_id, data in applications.items():
+                self._set_timestamp("added_at", job_id, added_at.get(job_id, 0.0))
+                for field in INDEXED_FIELDS:
+                    self._set_value(field, job_id, normalize_value(data.get(field)))
+                self._set_timestamp("updated_at", job_id, updated_at.get(job_id, added_at.get(job_id, 0.0)))
+
+    def _set_value(self, field: str, job_id: str, value: Optional[str]) -> None:
+        index, keys = self._values[field], self._keys[field]
+        previous = keys.get(job_id)
+        if previous == value and job_id in keys:
+            return
+        if previous is not None:
+            index[previous].discard(job_id)
+            if not index[previous]:
+                del index[previous]
+        if value is not None:
+            index.setdefault(value, set()).add(job_id)
+        keys[job_id] = value
+
+    def _set_timestamp(self, field: str, job_id: str, timestamp: float) -> None:
+        previous = self._timestamps[field].get(job_id)
+        if previous is not None:
+            self._remove_from_timeline(field, previous, job_id)
+        self._timestamps[field][job_id] = timestamp
+        insort(self._timelines[field], (timestamp, job_id))
+
+    def _remove_from_timeline(self, field: str, timestamp: float, job_id: str) -> None:
+        timeline = self._timelines[field]
+        position = bisect_left(timeline, (timestamp, job_id))
+        if position < len(timeline) and timeline[position] == (timestamp, job_id):
+            del timeline[position]
+
+    def get_timestamp(self, field: str, job_id: str) -> Optional[float]:
+        return self._timestamps[field].get(job_id)
+
+    def values(self, field: str) -> List[str]:
+        return sorted(self._values[field])
+
+    def select(self, filters: Dict[str, FilterValue], time_ranges: Dict[str, Tuple[Optional[float], Optional[float]]]) -> Optional[Set[str]]:
+        # Returns None when nothing is filtered so callers can walk a timeline instead of materializing every id
+        with self._lock:
+            candidate_sets = []
+            for field, wanted in filters.items():
+                if wanted is None:
+                    continue
+                wanted = [wanted] if isinstance(wanted, str) else list(wanted)
+                matches: Set[str] = set()
+                for value in wanted:
+                    matches |= self._values[field].get(normalize_value(value), set())
+                candidate_sets.append(matches)
+            for field, (start, end) in time_ranges.items():
+                if start is None and end is None:
+                    continue
+                timeline = self._timelines[field]
+                low = bisect_left(timeline, (start,)) if start is not None else 0
+                high = bisect_right(timeline, (end, "\uffff")) if end is not None else len(timeline)
+                candidate_sets.append({job_id for _, job_id in timeline[low:high]})
+            if not candidate_sets:
+                return None
+            # Intersect starting from the smallest set so compound filters cost as little as the most selective one
+            candidate_sets.sort(key=len)
+            result = set(candidate_sets[0])
+            for matches in candidate_sets[1:]:
+                if not result:
+                    break
+                result &= matches
+            return result
+
+    def iter_by_time(self, field: str, descending: bool = True, batch_size: int = 32) -> Iterator[str]:
+        # Lazily walks the timeline in batches that double in size, so a "latest N" page copies O(N) entries
+        # rather than the whole timeline. Each batch resumes after the last entry yielded, found by bisection,
+        # so concurrent updates never make the walk skip or repeat an entry that stays put
+        last: Optional[Tuple[float, str]] = None
+        while True:
+            with self._lock:
+                timeline = self._timelines[field]
+                if descending:
+                    high = bisect_left(timeline, last) if last is not None else len(timeline)
+                    batch = timeline[max(0, high - batch_size):high][::-1]
+                else:
+                    low = bisect_right(timeline, last) if last is not None else 0
+                    batch = timeline[low:low + batch_size]
+            if not batch:
+                return
+            for _, job_id in batch:
+                yield job_id
+            last = batch[-1]
+            batch_size *= 2
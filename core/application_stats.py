@@ -0,0 +1,153 @@
+# core/application_stats.py
+
+import threading
+from typing import Any, Dict, Iterable, Optional, Set
+
+SUCCESS_STATUS = "Offer Received"
+APPLIED_STATUS = "Applied"
+
+# Upper bounds (in days) of the time-to-response histogram buckets; the last bucket is open-ended
+RESPONSE_TIME_BUCKETS = (1, 3, 7, 14, 30)
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def _bucket_label(index: int) -> str:
+    if index == len(RESPONSE_TIME_BUCKETS):
+        return f"{RESPONSE_TIME_BUCKETS[-1]}+ days"
+    lower = RESPONSE_TIME_BUCKETS[index - 1] if index else 0
+    return f"{lower}-{RESPONSE_TIME_BUCKETS[index]} days"
+
+
+class ApplicationStats:
+    """Aggregates kept up to date on every add/update so reads never rescan the applications."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.total = 0
+        self.status_counts: Dict[str, int] = {}
+        self.company_counts: Dict[str, int] = {}
+        self.transition_counts: Dict[str, int] = {}
+        # Number of applications that have ever reached each status, i.e. the funnel
+        self.reached_counts: Dict[str, int] = {}
+        self._reached: Dict[str, Set[str]] = {}
+        self._status: Dict[str, Optional[str]] = {}
+        self._company: Dict[str, Optional[str]] = {}
+        self._applied_at: Dict[str, float] = {}
+        self.response_count = 0
+        self.response_seconds_total = 0.0
+        self.response_seconds_min: Optional[float] = None
+        self.response_seconds_max: Optional[float] = None
+        self.response_histogram = [0] * (len(RESPONSE_TIME_BUCKETS) + 1)
+
+    def on_add(self, job_id: str, data: Dict[str, Any], timestamp: float) -> None:
+        with self._lock:
+            if job_id in self._status:
+                self._remove(job_id)
+            self.total += 1
+            self._status[job_id] = None
+            self._reached[job_id] = set()
+            self._set_company(job_id, data.get("company"))
+            self._set_status(job_id, data.get("status"), timestamp)
+
+    def on_update(self, job_id: str, data: Dict[str, Any], timestamp: float) -> None:
+        with self._lock:
+            if job_id not in self._status:
+                return
+            self._set_company(job_id, data.get("company"))
+            self._set_status(job_id, data.get("status"), timestamp)
+
+    def rebuild(self, applications: Dict[str, Dict[str, Any]], events: Iterable[Dict[str, Any]]) -> None:
+        # Replays status history for the funnel and response times, then settles on the stored current values
+        self.reset()
+        for event in events:
+            job_id = event.get("job_id")
+            if job_id not in applications or "to_status" not in event:
+                continue
+            if job_id not in self._status:
+                self.on_add(job_id, {"status": event["to_status"]}, event["timestamp"])
+            else:
+                self.on_update(job_id, {"status": event["to_status"]}, event["timestamp"])
+        for job_id, data in applications.items():
+            if job_id not in self._status:
+                self.on_add(job_id, data, 0.0)
+            else:
+                self.on_update(job_id, data, 0.0)
+
+    def _remove(self, job_id: str) -> None:
+        self._decrement(self.status_counts, self._status.pop(job_id))
+        self._decrement(self.company_counts, self._company.pop(job_id, None))
+        for status in self._reached.pop(job_id, set()):
+            self._decrement(self.reached_counts, status)
+        self._applied_at.pop(job_id, None)
+        self.total -= 1
+
+    def _set_company(self, job_id: str, company: Optional[str]) -> None:
+        previous = self._company.get(job_id)
+        if company is None or company == previous:
+            return
+        self._decrement(self.company_counts, previous)
+        self.company_counts[company] = self.company_counts.get(company, 0) + 1
+        self._company[job_id] = company
+
+    def _set_status(self, job_id: str, status: Optional[str], timestamp: float) -> None:
+        previous = self._status.get(job_id)
+        if status is None or status == previous:
+            return
+        self._decrement(self.status_counts, previous)
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        self._status[job_id] = status
+
+        key = f"{previous or 'New'} -> {status}"
+        self.transition_counts[key] = self.transition_counts.get(key, 0) + 1
+        if status not in self._reached[job_id]:
+            self._reached[job_id].add(status)
+            self.reached_counts[status] = self.reached_counts.get(status, 0) + 1
+
+        # Time to response: from entering "Applied" to the first move away from it
+        if status == APPLIED_STATUS:
+            self._applied_at.setdefault(job_id, timestamp)
+        elif previous == APPLIED_STATUS and job_id in self._applied_at and timestamp:
+            self._record_response(timestamp - self._applied_at.pop(job_id))
+
+    def _record_response(self, seconds: float) -> None:
+        seconds = max(seconds, 0.0)
+        self.response_count += 1
+        self.response_seconds_total += seconds
+        self.response_seconds_min = seconds if self.response_seconds_min is None else min(self.response_seconds_min, seconds)
+        self.response_seconds_max = seconds if self.response_seconds_max is None else max(self.response_seconds_max, seconds)
+        days = seconds / SECONDS_PER_DAY
+        bucket = next((i for i, limit in enumerate(RESPONSE_TIME_BUCKETS) if days < limit), len(RESPONSE_TIME_BUCKETS))
+        self.response_histogram[bucket] += 1
+
+    def _decrement(self, counts: Dict[str, int], key: Optional[str]) -> None:
+        if key is None or key not in counts:
+            return
+        counts[key] -= 1
+        if counts[key] <= 0:
+            del counts[key]
+
+    def success_rate(self) -> float:
+        return self.status_counts.get(SUCCESS_STATUS, 0) / self.total if self.total > 0 else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            average_days = (self.response_seconds_total / self.response_count / SECONDS_PER_DAY) if self.response_count else None
+            return {
+                "total_applications": self.total,
+                "success_rate": self.success_rate(),
+                "status_counts": dict(self.status_counts),
+                "funnel": dict(self.reached_counts),
+                "status_transitions": dict(self.transition_counts),
+                "company_counts": dict(self.company_counts),
+                "time_to_response": {
+                    "responses": self.response_count,
+                    "average_days": average_days,
+                    "min_days": self.response_seconds_min / SECONDS_PER_DAY if self.response_seconds_min is not None else None,
+                    "max_days": self.response_seconds_max / SECONDS_PER_DAY if self.response_seconds_max is not None else None,
+                    "histogram": {_bucket_label(i): count for i, count in enumerate(self.response_histogram)},
+                },
+            }
@@ -1,42 +1,246 @@
 # core/context_manager.py
 
 import json
+import os
 import time
-from typing import Dict, List, Any
+from itertools import islice
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from config import CAPTAIN_CONTEXT_TOKEN_BUDGET
+from core.application_index import ApplicationIndex, FilterValue, INDEXED_FIELDS, TIMESTAMP_FIELDS, normalize_value
+from core.application_stats import ApplicationStats
+from core.history_log import HistoryLog
+from core.resume_document import ResumeDocument
+from core.resume_versions import ResumeVersionStore
+from core.state_store import StateStore
+from core.vector_index import RESUME_DOCUMENT_ID, VectorIndex
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+# Lower values are packed into prompts first when the token budget is tight
+STATUS_PRIORITY = {
+    "Interview Scheduled": 0,
+    "Offer Received": 1,
+    "Applied": 2,
+    "Not Started": 3,
+    "Rejected": 4,
+}
+
+# Applications reaching this status record which resume version was sent
+SUBMITTED_STATUS = "Applied"
+
+# Application fields worth sending to the model; full descriptions are left out of aggregate prompts
+COMPACT_APPLICATION_FIELDS = ("company", "position", "status", "description_summary")
+
+
+def compact_json(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), default=str)
+
+
+def application_text(application: Dict[str, Any]) -> str:
+    return "\n\n".join(str(application[field]) for field in ("position", "company", "description") if application.get(field))
+
+def resume_vector_documents(document: ResumeDocument) -> Dict[str, str]:
+    # One vector document per section, so an edit re-embeds only the sections it touched
+    documents = {f"{RESUME_DOCUMENT_ID}/{section.title}": section.block for section in document}
+    if document.header.strip():
+        documents[RESUME_DOCUMENT_ID] = document.header
+    return documents
 
 class CAPTAINContextManager:
-    def __init__(self):
+    def __init__(self, store: Optional[StateStore] = None):
         self.job_applications: Dict[str, Dict[str, Any]] = {}
-        self.master_resume: str = ""
+        # The resume is held once, parsed; master_resume is its text
+        self.resume_document = ResumeDocument()
         self.global_insights: Dict[str, Any] = {}
-        self.application_history: List[Dict[str, Any]] = []
+        self.history = HistoryLog()
+        # Counts, funnel and response times maintained on every change so reads are O(1)
+        self.stats = ApplicationStats()
+        self.index = ApplicationIndex()
+        # Embeddings for local resume-to-job matching; synced lazily on first use after a load
+        self.vector_index: Optional[VectorIndex] = None
+        self._vectors_synced = False
+        self._resume_listeners: List[Callable[[str], Any]] = []
+        # When a store is attached every change is written through as a small atomic transaction
+        self.store = store
+        self.resume_versions = ResumeVersionStore(store) if store is not None else None
+
+    def attach_store(self, store: StateStore, history: Optional[HistoryLog] = None,
+                     vector_index: Optional[VectorIndex] = None) -> None:
+        self.store = store
+        self.resume_versions = ResumeVersionStore(store)
+        if history is not None:
+            self.history = history
+        if vector_index is not None:
+            self.vector_index = vector_index
+            self._vectors_synced = False
+
+    @property
+    def master_resume(self) -> str:
+        return self.resume_document.text
+
+    @master_resume.setter
+    def master_resume(self, resume: str) -> None:
+        self.resume_document = ResumeDocument.parse(resume, self.resume_document)
+
+    @property
+    def application_history(self) -> List[Dict[str, Any]]:
+        # Materializes every event; prefer self.history queries and rollups
+        return self.history.events()
 
     def add_job_application(self, job_id: str, data: Dict[str, Any]) -> None:
         self.job_applications[job_id] = data
-        self.application_history.append({"timestamp": time.time(), "action": "add", "job_id": job_id})
+        self._record_resume_version(job_id)
+        timestamp = self.history.append("add", job_id, to_status=data.get("status"))
+        self.stats.on_add(job_id, data, timestamp)
+        self.index.add(job_id, data, timestamp)
+        self._index_application_text(job_id)
+        self._persist_application(job_id)
 
     def update_job_application(self, job_id: str, data: Dict[str, Any]) -> None:
         if job_id in self.job_applications:
+            previous_status = self.job_applications[job_id].get("status")
             self.job_applications[job_id].update(data)
-            self.application_history.append({"timestamp": time.time(), "action": "update", "job_id": job_id})
+            new_status = self.job_applications[job_id].get("status")
+            if new_status != previous_status:
+                self._record_resume_version(job_id)
+                timestamp = self.history.append("update", job_id, from_status=previous_status, to_status=new_status)
+            else:
+                timestamp = self.history.append("update", job_id)
+            self.stats.on_update(job_id, self.job_applications[job_id], timestamp)
+            self.index.update(job_id, self.job_applications[job_id], timestamp)
+            self._index_application_text(job_id)
+            self._persist_application(job_id)
         else:
             raise KeyError(f"Job application with ID {job_id} not found")
 
+    def _record_resume_version(self, job_id: str) -> None:
+        # The resume submitted with an application is the job's tailored variant if there is one, else the master
+        application = self.job_applications[job_id]
+        if application.get("status") != SUBMITTED_STATUS or application.get("resume_version") or self.resume_versions is None:
+            return
+        version = self.resume_versions.head(job_id)
+        version = version if version is not None else self.resume_versions.head()
+        if version is not None:
+            application["resume_version"] = version
+
+    def _persist_application(self, job_id: str) -> None:
+        if self.store is not None:
+            self.store.upsert_application(job_id, self.job_applications[job_id])
+
+    def _index_application_text(self, job_id: str) -> None:
+        # Unchanged text is detected by hash, so status-only updates cost nothing here
+        if self.vector_index is not None and self._vectors_synced:
+            self.vector_index.add(job_id, application_text(self.job_applications[job_id]), kind="job")
+
     def get_job_application(self, job_id: str) -> Dict[str, Any]:
         return self.job_applications.get(job_id, {})
 
+    def get_canonical_job_id(self, job_id: str) -> str:
+        # Near-duplicate postings point at the posting they were first seen as; analyses belong to that one
+        seen = {job_id}
+        while True:
+            canonical_id = self.job_applications.get(job_id, {}).get("duplicate_of")
+            if canonical_id is None or canonical_id in seen or canonical_id not in self.job_applications:
+                return job_id
+            seen.add(canonical_id)
+            job_id = canonical_id
+
     def get_all_job_applications(self) -> Dict[str, Dict[str, Any]]:
         return self.job_applications
 
-    def update_master_resume(self, resume: str) -> None:
-        self.master_resume = resume
-        self.application_history.append({"timestamp": time.time(), "action": "resume_update"})
+    def set_job_applications(self, applications: Dict[str, Dict[str, Any]]) -> None:
+        self.job_applications = applications
+        self._vectors_synced = False
+        self._rebuild_indexes()
+
+    def query_applications(self, status: FilterValue = None, company: FilterValue = None, position: FilterValue = None,
+                           added_after: Optional[float] = None, added_before: Optional[float] = None,
+                           updated_after: Optional[float] = None, updated_before: Optional[float] = None,
+                           sort_by: str = "updated_at", descending: bool = True,
+                           offset: int = 0, limit: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        # Filters on the same field match any of the given values; different fields must all match
+        candidates = self.index.select(
+            {"status": status, "company": company, "position": position},
+            {"added_at": (added_after, added_before), "updated_at": (updated_after, updated_before)}
+        )
+        end = offset + limit if limit is not None else None
+
+        if sort_by in TIMESTAMP_FIELDS and (candidates is None or 4 * len(candidates) > len(self.index)):
+            # Most applications match: walk the pre-sorted timeline and stop once the page is full
+            job_ids = self.index.iter_by_time(sort_by, descending)
+            if candidates is not None:
+                job_ids = (job_id for job_id in job_ids if job_id in candidates)
+            page = list(islice(job_ids, offset, end))
+        else:
+            if candidates is None:
+                candidates = self.job_applications.keys()
+            page = sorted(candidates, key=self._sort_key(sort_by), reverse=descending and sort_by != "priority")[offset:end]
+        return [(job_id, self.job_applications[job_id]) for job_id in page]
+
+    def count_applications(self, status: FilterValue = None, company: FilterValue = None, position: FilterValue = None,
+                           added_after: Optional[float] = None, added_before: Optional[float] = None,
+                           updated_after: Optional[float] = None, updated_before: Optional[float] = None) -> int:
+        candidates = self.index.select(
+            {"status": status, "company": company, "position": position},
+            {"added_at": (added_after, added_before), "updated_at": (updated_after, updated_before)}
+        )
+        return len(self.index) if candidates is None else len(candidates)
+
+    def get_application_field_values(self, field: str) -> List[str]:
+        return self.index.values(field)
+
+    def _sort_key(self, sort_by: str) -> Callable[[str], Any]:
+        if sort_by in TIMESTAMP_FIELDS:
+            return lambda job_id: (self.index.get_timestamp(sort_by, job_id) or 0.0, job_id)
+        if sort_by in INDEXED_FIELDS:
+            return lambda job_id: (normalize_value(self.job_applications[job_id].get(sort_by)) or "", job_id)
+        if sort_by == "priority":
+            # Most actionable statuses first, most recently touched first within a status
+            return lambda job_id: (STATUS_PRIORITY.get(self.job_applications[job_id].get("status"), len(STATUS_PRIORITY)),
+                                   -(self.index.get_timestamp("updated_at", job_id) or 0.0))
+        raise ValueError(f"Cannot sort applications by '{sort_by}'")
+
+    def update_master_resume(self, resume: str, message: str = "") -> List[str]:
+        # Returns the titles of the sections that changed; only those are re-embedded and re-summarized
+        previous = self.resume_document
+        self.resume_document = ResumeDocument.parse(resume, previous)
+        changed = self.resume_document.changed_sections(previous)
+        self.history.append("resume_update")
+        if self.store is not None:
+            with self.store.transaction():
+                self.store.set_value("master_resume", resume)
+                self.resume_versions.commit(resume, message=message)
+        if self.vector_index is not None and self._vectors_synced and changed:
+            self.vector_index.sync(resume_vector_documents(self.resume_document), kind="resume")
+        for listener in self._resume_listeners:
+            listener(resume)
+        return changed
+
+    def add_resume_listener(self, listener: Callable[[str], Any]) -> None:
+        self._resume_listeners.append(listener)
 
     def get_master_resume(self) -> str:
         return self.master_resume
 
+    def get_resume_document(self) -> ResumeDocument:
+        return self.resume_document
+
+    def commit_resume_variant(self, job_id: str, resume: str, message: str = "") -> int:
+        # A tailored resume for one application, stored as a delta against the master version it came from
+        return self.resume_versions.commit(resume, job_id=job_id, message=message)
+
+    def get_resume_for_job(self, job_id: str) -> str:
+        # The job's tailored variant if one exists, otherwise the master resume
+        version = self.resume_versions.head(job_id) if self.resume_versions is not None else None
+        return self.resume_versions.checkout(version) if version is not None else self.master_resume
+
+    def get_resume_sections(self, *titles: str) -> str:
+        # Just the named sections (and the name/contact header) for prompts that need no more
+        return self.resume_document.render(titles)
+
     def add_global_insight(self, key: str, value: Any) -> None:
         self.global_insights[key] = value
+        if self.store is not None:
+            self.store.set_value("global_insights", self.global_insights)
 
     def get_global_insight(self, key: str) -> Any:
         return self.global_insights.get(key)
@@ -56,13 +260,97 @@ class CAPTAINContextManager:
             "all_applications": self.job_applications,
             "master_resume": self.master_resume,
             "global_insights": self.global_insights,
-            "application_history": self.application_history
+            "application_history": self.history.get_rollups()
         }
 
+    def build_captain_context(self, token_budget: int = CAPTAIN_CONTEXT_TOKEN_BUDGET, resume_share: float = 0.4,
+                              history_share: float = 0.1, resume: Optional[str] = None) -> Dict[str, Any]:
+        job_market_trends = compact_json(self.global_insights.get('job_market_trends', {}))
+        skill_gaps = compact_json(self.global_insights.get('skill_gaps', {}))
+        remaining = token_budget - count_tokens(job_market_trends) - count_tokens(skill_gaps)
+
+        master_resume, resume_tokens, resume_truncated = truncate_to_tokens(
+            self.master_resume if resume is None else resume, int(remaining * resume_share))
+        remaining -= resume_tokens
+
+        # Applications get everything that is left apart from the history share
+        application_budget = remaining - int(remaining * history_share)
+        included_applications, used_tokens = [], 2
+        omitted_by_status: Dict[str, int] = {}
+        for job_id, application in self.query_applications(sort_by="priority"):
+            record = compact_json({"job_id": job_id, **{field: application[field] for field in COMPACT_APPLICATION_FIELDS if application.get(field)}})
+            record_tokens = count_tokens(record) + 1
+            if used_tokens + record_tokens > application_budget:
+                status = application.get("status", "Unknown")
+                omitted_by_status[status] = omitted_by_status.get(status, 0) + 1
+                continue
+            included_applications.append(record)
+            used_tokens += record_tokens
+        applications = "[" + ",".join(included_applications) + "]"
+        remaining -= used_tokens
+
+        # History is sent as fixed-size rollups rather than raw events; the daily breakdown goes first if space is short
+        rollups = self.history.get_rollups()
+        recent_history = compact_json(rollups)
+        history_truncated = count_tokens(recent_history) > remaining
+        if history_truncated:
+            rollups.pop("events_per_day")
+            recent_history = compact_json(rollups)
+        remaining -= count_tokens(recent_history)
+
+        return {
+            "applications": applications,
+            "master_resume": master_resume,
+            "job_market_trends": job_market_trends,
+            "skill_gaps": skill_gaps,
+            "recent_history": recent_history,
+            "truncation_report": {
+                "token_budget": token_budget,
+                "tokens_used": token_budget - remaining,
+                "applications_included": len(included_applications),
+                "applications_omitted": len(self.job_applications) - len(included_applications),
+                "applications_omitted_by_status": omitted_by_status,
+                "resume_truncated": resume_truncated,
+                "history_events_summarized": len(self.history),
+                "history_truncated": history_truncated,
+            }
+        }
+
+    def get_vector_index(self) -> VectorIndex:
+        if self.vector_index is None:
+            self.vector_index = VectorIndex()
+        if not self._vectors_synced:
+            # Only new or edited descriptions are embedded; the rest are matched by content hash
+            self.vector_index.sync({job_id: application_text(application) for job_id, application in self.job_applications.items()}, kind="job")
+            self.vector_index.sync(resume_vector_documents(self.resume_document), kind="resume")
+            self._vectors_synced = True
+        return self.vector_index
+
+    def rank_applications_for_resume(self, top_k: Optional[int] = None, status: FilterValue = None,
+                                     resume: Optional[str] = None) -> List[Tuple[str, float]]:
+        # Scores every job description against the resume in one vectorized pass, no LLM calls
+        resume = self.master_resume if resume is None else resume
+        if not resume.strip():
+            return []
+        ranking = self.get_vector_index().rank(resume, kind="job")
+        candidates = self.index.select({"status": status}, {}) if status is not None else None
+        if candidates is not None:
+            ranking = [(job_id, score) for job_id, score in ranking if job_id in candidates]
+        return ranking[:top_k] if top_k is not None else ranking
+
+    def find_similar_applications(self, job_id: str, top_k: int = 5) -> List[Tuple[str, float]]:
+        return self.get_vector_index().similar_to(job_id, top_k, kind="job")
+
     def get_application_success_rate(self) -> float:
-        total_applications = len(self.job_applications)
-        successful_applications = sum(1 for app in self.job_applications.values() if app.get("status") == "Offer Received")
-        return successful_applications / total_applications if total_applications > 0 else 0.0
+        return self.stats.success_rate()
+
+    def get_application_stats(self) -> Dict[str, Any]:
+        return self.stats.get_stats()
+
+    def _rebuild_indexes(self) -> None:
+        events = self.history.events()
+        self.stats.rebuild(self.job_applications, events)
+        self.index.rebuild(self.job_applications, events)
 
     def save_to_file(self, filename: str) -> None:
         data = {
@@ -71,13 +359,37 @@ class CAPTAINContextManager:
             "global_insights": self.global_insights,
             "application_history": self.application_history
         }
-        with open(filename, "w") as f:
+        # Write to a temporary file first so a crash mid-write never leaves a truncated file behind
+        tmp_filename = f"{filename}.tmp"
+        with open(tmp_filename, "w") as f:
             json.dump(data, f)
+        os.replace(tmp_filename, filename)
 
     def load_from_file(self, filename: str) -> None:
         with open(filename, "r") as f:
             data = json.load(f)
-        self.job_applications = data["job_applications"]
         self.master_resume = data["master_resume"]
         self.global_insights = data["global_insights"]
-        self.application_history = data["application_history"]
+        self.history.clear()
+        self.history.extend(data["application_history"])
+        self.set_job_applications(data["job_applications"])
+
+    def save_to_store(self) -> None:
+        # Full snapshot in one transaction; normal operation relies on the per-change write-through instead
+        with self.store.transaction():
+            self.store.upsert_applications(self.job_applications)
+            self.store.set_value("master_resume", self.master_resume)
+            self.store.set_value("global_insights", self.global_insights)
+
+    def load_from_store(self) -> None:
+        applications = self.store.load_applications()
+        self.master_resume = self.store.get_value("master_resume", "")
+        self.global_insights = self.store.get_value("global_insights", {})
+        # Stores created before version history start it from the current resume
+        if self.master_resume and self.resume_versions.head() is None:
+            self.resume_versions.commit(self.master_resume, message="Initial version")
+        # History written by earlier versions lives in the store's history table; move it into the log once
+        if not len(self.history) and not self.store.get_value("history_migrated"):
+            self.history.extend(self.store.load_history())
+            self.store.set_value("history_migrated", time.time())
+        self.set_job_applications(applications)
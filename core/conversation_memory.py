@@ -0,0 +1,135 @@
+# core/conversation_memory.py
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from langchain.schema import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from config import CHAT_MEMORY_WINDOW_TOKENS, CHAT_MEMORY_SUMMARY_TOKENS
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+RESUME_SCOPE = "resume"
+CAPTAIN_SCOPE = "captain"
+_STORE_KEY_PREFIX = "conversation:"
+
+
+def job_scope(job_id: str) -> str:
+    return f"job:{job_id}"
+
+
+class Conversation:
+    def __init__(self, summary: str = "", turns: Optional[List[Dict[str, Any]]] = None):
+        self.summary = summary
+        # Each turn is {"user": ..., "assistant": ..., "tokens": ...}; the count is kept so windows are cheap
+        self.turns: List[Dict[str, Any]] = turns or []
+        self.lock = threading.Lock()
+        self.folding = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"summary": self.summary, "turns": self.turns}
+
+
+class ConversationMemory:
+    """Chat history per conversation scope, windowed by tokens with older turns folded into a rolling summary.
+
+    Scopes are independent, so the Captain, resume and per-job navigator chats never see each other's turns.
+    """
+
+    def __init__(self, summarize: Optional[Callable[[str, str, int], str]] = None,
+                 window_tokens: int = CHAT_MEMORY_WINDOW_TOKENS, summary_tokens: int = CHAT_MEMORY_SUMMARY_TOKENS):
+        self.summarize = summarize
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self.store = None
+        self._conversations: Dict[str, Conversation] = {}
+        self._lock = threading.Lock()
+
+    def attach_store(self, store) -> None:
+        # Conversations are loaded from the store lazily, the first time their scope is used
+        self.store = store
+        with self._lock:
+            self._conversations.clear()
+
+    def _get(self, scope: str) -> Conversation:
+        with self._lock:
+            conversation = self._conversations.get(scope)
+            if conversation is None:
+                data = self.store.get_value(_STORE_KEY_PREFIX + scope) if self.store is not None else None
+                conversation = Conversation(**data) if data else Conversation()
+                self._conversations[scope] = conversation
+            return conversation
+
+    def messages(self, scope: str) -> List[BaseMessage]:
+        # The summary plus the newest turns that fit the window: the prompt stays the same size however long the chat runs
+        conversation = self._get(scope)
+        with conversation.lock:
+            recent, used = [], 0
+            for turn in reversed(conversation.turns):
+                used += turn["tokens"]
+                if used > self.window_tokens and recent:
+                    break
+                recent.append(turn)
+            summary = conversation.summary
+        messages: List[BaseMessage] = []
+        if summary:
+            messages.append(SystemMessage(content=f"Summary of the earlier conversation:\n{summary}"))
+        for turn in reversed(recent):
+            messages.append(HumanMessage(content=turn["user"]))
+            messages.append(AIMessage(content=turn["assistant"]))
+        return messages
+
+    def record(self, scope: str, user_input: str, reply: str) -> None:
+        conversation = self._get(scope)
+        with conversation.lock:
+            conversation.turns.append({"user": user_input, "assistant": reply,
+                                       "tokens": count_tokens(user_input) + count_tokens(reply)})
+            self._save(scope, conversation)
+            fold = self._plan_fold(conversation)
+        if fold is not None:
+            self._fold(scope, conversation, *fold)
+
+    def _plan_fold(self, conversation: Conversation) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        # Called with the conversation lock held. Picks the oldest turns to fold until half the window is free,
+        # so summaries are made in batches rather than every turn; one fold runs at a time per conversation
+        total = sum(turn["tokens"] for turn in conversation.turns)
+        if total <= self.window_tokens or self.summarize is None or conversation.folding:
+            return None
+        count = 0
+        while count < len(conversation.turns) - 1 and total > self.window_tokens // 2:
+            total -= conversation.turns[count]["tokens"]
+            count += 1
+        if not count:
+            return None
+        conversation.folding = True
+        return conversation.summary, conversation.turns[:count]
+
+    def _fold(self, scope: str, conversation: Conversation, previous_summary: str, folded: List[Dict[str, Any]]) -> None:
+        # The summarizer is an LLM round trip, so it runs without the lock; readers keep getting the unfolded window
+        summary = None
+        try:
+            transcript = "\n".join(f"User: {turn['user']}\nAssistant: {turn['assistant']}" for turn in folded)
+            summary = self.summarize(previous_summary, transcript, self.summary_tokens)
+        except Exception as e:
+            # The turns stay put and are retried on the next fold; the window still keeps the prompt bounded
+            logger.warning("Error summarizing conversation: %s", e)
+        finally:
+            with conversation.lock:
+                conversation.folding = False
+                # Dropped if the conversation was cleared or otherwise changed underneath the summary
+                unchanged = (conversation.summary == previous_summary and len(conversation.turns) >= len(folded)
+                             and all(a is b for a, b in zip(conversation.turns, folded)))
+                if summary is not None and unchanged:
+                    conversation.summary = truncate_to_tokens(summary.strip(), self.summary_tokens)[0]
+                    del conversation.turns[:len(folded)]
+                    self._save(scope, conversation)
+
+    def clear(self, scope: str) -> None:
+        conversation = self._get(scope)
+        with conversation.lock:
+            conversation.summary, conversation.turns = "", []
+            self._save(scope, conversation)
+
+    def _save(self, scope: str, conversation: Conversation) -> None:
+        if self.store is not None:
+            self.store.set_value(_STORE_KEY_PREFIX + scope, conversation.to_dict())
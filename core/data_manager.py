@@ -1,51 +1,68 @@
 import json
-
-def save_progress(context_manager, file_path):
-    # Save application state to file
-    pass
-
-def load_progress(file_path):
-    # Load application state from file
-    pass
-import json
 import os
-from config import DATA_DIR, RESUME_FILE, JOB_APPLICATIONS_FILE
+from typing import Optional
+from config import DATA_DIR, RESUME_FILE, JOB_APPLICATIONS_FILE, HISTORY_DIR, VECTOR_INDEX_DIR
 from core.context_manager import CAPTAINContextManager
+from core.history_log import HistoryLog
+from core.state_store import StateStore
+from core.vector_index import VectorIndex
 
 class DataManager:
-    def __init__(self, context_manager: CAPTAINContextManager):
+    def __init__(self, context_manager: CAPTAINContextManager, store: Optional[StateStore] = None,
+                 data_dir: Optional[str] = None):
+        # Without a data_dir this is the single-user layout under DATA_DIR; sessions get a directory each
         self.context_manager = context_manager
+        self.data_dir = data_dir
         self.ensure_data_directory()
+        if data_dir is None:
+            self.store = store if store is not None else StateStore()
+            self.history = HistoryLog(HISTORY_DIR)
+            self.vector_index = VectorIndex(VECTOR_INDEX_DIR)
+        else:
+            self.store = store if store is not None else StateStore(os.path.join(data_dir, "captain.db"))
+            self.history = HistoryLog(os.path.join(data_dir, "history"))
+            self.vector_index = VectorIndex(os.path.join(data_dir, "vectors"))
+        # From here on every change made through the context manager is committed as it happens
+        self.context_manager.attach_store(self.store, self.history, self.vector_index)
 
     def ensure_data_directory(self):
-        os.makedirs(DATA_DIR, exist_ok=True)
+        os.makedirs(self.data_dir or DATA_DIR, exist_ok=True)
 
     def save_state(self):
-        self.save_resume()
-        self.save_job_applications()
+        self.context_manager.save_to_store()
+        self.vector_index.save()
 
     def load_state(self):
-        self.load_resume()
-        self.load_job_applications()
+        # Existing resume.md / job_applications.json are imported into the single-user store on first start
+        if self.data_dir is None:
+            self.store.migrate_from_files(RESUME_FILE, JOB_APPLICATIONS_FILE)
+        self.context_manager.load_from_store()
 
     def save_resume(self):
-        with open(RESUME_FILE, "w") as f:
-            f.write(self.context_manager.master_resume)
+        self.store.set_value("master_resume", self.context_manager.master_resume)
 
     def load_resume(self):
-        if os.path.exists(RESUME_FILE):
-            with open(RESUME_FILE, "r") as f:
-                self.context_manager.master_resume = f.read()
+        self.context_manager.master_resume = self.store.get_value("master_resume", "")
 
     def save_job_applications(self):
-        with open(JOB_APPLICATIONS_FILE, "w") as f:
-            json.dump(self.context_manager.job_applications, f)
+        self.store.upsert_applications(self.context_manager.job_applications)
 
     def load_job_applications(self):
-        if os.path.exists(JOB_APPLICATIONS_FILE):
-            with open(JOB_APPLICATIONS_FILE, "r") as f:
-                self.context_manager.job_applications = json.load(f)
+        self.context_manager.set_job_applications(self.store.load_applications())
+
+    def export_to_files(self):
+        # Legacy file layout, written atomically; useful for backups and hand inspection
+        for filename, content in ((RESUME_FILE, self.context_manager.master_resume),
+                                  (JOB_APPLICATIONS_FILE, json.dumps(self.context_manager.job_applications))):
+            tmp_filename = f"{filename}.tmp"
+            with open(tmp_filename, "w") as f:
+                f.write(content)
+            os.replace(tmp_filename, filename)
 
     def periodic_save(self):
-        # This method can be called periodically to save the application state
-        self.save_state()
+        # Changes are already committed; this folds the write-ahead log back into the database file
+        # and drops history events that have aged out of the retention window; embeddings are saved
+        # so the next start only re-embeds what changed
+        self.store.checkpoint()
+        self.history.apply_retention()
+        self.vector_index.save()
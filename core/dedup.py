@@ -0,0 +1,142 @@
+# core/dedup.py
+
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+import numpy as np
+from config import DEDUP_JACCARD_THRESHOLD, DEDUP_NUM_PERMUTATIONS, DEDUP_SHINGLE_SIZE
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> Set[str]:
+    # Word n-grams over lowercased text, so reflowed whitespace and punctuation changes do not matter
+    words = _WORD.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _false_positive_area(threshold: float, bands: int, rows: int, steps: int = 100) -> float:
+    return sum(1 - (1 - (threshold * i / steps) ** rows) ** bands for i in range(steps)) * threshold / steps
+
+
+def _false_negative_area(threshold: float, bands: int, rows: int, steps: int = 100) -> float:
+    width = 1 - threshold
+    return sum((1 - (threshold + width * i / steps) ** rows) ** bands for i in range(steps)) * width / steps
+
+
+def optimal_bands(threshold: float, num_permutations: int) -> Tuple[int, int]:
+    # Picks the (bands, rows) split whose S-curve best separates pairs above and below the threshold
+    best, best_error = (1, num_permutations), float("inf")
+    for bands in range(1, num_permutations + 1):
+        rows = num_permutations // bands
+        error = _false_positive_area(threshold, bands, rows) + _false_negative_area(threshold, bands, rows)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """MinHash signatures from universal hashes of the shingle set; the same seed gives comparable signatures."""
+
+    def __init__(self, num_permutations: int = DEDUP_NUM_PERMUTATIONS, shingle_size: int = DEDUP_SHINGLE_SIZE, seed: int = 1):
+        self.num_permutations = num_permutations
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, int(_MERSENNE_PRIME), num_permutations, dtype=np.uint64)
+        self._b = generator.randint(0, int(_MERSENNE_PRIME), num_permutations, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        values = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles(text, self.shingle_size)],
+                          dtype=np.uint64)
+        if not len(values):
+            return np.full(self.num_permutations, _MAX_HASH, dtype=np.uint64)
+        # All permutations of all shingles in one broadcast; uint64 arithmetic wraps, as in the usual MinHash scheme
+        permuted = (np.outer(values, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+
+def estimate_jaccard(first: np.ndarray, second: np.ndarray) -> float:
+    return float(np.count_nonzero(first == second)) / len(first)
+
+
+class NearDuplicateIndex:
+    """LSH over MinHash signatures: band buckets find candidates, signatures confirm them against the threshold."""
+
+    def __init__(self, threshold: float = DEDUP_JACCARD_THRESHOLD, hasher: Optional[MinHasher] = None):
+        self.threshold = threshold
+        self.hasher = hasher if hasher is not None else MinHasher()
+        self.bands, self.rows = optimal_bands(threshold, self.hasher.num_permutations)
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._signatures
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, text: str) -> List[Tuple[str, float]]:
+        return self._query_signature(self.hasher.signature(text))
+
+    def _query_signature(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        with self._lock:
+            return self._matches(signature)
+
+    def _matches(self, signature: np.ndarray) -> List[Tuple[str, float]]:
+        # Called with the lock held
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates |= self._buckets[band].get(key, set())
+        matches = [(job_id, estimate_jaccard(signature, self._signatures[job_id])) for job_id in candidates]
+        return sorted([match for match in matches if match[1] >= self.threshold], key=lambda match: match[1], reverse=True)
+
+    def add(self, job_id: str, text: str) -> None:
+        self._insert(job_id, self.hasher.signature(text))
+
+    def add_or_match(self, job_id: str, text: str) -> Optional[Tuple[str, float]]:
+        # Returns the closest indexed posting above the threshold; only postings without a match are indexed,
+        # so every duplicate links to a canonical posting rather than to another duplicate
+        # The lookup and the insert share one lock acquisition, so two concurrent near-duplicates cannot both
+        # miss each other and both become canonical
+        signature = self.hasher.signature(text)
+        with self._lock:
+            matches = self._matches(signature)
+            if matches:
+                return matches[0]
+            self._insert_signature(job_id, signature)
+        return None
+
+    def _insert(self, job_id: str, signature: np.ndarray) -> None:
+        with self._lock:
+            self._insert_signature(job_id, signature)
+
+    def _insert_signature(self, job_id: str, signature: np.ndarray) -> None:
+        # Called with the lock held
+        self._remove(job_id)
+        self._signatures[job_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(job_id)
+
+    def remove(self, job_id: str) -> None:
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        signature = self._signatures.pop(job_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[band][key]
@@ -0,0 +1,310 @@
+# core/history_log.py
+
+import json
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from config import HISTORY_SEGMENT_SIZE, HISTORY_RETENTION_DAYS
+
+ACTIONS = ("add", "update", "resume_update")
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+NO_VALUE = -1
+
+# Active (unsealed) events are appended to active.bin as fixed-size records:
+# sequence number, timestamp, action code, job code, previous status code, new status code
+ACTIVE_RECORD = struct.Struct("<qdBiii")
+
+COLUMNS = (("timestamps", "d"), ("actions", "B"), ("job_codes", "i"), ("from_statuses", "i"), ("to_statuses", "i"))
+
+
+class HistoryLog:
+    """Append-only, column-oriented application event log persisted as sealed segment files."""
+
+    def __init__(self, directory: Optional[str] = None, segment_size: int = HISTORY_SEGMENT_SIZE,
+                 retention_days: Optional[float] = HISTORY_RETENTION_DAYS):
+        self.directory = directory
+        self.segment_size = segment_size
+        self.retention_days = retention_days
+        self._lock = threading.RLock()
+        self._reset()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def _reset(self) -> None:
+        self.timestamps = array("d")
+        self.actions = array("B")
+        self.job_codes = array("i")
+        self.from_statuses = array("i")
+        self.to_statuses = array("i")
+        self._job_names: List[str] = []
+        self._job_index: Dict[str, int] = {}
+        self._status_names: List[str] = []
+        self._status_index: Dict[str, int] = {}
+        self._rows_by_job: Dict[int, array] = {}
+        self._daily_counts: Dict[str, Dict[str, int]] = {}
+        # Newest timestamp per action code; timestamps are appended in order, so the latest append wins
+        self._last_action_timestamps: Dict[int, float] = {}
+        self._segments: List[Dict[str, Any]] = []
+        self._segment_counter = 0
+        self._sealed_rows = 0
+        self._sealed_seq = 0
+        self._next_seq = 0
+
+    # Writing
+
+    def append(self, action: str, job_id: Optional[str] = None, timestamp: Optional[float] = None,
+               from_status: Optional[str] = None, to_status: Optional[str] = None) -> float:
+        with self._lock:
+            timestamp = time.time() if timestamp is None else timestamp
+            # Keep the timestamp column sorted so time-range queries can bisect it
+            if self.timestamps and timestamp < self.timestamps[-1]:
+                timestamp = self.timestamps[-1]
+            row = (timestamp, ACTION_CODES[action], self._intern_job(job_id),
+                   self._intern_status(from_status), self._intern_status(to_status))
+            self._append_row(row)
+            if self.directory:
+                with open(self._path("active.bin"), "ab") as f:
+                    f.write(ACTIVE_RECORD.pack(self._next_seq, *row))
+            self._next_seq += 1
+            if self.directory and len(self.timestamps) - self._sealed_rows >= self.segment_size:
+                self._seal()
+            return timestamp
+
+    def extend(self, events: Iterable[Dict[str, Any]]) -> None:
+        for event in events:
+            self.append(event["action"], event.get("job_id"), event.get("timestamp"),
+                        event.get("from_status"), event.get("to_status"))
+
+    def clear(self) -> None:
+        with self._lock:
+            if self.directory:
+                for name in os.listdir(self.directory):
+                    os.remove(self._path(name))
+            self._reset()
+
+    def _append_row(self, row: Tuple[float, int, int, int, int]) -> None:
+        timestamp, action, job_code, from_status, to_status = row
+        position = len(self.timestamps)
+        self.timestamps.append(timestamp)
+        self.actions.append(action)
+        self.job_codes.append(job_code)
+        self.from_statuses.append(from_status)
+        self.to_statuses.append(to_status)
+        if job_code != NO_VALUE:
+            self._rows_by_job.setdefault(job_code, array("I")).append(position)
+        day = self._counts_for_day(timestamp)
+        day[ACTIONS[action]] = day.get(ACTIONS[action], 0) + 1
+        self._last_action_timestamps[action] = timestamp
+
+    def _counts_for_day(self, timestamp: float) -> Dict[str, int]:
+        return self._daily_counts.setdefault(datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d"), {})
+
+    def _intern_job(self, job_id: Optional[str]) -> int:
+        return self._intern(job_id, self._job_names, self._job_index, "job")
+
+    def _intern_status(self, status: Optional[str]) -> int:
+        return self._intern(status, self._status_names, self._status_index, "status")
+
+    def _intern(self, value: Optional[str], names: List[str], index: Dict[str, int], kind: str) -> int:
+        if value is None:
+            return NO_VALUE
+        code = index.get(value)
+        if code is None:
+            code = len(names)
+            names.append(value)
+            index[value] = code
+            if self.directory:
+                with open(self._path("dictionary.jsonl"), "a") as f:
+                    f.write(json.dumps([kind, value]) + "\n")
+        return code
+
+    # Reading
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def events(self, start: Optional[float] = None, end: Optional[float] = None, job_id: Optional[str] = None,
+               limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            if job_id is not None:
+                rows = self._rows_by_job.get(self._job_index.get(job_id, NO_VALUE), array("I"))
+                rows = [row for row in rows if self._in_range(self.timestamps[row], start, end)]
+            else:
+                rows = range(*self._row_range(start, end))
+            if limit is not None:
+                rows = rows[-limit:] if limit > 0 else []
+            return [self._event(row) for row in rows]
+
+    def last_timestamp(self, job_id: str) -> Optional[float]:
+        rows = self._rows_by_job.get(self._job_index.get(job_id, NO_VALUE))
+        return self.timestamps[rows[-1]] if rows else None
+
+    def last_timestamp_for_action(self, action: str) -> Optional[float]:
+        with self._lock:
+            return self._last_action_timestamps.get(ACTION_CODES[action])
+
+    def count(self, start: Optional[float] = None, end: Optional[float] = None) -> int:
+        first, last = self._row_range(start, end)
+        return last - first
+
+    def events_per_day(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        # Maintained incrementally on append; a range only filters the day keys
+        first_day = datetime.fromtimestamp(start).strftime("%Y-%m-%d") if start is not None else ""
+        last_day = datetime.fromtimestamp(end).strftime("%Y-%m-%d") if end is not None else "9999"
+        with self._lock:
+            return {day: dict(counts) for day, counts in sorted(self._daily_counts.items()) if first_day <= day <= last_day}
+
+    def status_transitions(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, int]:
+        transitions: Dict[str, int] = {}
+        with self._lock:
+            for row in range(*self._row_range(start, end)):
+                to_status = self.to_statuses[row]
+                if to_status == NO_VALUE:
+                    continue
+                from_status = self.from_statuses[row]
+                key = f"{self._status_names[from_status] if from_status != NO_VALUE else 'None'} -> {self._status_names[to_status]}"
+                transitions[key] = transitions.get(key, 0) + 1
+        return transitions
+
+    def get_rollups(self, days: int = 30) -> Dict[str, Any]:
+        # Fixed-size digest for prompts; it does not grow with the number of stored events
+        since = time.time() - days * 24 * 60 * 60
+        per_day = self.events_per_day(start=since)
+        return {
+            "total_events": len(self),
+            f"events_last_{days}_days": self.count(start=since),
+            "events_per_day": per_day,
+            "status_transitions": self.status_transitions(start=since),
+            "last_resume_update": self.last_timestamp_for_action("resume_update"),
+        }
+
+    def _row_range(self, start: Optional[float], end: Optional[float]) -> Tuple[int, int]:
+        first = bisect_left(self.timestamps, start) if start is not None else 0
+        last = bisect_right(self.timestamps, end) if end is not None else len(self.timestamps)
+        return first, max(first, last)
+
+    def _in_range(self, timestamp: float, start: Optional[float], end: Optional[float]) -> bool:
+        return (start is None or timestamp >= start) and (end is None or timestamp <= end)
+
+    def _event(self, row: int) -> Dict[str, Any]:
+        event = {"timestamp": self.timestamps[row], "action": ACTIONS[self.actions[row]]}
+        if self.job_codes[row] != NO_VALUE:
+            event["job_id"] = self._job_names[self.job_codes[row]]
+        if self.from_statuses[row] != NO_VALUE:
+            event["from_status"] = self._status_names[self.from_statuses[row]]
+        if self.to_statuses[row] != NO_VALUE:
+            event["to_status"] = self._status_names[self.to_statuses[row]]
+        return event
+
+    # Persistence, retention and compaction
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _seal(self) -> None:
+        # Move the active tail into an immutable columnar segment; segments.json is the commit point
+        rows = (self._sealed_rows, len(self.timestamps))
+        self._segments.append(self._write_segment(*rows))
+        self._sealed_rows = rows[1]
+        self._sealed_seq = self._next_seq
+        self._write_manifest()
+        open(self._path("active.bin"), "wb").close()
+
+    def _write_segment(self, first: int, last: int) -> Dict[str, Any]:
+        name = f"segment-{self._segment_counter:06d}.bin"
+        self._segment_counter += 1
+        with open(self._path(name), "wb") as f:
+            for column, _ in COLUMNS:
+                getattr(self, column)[first:last].tofile(f)
+        return {"file": name, "count": last - first, "first": self.timestamps[first], "last": self.timestamps[last - 1]}
+
+    def _write_manifest(self) -> None:
+        manifest = {"segments": self._segments, "segment_counter": self._segment_counter, "sealed_seq": self._sealed_seq}
+        tmp_path = self._path("segments.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path("segments.json"))
+
+    def _load(self) -> None:
+        dictionary_path = self._path("dictionary.jsonl")
+        if os.path.exists(dictionary_path):
+            with open(dictionary_path, "r") as f:
+                for line in f:
+                    kind, value = json.loads(line)
+                    names, index = (self._job_names, self._job_index) if kind == "job" else (self._status_names, self._status_index)
+                    if value not in index:
+                        index[value] = len(names)
+                        names.append(value)
+
+        manifest_path = self._path("segments.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            self._segment_counter = manifest["segment_counter"]
+            self._sealed_seq = self._next_seq = manifest["sealed_seq"]
+            for segment in manifest["segments"]:
+                columns = []
+                with open(self._path(segment["file"]), "rb") as f:
+                    for _, typecode in COLUMNS:
+                        column = array(typecode)
+                        column.fromfile(f, segment["count"])
+                        columns.append(column)
+                for row in zip(*columns):
+                    self._append_row(row)
+                self._segments.append(segment)
+            self._sealed_rows = len(self.timestamps)
+
+        active_path = self._path("active.bin")
+        if os.path.exists(active_path):
+            with open(active_path, "rb") as f:
+                data = f.read()
+            # A torn final record from a crash is ignored; records already sealed are skipped by sequence number
+            for offset in range(0, len(data) - ACTIVE_RECORD.size + 1, ACTIVE_RECORD.size):
+                seq, *row = ACTIVE_RECORD.unpack_from(data, offset)
+                if seq >= self._sealed_seq:
+                    self._append_row(tuple(row))
+                    self._next_seq = seq + 1
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        # Drops events older than the retention window and rewrites the log into full-size segments
+        if self.retention_days is None:
+            return 0
+        cutoff = (time.time() if now is None else now) - self.retention_days * 24 * 60 * 60
+        with self._lock:
+            expired = bisect_left(self.timestamps, cutoff)
+            if expired:
+                self.compact(drop_before=expired)
+            return expired
+
+    def compact(self, drop_before: int = 0) -> None:
+        # The name dictionary is append-only and never rewritten, so codes in old and new segments always agree
+        with self._lock:
+            kept = [getattr(self, column)[drop_before:] for column, _ in COLUMNS]
+            old_files = [segment["file"] for segment in self._segments]
+
+            for column, typecode in COLUMNS:
+                setattr(self, column, array(typecode))
+            self._rows_by_job = {}
+            self._daily_counts = {}
+            self._last_action_timestamps = {}
+            self._segments = []
+            for row in zip(*kept):
+                self._append_row(row)
+            if not self.directory:
+                return
+
+            for first in range(0, len(self.timestamps), self.segment_size):
+                self._segments.append(self._write_segment(first, min(first + self.segment_size, len(self.timestamps))))
+            self._sealed_rows = len(self.timestamps)
+            self._sealed_seq = self._next_seq
+            self._write_manifest()
+            open(self._path("active.bin"), "wb").close()
+            for name in old_files:
+                if os.path.exists(self._path(name)):
+                    os.remove(self._path(name))
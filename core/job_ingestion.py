@@ -0,0 +1,349 @@
+# core/job_ingestion.py
+#
+# Batch import of job postings from a CSV file, a JSONL file or a directory of
+# posting files. Postings are normalized, de-duplicated, added as applications
+# and analyzed on a bounded, rate-limited worker pool; progress is checkpointed
+# so an interrupted run picks up where it stopped.
+#
+# Reposts of the same role are caught by MinHash/LSH and linked to the canonical
+# posting (or merged into it), so they never get analyses of their own.
+#
+# Run from the repository root:  python -m core.job_ingestion postings.csv
+
+import argparse
+import csv
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from config import (INGESTION_CHECKPOINT_DIR, JOB_INGESTION_CONCURRENCY, JOB_INGESTION_REQUESTS_PER_MINUTE,
+                    JOB_INGESTION_CHECKPOINT_EVERY,
+                    DEDUP_JACCARD_THRESHOLD, DEDUP_MODE)
+from core.context_manager import CAPTAINContextManager
+from core.dedup import NearDuplicateIndex
+from core.llm_transport import RateLimiter
+from utils.markdown_helper import content_hash
+
+# Column / key names accepted for each application field, first match wins
+FIELD_ALIASES = {
+    "company": ("company", "company_name", "employer", "organization"),
+    "position": ("position", "title", "job_title", "role"),
+    "description": ("description", "job_description", "body", "text", "content"),
+    "url": ("url", "link", "job_url"),
+    "location": ("location", "city"),
+}
+POSTING_FILE_EXTENSIONS = (".txt", ".md", ".html", ".htm")
+
+_HTML_TAG = re.compile(r"<[^>]+>")
+_BLOCK_TAG = re.compile(r"<\s*(br|/p|/div|/li|/h[1-6])\s*/?>", re.I)
+
+
+def iter_postings(source: str) -> Iterator[Dict[str, Any]]:
+    # Lazily yields raw postings so large files are never loaded whole
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                extension = os.path.splitext(name)[1].lower()
+                if extension in (".csv", ".jsonl", ".ndjson", ".json"):
+                    yield from iter_postings(path)
+                elif extension in POSTING_FILE_EXTENSIONS:
+                    with open(path, "r", encoding="utf-8", errors="replace") as f:
+                        yield {"description": f.read(), "position": os.path.splitext(name)[0], "source": path}
+        return
+
+    extension = os.path.splitext(source)[1].lower()
+    if extension == ".csv":
+        with open(source, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+    elif extension in (".jsonl", ".ndjson"):
+        with open(source, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Counted as an invalid posting instead of aborting the run
+                        yield {}
+    elif extension == ".json":
+        with open(source, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        yield from (data if isinstance(data, list) else data.values())
+    else:
+        raise ValueError(f"Unsupported posting source: {source}")
+
+
+def clean_text(text: str) -> str:
+    text = html.unescape(_HTML_TAG.sub(" ", _BLOCK_TAG.sub("\n", text)))
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def normalize_posting(raw: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    lowered = {str(key).strip().lower(): value for key, value in raw.items() if value not in (None, "")}
+    posting = {}
+    for field, aliases in FIELD_ALIASES.items():
+        value = next((lowered[alias] for alias in aliases if alias in lowered), None)
+        if value is not None:
+            posting[field] = clean_text(str(value)) if field == "description" else " ".join(str(value).split())
+    if not posting.get("description"):
+        return None
+    posting.setdefault("company", "Unknown company")
+    posting.setdefault("position", "Unknown position")
+    posting["status"] = "Not Started"
+    return posting
+
+
+def posting_job_id(posting: Dict[str, Any]) -> str:
+    # Derived from the content, so re-importing the same posting maps to the same application
+    key = "\n".join((posting["company"].lower(), posting["position"].lower(), posting["description"]))
+    return content_hash(key)[:12]
+
+
+class IngestionCheckpoint:
+    """Per-source progress file: how many postings were consumed and which added jobs still need analysis."""
+
+    def __init__(self, source: str, directory: str = INGESTION_CHECKPOINT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.source = os.path.abspath(source)
+        self.path = os.path.join(directory, f"{content_hash(self.source)[:12]}.json")
+        self.position = 0
+        self.pending: Dict[str, str] = {}
+        self.counts: Dict[str, int] = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.position = data["position"]
+            self.pending = data["pending"]
+            self.counts = data.get("counts", {})
+
+    def save(self, counts: Dict[str, int]) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"source": self.source, "position": self.position, "pending": self.pending,
+                       "counts": counts, "saved_at": time.time()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.position, self.pending, self.counts = 0, {}, {}
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class JobIngestionPipeline:
+    """Streams postings through normalize, dedup, add and analysis stages with bounded parallelism."""
+
+    def __init__(self, context_manager: CAPTAINContextManager, job_ai=None,
+                 concurrency: int = JOB_INGESTION_CONCURRENCY,
+                 requests_per_minute: float = JOB_INGESTION_REQUESTS_PER_MINUTE,
+                 checkpoint_every: int = JOB_INGESTION_CHECKPOINT_EVERY,
+                 dedup_threshold: float = DEDUP_JACCARD_THRESHOLD, dedup_mode: str = DEDUP_MODE,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if dedup_mode not in ("link", "merge"):
+            raise ValueError(f"Unknown dedup mode '{dedup_mode}', expected 'link' or 'merge'")
+        self.context_manager = context_manager
+        self.job_ai = job_ai
+        self.concurrency = concurrency
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.checkpoint_every = checkpoint_every
+        self.dedup_threshold = dedup_threshold
+        self.dedup_mode = dedup_mode
+        self.dedup_index: Optional[NearDuplicateIndex] = None
+        # Canonical job_id -> linked duplicates still waiting for the canonical analysis
+        self._linked: Dict[str, List[str]] = {}
+        self.progress_callback = progress_callback or self._print_progress
+
+    def run(self, source: str, analyze: bool = True, restart: bool = False) -> Dict[str, Any]:
+        checkpoint = IngestionCheckpoint(source)
+        if restart:
+            checkpoint.clear()
+        analyze = analyze and self.job_ai is not None
+        report = {"read": 0, "invalid": 0, "duplicates": 0, "near_duplicates": 0, "added": 0, "analyzed": 0, "failed": 0,
+                  **checkpoint.counts, "errors": {}}
+        # Earlier failures are retried below, so only this run's failures are counted
+        report["failed"] = 0
+        started = time.monotonic()
+        seen = set()
+        in_flight: Dict[Future, str] = {}
+        failed: Dict[str, str] = {}
+        if self.dedup_index is None:
+            self.dedup_index = self._build_dedup_index()
+        self._restore_links()
+
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="job-ingestion")
+        try:
+            # Jobs added by an interrupted run that never finished analysis go first
+            if analyze:
+                for job_id, description in checkpoint.pending.items():
+                    in_flight[executor.submit(self._analyze, job_id, description)] = job_id
+
+            for index, raw in enumerate(iter_postings(source)):
+                if index < checkpoint.position:
+                    continue
+                report["read"] += 1
+                posting = normalize_posting(raw)
+                if posting is None:
+                    report["invalid"] += 1
+                else:
+                    job_id = posting_job_id(posting)
+                    if job_id in seen or job_id in self.context_manager.job_applications:
+                        report["duplicates"] += 1
+                    else:
+                        seen.add(job_id)
+                        match = self.dedup_index.add_or_match(job_id, posting["description"])
+                        if match is not None:
+                            report["near_duplicates"] += 1
+                            self._handle_near_duplicate(job_id, posting, *match, report)
+                        else:
+                            self.context_manager.add_job_application(job_id, posting)
+                            report["added"] += 1
+                            if analyze:
+                                checkpoint.pending[job_id] = posting["description"]
+                                in_flight[executor.submit(self._analyze, job_id, posting["description"])] = job_id
+                checkpoint.position = index + 1
+
+                # Bounded queue: reading stops while the workers are saturated
+                while len(in_flight) >= 2 * self.concurrency:
+                    self._collect(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, checkpoint, report, failed)
+                if checkpoint.position % self.checkpoint_every == 0:
+                    checkpoint.save(self._counts(report))
+                    self.progress_callback(self._progress(report, started, len(in_flight)))
+
+            while in_flight:
+                self._collect(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, checkpoint, report, failed)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            # Failed analyses stay pending so the next run over the same source retries only those
+            checkpoint.pending.update(failed)
+            if checkpoint.pending:
+                checkpoint.save(self._counts(report))
+            else:
+                checkpoint.clear()
+
+        report["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        self.progress_callback(self._progress(report, started, 0))
+        return report
+
+    def _build_dedup_index(self) -> NearDuplicateIndex:
+        # Canonical postings already in the tracker are indexed so new reposts of them are caught too
+        index = NearDuplicateIndex(self.dedup_threshold)
+        for job_id, application in self.context_manager.job_applications.items():
+            if application.get("description") and not application.get("duplicate_of"):
+                index.add(job_id, application["description"])
+        return index
+
+    def _restore_links(self) -> None:
+        # Links only live in memory, so an interrupted run loses them; they are rebuilt from the stored
+        # duplicate_of fields, and duplicates whose canonical posting was analyzed meanwhile get the analysis now
+        applications = self.context_manager.job_applications
+        linked = {duplicate_id for duplicates in self._linked.values() for duplicate_id in duplicates}
+        for job_id, application in list(applications.items()):
+            canonical_id = application.get("duplicate_of")
+            if not canonical_id or "analysis" in application or job_id in linked:
+                continue
+            canonical = applications.get(canonical_id)
+            if canonical is None:
+                continue
+            if "analysis" in canonical:
+                self.context_manager.update_job_application(job_id, {"analysis": canonical["analysis"]})
+            else:
+                self._linked.setdefault(canonical_id, []).append(job_id)
+
+    def _handle_near_duplicate(self, job_id: str, posting: Dict[str, Any], canonical_id: str, similarity: float,
+                               report: Dict[str, Any]) -> None:
+        canonical = self.context_manager.get_job_application(canonical_id)
+        if self.dedup_mode == "merge":
+            if any(repost["job_id"] == job_id for repost in canonical.get("reposts", [])):
+                return
+            reposts = canonical.get("reposts", []) + [{"job_id": job_id, "company": posting["company"],
+                                                       "position": posting["position"], "url": posting.get("url"),
+                                                       "similarity": round(similarity, 3)}]
+            self.context_manager.update_job_application(canonical_id, {"reposts": reposts})
+            return
+
+        posting["duplicate_of"] = canonical_id
+        posting["duplicate_similarity"] = round(similarity, 3)
+        if "analysis" in canonical:
+            posting["analysis"] = canonical["analysis"]
+        else:
+            self._linked.setdefault(canonical_id, []).append(job_id)
+        self.context_manager.add_job_application(job_id, posting)
+        report["added"] += 1
+
+    def _analyze(self, job_id: str, description: str) -> Dict[str, Any]:
+        # Transient failures are retried by the LLM transport within the call's deadline; retrying again here would
+        # multiply attempts under load, so a failure is final for this run and the job stays pending in the checkpoint
+        self.rate_limiter.acquire()
+        return self.job_ai.analyze_job_description(job_id, description, save=False)
+
+    def _collect(self, done, in_flight: Dict[Future, str], checkpoint: IngestionCheckpoint,
+                 report: Dict[str, Any], failed: Dict[str, str]) -> None:
+        # Results are applied on the calling thread so the context manager is only ever written from one place
+        for future in done:
+            job_id = in_flight.pop(future)
+            description = checkpoint.pending.pop(job_id, None)
+            try:
+                analysis = future.result()
+            except Exception as e:
+                report["failed"] += 1
+                failed[job_id] = description or ""
+                report["errors"][job_id] = str(e)
+                continue
+            self.context_manager.update_job_application(job_id, {"analysis": analysis})
+            for duplicate_id in self._linked.pop(job_id, []):
+                self.context_manager.update_job_application(duplicate_id, {"analysis": analysis})
+            report["analyzed"] += 1
+
+    def _counts(self, report: Dict[str, Any]) -> Dict[str, int]:
+        return {key: value for key, value in report.items() if isinstance(value, int)}
+
+    def _progress(self, report: Dict[str, Any], started: float, in_flight: int) -> Dict[str, Any]:
+        elapsed = time.monotonic() - started
+        return {**self._counts(report), "in_flight": in_flight, "elapsed_seconds": round(elapsed, 2),
+                "postings_per_second": round(report["read"] / elapsed, 2) if elapsed > 0 else 0.0}
+
+    def _print_progress(self, progress: Dict[str, Any]) -> None:
+        print(f"Read {progress['read']} postings: {progress['added']} added, {progress['duplicates']} duplicates, "
+              f"{progress['near_duplicates']} near-duplicates, "
+              f"{progress['invalid']} invalid, {progress['analyzed']} analyzed, {progress['failed']} failed, "
+              f"{progress['in_flight']} in flight ({progress['postings_per_second']}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import job postings from a CSV/JSONL file or a directory.")
+    parser.add_argument("source", help="CSV file, JSONL file or directory of postings")
+    parser.add_argument("--concurrency", type=int, default=JOB_INGESTION_CONCURRENCY, help="parallel analysis calls")
+    parser.add_argument("--rpm", type=float, default=JOB_INGESTION_REQUESTS_PER_MINUTE, help="analysis calls per minute")
+    parser.add_argument("--no-analyze", action="store_true", help="only add the postings, skip LLM analysis")
+    parser.add_argument("--restart", action="store_true", help="ignore any checkpoint and start from the beginning")
+    parser.add_argument("--dedup-threshold", type=float, default=DEDUP_JACCARD_THRESHOLD,
+                        help="estimated Jaccard similarity above which postings are near-duplicates")
+    parser.add_argument("--merge-duplicates", action="store_true",
+                        help="record near-duplicates on the canonical posting instead of adding them")
+    args = parser.parse_args()
+
+    from core.ai_manager import AIManager
+    from core.data_manager import DataManager
+    from ai.job_opportunity_ai import JobOpportunityAI
+
+    context_manager = CAPTAINContextManager()
+    data_manager = DataManager(context_manager)
+    data_manager.load_state()
+    job_ai = None if args.no_analyze else JobOpportunityAI(AIManager(), context_manager)
+
+    pipeline = JobIngestionPipeline(context_manager, job_ai, concurrency=args.concurrency,
+                                    requests_per_minute=args.rpm,
+                                    dedup_threshold=args.dedup_threshold,
+                                    dedup_mode="merge" if args.merge_duplicates else DEDUP_MODE)
+    report = pipeline.run(args.source, analyze=not args.no_analyze, restart=args.restart)
+    data_manager.save_state()
+    for job_id, error in report["errors"].items():
+        print(f"{job_id}: {error}")
+
+
+if __name__ == "__main__":
+    main()
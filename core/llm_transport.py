@@ -0,0 +1,346 @@
+# core/llm_transport.py
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+from langchain.chat_models import ChatOpenAI
+from config import (OPENAI_API_KEY, LLM_API_BASE, LLM_MODEL, LLM_TEMPERATURE, LLM_RATE_LIMITS, LLM_DEFAULT_RATE_LIMITS,
+                    LLM_CALL_TIMEOUT_SECONDS, LLM_REQUEST_TIMEOUT_SECONDS, LLM_MAX_RETRIES, LLM_BACKOFF_SECONDS,
+                    LLM_MAX_BACKOFF_SECONDS, LLM_CIRCUIT_FAILURE_THRESHOLD, LLM_CIRCUIT_RESET_SECONDS,
+                    LLM_MAX_CONNECTIONS)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import openai
+except ImportError:
+    openai = None
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMTransportError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(LLMTransportError):
+    pass
+
+
+class DeadlineExceeded(LLMTransportError):
+    pass
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    return getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    if openai is not None and isinstance(error, getattr(openai, "APIConnectionError", ())):
+        return True
+    return status_code(error) in RETRYABLE_STATUS_CODES
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    # Server-suggested delay from a 429/503 response, in seconds
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+class RateLimiter:
+    """Token buckets for requests and (optionally) tokens per minute, shared by every caller.
+
+    Each bucket holds burst_seconds worth of budget, a full minute by default, so an idle limiter admits a burst
+    up to the per-minute limit before it starts spacing callers out. Callers reserve capacity up front and sleep
+    for their own wait outside the lock, so waiters are served in arrival order without polling. pause() holds everyone back after a 429 instead of letting each retry on its own.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: Optional[float] = None, burst_seconds: float = 60.0):
+        self._buckets = []
+        for per_minute in (requests_per_minute, tokens_per_minute):
+            if per_minute and per_minute > 0:
+                rate = per_minute / 60.0
+                capacity = max(1.0, rate * burst_seconds)
+                self._buckets.append({"rate": rate, "capacity": capacity, "level": capacity})
+            else:
+                self._buckets.append(None)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int = 0, deadline: Optional[float] = None) -> float:
+        # Returns how long the caller must wait before starting; nothing is reserved if that would miss the deadline
+        amounts = (1, tokens)
+        with self._lock:
+            now = time.monotonic()
+            elapsed, self._updated = now - self._updated, now
+            wait = max(0.0, self._paused_until - now)
+            for bucket, amount in zip(self._buckets, amounts):
+                if bucket is None:
+                    continue
+                bucket["level"] = min(bucket["capacity"], bucket["level"] + elapsed * bucket["rate"])
+                wait = max(wait, (amount - bucket["level"]) / bucket["rate"])
+            if deadline is not None and now + wait > deadline:
+                raise DeadlineExceeded(f"Rate limit wait of {wait:.1f}s would pass the call deadline")
+            for bucket, amount in zip(self._buckets, amounts):
+                if bucket is not None:
+                    bucket["level"] -= amount
+        return wait
+
+    def acquire(self, tokens: int = 0, deadline: Optional[float] = None) -> None:
+        wait = self.reserve(tokens, deadline)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Fails fast after repeated transient failures, then lets a single probe through once reset_seconds pass."""
+
+    def __init__(self, failure_threshold: int = LLM_CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = LLM_CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> None:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.reset_seconds:
+                    raise CircuitOpenError("LLM backend is failing; calls are suspended")
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probing:
+                    raise CircuitOpenError("LLM backend is being probed; calls are suspended")
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state, self._failures, self._probing = "closed", 0, False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or self._failures >= self.failure_threshold:
+                self.state, self._opened_at = "open", time.monotonic()
+            self._probing = False
+
+    def release(self) -> None:
+        # An attempt that ended without telling us anything about backend health (e.g. a 400)
+        with self._lock:
+            if self.state == "half_open":
+                self._probing = False
+
+
+class LLMTransport:
+    """Shared path for every LLM call: one pooled client per model, rate limits, retries, deadlines, circuit breaker."""
+
+    def __init__(self, model: str = LLM_MODEL, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, base_url: Optional[str] = LLM_API_BASE,
+                 timeout: float = LLM_CALL_TIMEOUT_SECONDS, request_timeout: float = LLM_REQUEST_TIMEOUT_SECONDS,
+                 max_retries: int = LLM_MAX_RETRIES, backoff_seconds: float = LLM_BACKOFF_SECONDS,
+                 max_backoff_seconds: float = LLM_MAX_BACKOFF_SECONDS, max_connections: int = LLM_MAX_CONNECTIONS,
+                 breaker: Optional[CircuitBreaker] = None):
+        limits = {**LLM_DEFAULT_RATE_LIMITS, **LLM_RATE_LIMITS.get(model, {})}
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.max_connections = max_connections
+        self.rate_limiter = RateLimiter(requests_per_minute or limits["requests_per_minute"],
+                                        tokens_per_minute or limits["tokens_per_minute"])
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.stats = {"calls": 0, "retries": 0, "failures": 0, "rate_limited": 0, "circuit_rejections": 0}
+        self._llm = None
+        self._lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    @property
+    def llm(self):
+        # Built once; langchain chat models and the HTTP pools under them are safe to share between threads
+        with self._lock:
+            if self._llm is None:
+                self._llm = self.create_llm()
+            return self._llm
+
+    def create_llm(self, temperature: float = LLM_TEMPERATURE) -> ChatOpenAI:
+        # Retries and timeouts are handled here, so the client must not retry on its own
+        kwargs: Dict[str, Any] = {"model_name": self.model, "temperature": temperature, "api_key": OPENAI_API_KEY,
+                                  "max_retries": 0, "request_timeout": self.request_timeout}
+        if self.base_url:
+            kwargs["base_url"] = self.base_url
+        if httpx is not None and openai is not None and hasattr(openai, "OpenAI"):
+            limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            client_kwargs = {"api_key": OPENAI_API_KEY, "base_url": self.base_url, "max_retries": 0,
+                             "timeout": self.request_timeout}
+            kwargs["client"] = openai.OpenAI(http_client=httpx.Client(limits=limits), **client_kwargs).chat.completions
+            kwargs["async_client"] = openai.AsyncOpenAI(http_client=httpx.AsyncClient(limits=limits),
+                                                        **client_kwargs).chat.completions
+        return ChatOpenAI(**kwargs)
+
+    def call(self, request: Callable[[], Any], tokens: int = 0, timeout: Optional[float] = None) -> Any:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            self._before_attempt(tokens, deadline)
+            settled = False
+            try:
+                try:
+                    result = request()
+                except Exception as e:
+                    settled = True
+                    delay = self._after_failure(e, attempt, deadline)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return result
+            finally:
+                # Anything that ends the attempt unrecorded (KeyboardInterrupt, ...) must free a half-open probe
+                if not settled:
+                    self.breaker.release()
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, request: Callable[[], Awaitable[Any]], tokens: int = 0, timeout: Optional[float] = None) -> Any:
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            wait = self._before_attempt(tokens, deadline, block=False)
+            settled = False
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                try:
+                    # Unlike the sync path, an async attempt can be cut off exactly at the deadline
+                    result = await asyncio.wait_for(request(), max(deadline - time.monotonic(), 0.001))
+                except Exception as e:
+                    settled = True
+                    delay = self._after_failure(e, attempt, deadline)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return result
+            finally:
+                # A cancelled task (CancelledError is not an Exception) must not leave the breaker half-open forever
+                if not settled:
+                    self.breaker.release()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stream(self, request: Callable[[], Iterator[Any]], tokens: int = 0, timeout: Optional[float] = None) -> Iterator[Any]:
+        # Retried only until the first chunk arrives; after that a failure would duplicate output
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            self._before_attempt(tokens, deadline)
+            started = False
+            settled = False
+            try:
+                try:
+                    for chunk in request():
+                        started = True
+                        yield chunk
+                except Exception as e:
+                    settled = True
+                    if started:
+                        self._record_failure(e)
+                        raise
+                    delay = self._after_failure(e, attempt, deadline)
+                else:
+                    settled = True
+                    self.breaker.record_success()
+                    return
+            finally:
+                # The consumer closing the generator early (GeneratorExit) says nothing about backend health
+                if not settled:
+                    self.breaker.release()
+            time.sleep(delay)
+            attempt += 1
+
+    def _before_attempt(self, tokens: int, deadline: float, block: bool = True) -> float:
+        try:
+            self.breaker.allow()
+        except CircuitOpenError:
+            self._count("circuit_rejections")
+            raise
+        self._count("calls")
+        try:
+            wait = self.rate_limiter.reserve(tokens, deadline)
+        except DeadlineExceeded:
+            self.breaker.release()
+            raise
+        if block and wait > 0:
+            time.sleep(wait)
+            return 0.0
+        return wait
+
+    def _after_failure(self, error: Exception, attempt: int, deadline: float) -> float:
+        # Returns the delay before the next attempt, or re-raises when the error is final
+        if not self._record_failure(error) or attempt >= self.max_retries:
+            raise error
+        delay = retry_after(error)
+        if status_code(error) == 429:
+            self._count("rate_limited")
+            # Everyone backs off together; otherwise each worker's retry lands in the same throttled window
+            self.rate_limiter.pause(delay if delay is not None else self.backoff_seconds)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff_seconds, self.backoff_seconds * 2 ** attempt))
+        if time.monotonic() + delay > deadline:
+            raise DeadlineExceeded(f"LLM call did not succeed before its deadline: {str(error)}") from error
+        self._count("retries")
+        logger.warning("LLM call failed (%s), retrying in %.1fs", error, delay)
+        return delay
+
+    def _record_failure(self, error: Exception) -> bool:
+        if is_retryable(error):
+            self._count("failures")
+            self.breaker.record_failure()
+            return True
+        self.breaker.release()
+        return False
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {**self.stats, "circuit": self.breaker.state}
+
+
+_transports: Dict[str, LLMTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(model: str = LLM_MODEL) -> LLMTransport:
+    # One transport per model per process, so rate limits and the connection pool are shared by every AIManager
+    with _transports_lock:
+        if model not in _transports:
+            _transports[model] = LLMTransport(model)
+        return _transports[model]
@@ -0,0 +1,118 @@
+# core/prompt_registry.py
+
+import string
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from langchain.prompts import PromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+import prompts
+
+
+def parse_input_variables(template: str) -> List[str]:
+    # Raises ValueError on unbalanced braces, which is what we want at registration time
+    variables = []
+    for _, field_name, _, _ in string.Formatter().parse(template):
+        if field_name is None:
+            continue
+        name = field_name.split('.', 1)[0].split('[', 1)[0]
+        if not name or name.isdigit():
+            raise ValueError(f"Positional placeholder '{{{field_name}}}' is not supported")
+        if name not in variables:
+            variables.append(name)
+    return variables
+
+
+class PromptRegistry:
+    """Validated prompt templates plus compiled, reusable runnables for each (prompt, llm) pair."""
+
+    def __init__(self, templates: Optional[Dict[str, str]] = None, schemas: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._chains: Dict[Tuple[str, int, bool], Any] = {}
+        self._lock = threading.RLock()
+        if templates:
+            self.register_many(templates.items())
+        for name, schema in (schemas or {}).items():
+            self.register_schema(name, schema)
+
+    def register(self, name: str, template: str, input_variables: Optional[List[str]] = None) -> PromptTemplate:
+        try:
+            parsed_variables = parse_input_variables(template)
+        except ValueError as e:
+            raise ValueError(f"Invalid prompt template '{name}': {e}") from e
+        if input_variables is not None and set(input_variables) != set(parsed_variables):
+            raise ValueError(f"Prompt template '{name}' declares {sorted(input_variables)} "
+                             f"but uses {sorted(parsed_variables)}")
+
+        prompt_template = PromptTemplate(template=template, input_variables=parsed_variables)
+        with self._lock:
+            self._templates[name] = prompt_template
+            # Any chain compiled from a previous version of this prompt is stale now
+            for key in [key for key in self._chains if key[0] == name]:
+                del self._chains[key]
+        return prompt_template
+
+    def register_schema(self, name: str, schema: Dict[str, Any]) -> None:
+        self.get_template(name)
+        self._schemas[name] = schema
+
+    def get_schema(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._schemas.get(name)
+
+    def register_many(self, templates: Iterable[Tuple[str, str]]) -> None:
+        for name, template in templates:
+            self.register(name, template)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def names(self) -> List[str]:
+        return list(self._templates)
+
+    def get_template(self, name: str) -> PromptTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise ValueError(f"Prompt template '{name}' not found") from None
+
+    def get_templates(self) -> Dict[str, PromptTemplate]:
+        return dict(self._templates)
+
+    def get_input_variables(self, name: str) -> List[str]:
+        return self.get_template(name).input_variables
+
+    def validate_context(self, name: str, context: Dict[str, Any]) -> None:
+        missing = [var for var in self.get_input_variables(name) if var not in context]
+        if missing:
+            raise ValueError(f"Missing input variables for prompt '{name}': {missing}")
+
+    def format(self, name: str, context: Dict[str, Any]) -> str:
+        self.validate_context(name, context)
+        return self.get_template(name).format(**context)
+
+    def get_chain(self, name: str, llm: Any, json_mode: bool = False) -> Any:
+        key = (name, id(llm), json_mode)
+        chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is None:
+                model = llm.bind(response_format={"type": "json_object"}) if json_mode else llm
+                chain = self.get_template(name) | model | StrOutputParser()
+                self._chains[key] = chain
+        return chain
+
+
+_default_registry: Optional[PromptRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry() -> PromptRegistry:
+    # Loaded once per process and shared by every AIManager
+    global _default_registry
+    if _default_registry is None:
+        with _default_registry_lock:
+            if _default_registry is None:
+                _default_registry = PromptRegistry(prompts.PROMPT_TEMPLATES, prompts.OUTPUT_SCHEMAS)
+    return _default_registry
@@ -0,0 +1,159 @@
+# core/response_cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from config import LLM_CACHE_DIR, LLM_CACHE_MEMORY_ENTRIES, LLM_CACHE_DISK_ENTRIES, LLM_CACHE_TTL_SECONDS
+
+
+def make_cache_key(template: str, model: str, temperature: float, context: Dict[str, Any]) -> str:
+    # The context is hashed separately so large resumes do not bloat the key material
+    context_hash = hashlib.sha256(json.dumps(context, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    key_material = json.dumps([template, model, temperature, context_hash])
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU over disk) cache of LLM responses keyed by content hash."""
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, max_memory_entries: int = LLM_CACHE_MEMORY_ENTRIES,
+                 max_disk_entries: int = LLM_CACHE_DISK_ENTRIES, ttl_seconds: float = LLM_CACHE_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._disk_entries = len(self._disk_files())
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if self._is_fresh(entry[0]):
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["disk_hits"] += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def set(self, key: str, response: str) -> None:
+        entry = (time.time(), response)
+        with self._lock:
+            self._remember(key, entry)
+            self.stats["writes"] += 1
+        self._write_disk(key, entry)
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path_for(key))
+        except FileNotFoundError:
+            # Already gone, e.g. expired and removed by a concurrent get() or invalidate()
+            return
+        with self._lock:
+            self._disk_entries -= 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        for path in self._disk_files():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        with self._lock:
+            self._disk_entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory)
+            stats["disk_entries"] = self._disk_entries
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups > 0 else 0.0
+        return stats
+
+    def _is_fresh(self, created: float) -> bool:
+        return self.ttl_seconds <= 0 or time.time() - created < self.ttl_seconds
+
+    def _remember(self, key: str, entry: Tuple[float, str]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def _disk_files(self):
+        return [os.path.join(root, name) for root, _, files in os.walk(self.cache_dir)
+                for name in files if name.endswith(".json")]
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Tuple[float, str]]:
+        path = self._path_for(key)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self._is_fresh(data["created"]):
+            self.invalidate(key)
+            return None
+        return data["created"], data["response"]
+
+    def _write_disk(self, key: str, entry: Tuple[float, str]) -> None:
+        path = self._path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        is_new = not os.path.exists(path)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"created": entry[0], "response": entry[1]}, f)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if is_new:
+                self._disk_entries += 1
+            over_limit = self._disk_entries > self.max_disk_entries
+        if over_limit:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        # Drop expired entries first, then the oldest ones until we are 10% under the limit
+        entries = []
+        for path in self._disk_files():
+            try:
+                entries.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        entries.sort()
+        target = int(self.max_disk_entries * 0.9)
+        removed = 0
+        for mtime, path in entries:
+            if len(entries) - removed <= target and self._is_fresh(mtime):
+                break
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                continue
+        with self._lock:
+            self.stats["evictions"] += removed
+            # Recounted from the directory listing, which also corrects any drift from racing writers
+            self._disk_entries = len(entries) - removed
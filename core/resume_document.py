@@ -0,0 +1,158 @@
+# core/resume_document.py
+
+import re
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from core.resume_formatter import SECTION_ALIASES
+from utils.markdown_helper import content_hash, split_markdown_sections
+
+_NAME_HEADING = re.compile(r'^#(?!#)[ \t]+(.+?)[ \t#]*$', re.M)
+_ENTRY_HEADING = re.compile(r'^###[ \t]+(?P<title>.+?)(?:[ \t]+at[ \t]+(?P<company>.+?))?'
+                            r'(?:[ \t]*\((?P<dates>[^()]*)\))?[ \t]*$')
+_LIST_ITEM = re.compile(r'^[ \t]*[-*+][ \t]+(.+?)[ \t]*$', re.M)
+_SKILL_GROUP = re.compile(r'^([^:]{1,40}):[ \t]*(.+)$')
+
+# Every alias of a canonical section resolves to the same lookup key ("experience" -> "work experience")
+_ALIAS_KEYS = {alias: section.lower() for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+
+def section_key(title: str) -> str:
+    normalized = re.sub(r'\s+', ' ', title.strip().lower().replace('&', 'and'))
+    return _ALIAS_KEYS.get(normalized, normalized)
+
+
+class ResumeEntry:
+    """One "###" entry of a section: a job, a degree or a project."""
+
+    __slots__ = ("title", "company", "dates", "bullets", "hash")
+
+    def __init__(self, block: str):
+        heading, _, body = block.partition("\n")
+        match = _ENTRY_HEADING.match(heading)
+        self.title = match.group("title").strip() if match else heading.lstrip("# ").strip()
+        self.company = match.group("company") if match else None
+        self.dates = match.group("dates") if match else None
+        self.bullets = tuple(_LIST_ITEM.findall(body))
+        self.hash = content_hash(block.strip())
+
+
+class ResumeSection:
+    """A "##" section, hashed by content. Entries, bullets and skills are parsed on first use."""
+
+    __slots__ = ("title", "key", "block", "hash", "_entries")
+
+    def __init__(self, title: str, block: str):
+        self.title = title
+        self.key = section_key(title)
+        self.block = block
+        self.hash = content_hash(block.strip())
+        self._entries: Optional[Tuple[ResumeEntry, ...]] = None
+
+    @property
+    def body(self) -> str:
+        return self.block.partition("\n")[2].strip()
+
+    @property
+    def entries(self) -> Tuple[ResumeEntry, ...]:
+        if self._entries is None:
+            self._entries = tuple(ResumeEntry(block) for title, block in split_markdown_sections(self.block, level=3)
+                                  if title)
+        return self._entries
+
+    @property
+    def bullets(self) -> List[str]:
+        return _LIST_ITEM.findall(self.body)
+
+    @property
+    def skills(self) -> Dict[str, List[str]]:
+        # "- Technical Skills: Python, Go" lines; ungrouped items are filed under the section title
+        groups: Dict[str, List[str]] = {}
+        for item in self.bullets:
+            match = _SKILL_GROUP.match(item)
+            category, items = (match.group(1).strip("* "), match.group(2)) if match else (self.title, item)
+            groups.setdefault(category, []).extend(skill.strip(" .") for skill in items.split(",") if skill.strip(" ."))
+        return groups
+
+
+class ResumeDocument:
+    """Immutable parsed resume: the header (name and anything before the first "##") plus its sections.
+
+    Sections are looked up by title or alias in O(1) and carry content hashes, so two versions can be
+    compared section by section. Parsing against the previous version reuses its unchanged section
+    objects, and with them any entries already parsed. The text round-trips exactly.
+    """
+
+    __slots__ = ("name", "header", "sections", "hash", "_text")
+
+    def __init__(self, header: str = "", sections: Sequence[ResumeSection] = (), text: Optional[str] = None):
+        self.header = header
+        self.sections: "OrderedDict[str, ResumeSection]" = OrderedDict()
+        for section in sections:
+            # A repeated title is kept under a numbered key; lookups by title find the first one
+            key, number = section.key, 1
+            while key in self.sections:
+                number += 1
+                key = f"{section.key} ({number})"
+            self.sections[key] = section
+        name = _NAME_HEADING.search(header)
+        self.name = name.group(1).strip() if name else None
+        self._text = text if text is not None else header + "".join(section.block for section in sections)
+        self.hash = content_hash(self._text)
+
+    @classmethod
+    def parse(cls, text: str, previous: Optional["ResumeDocument"] = None) -> "ResumeDocument":
+        if previous is not None and previous._text == text:
+            return previous
+        reusable = {section.hash: section for section in previous.sections.values()} if previous is not None else {}
+        header, sections = "", []
+        for title, block in split_markdown_sections(text or ""):
+            if not title:
+                header = block
+                continue
+            section = reusable.get(content_hash(block.strip()))
+            if section is None or section.block != block or section.title != title:
+                section = ResumeSection(title, block)
+            sections.append(section)
+        return cls(header, sections, text or "")
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self.sections)
+
+    def __iter__(self) -> Iterator[ResumeSection]:
+        return iter(self.sections.values())
+
+    def __contains__(self, title: str) -> bool:
+        return section_key(title) in self.sections
+
+    def section(self, title: str) -> Optional[ResumeSection]:
+        return self.sections.get(section_key(title))
+
+    def titles(self) -> List[str]:
+        return [section.title for section in self.sections.values()]
+
+    def section_hashes(self) -> Dict[str, str]:
+        return {section.title: section.hash for section in self.sections.values()}
+
+    def changed_sections(self, previous: Optional["ResumeDocument"]) -> List[str]:
+        """Titles of sections added, edited or removed since previous; the header counts as "" when it changed."""
+        if previous is None:
+            return ([""] if self.header.strip() else []) + self.titles()
+        if previous.hash == self.hash:
+            return []
+        changed = [""] if previous.header.strip() != self.header.strip() else []
+        changed += [section.title for key, section in self.sections.items()
+                    if key not in previous.sections or previous.sections[key].hash != section.hash]
+        changed += [section.title for key, section in previous.sections.items() if key not in self.sections]
+        return changed
+
+    def render(self, titles: Sequence[str], include_header: bool = True) -> str:
+        # Only the requested sections, in document order; falls back to the whole resume if none exist
+        keys = {section_key(title) for title in titles}
+        blocks = [section.block for key, section in self.sections.items() if key in keys]
+        if not blocks:
+            return self._text
+        return ((self.header if include_header else "") + "".join(blocks)).strip()
@@ -0,0 +1,385 @@
+# core/resume_formatter.py
+#
+# Rule-based formatting of plain-text resumes into the Markdown layout the
+# format_resume prompt asks for:
+#
+#   # Name
+#   ## Contact Information / Professional Summary / Work Experience / Education / Skills
+#   ### Title at Company (Mon YYYY - Mon YYYY)
+#
+#   - bullet
+#
+# Sections the rules cannot structure with confidence are returned unresolved,
+# with their raw text, so only those need to go through the LLM.
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+CONTACT_SECTION = "Contact Information"
+SUMMARY_SECTION = "Professional Summary"
+EXPERIENCE_SECTION = "Work Experience"
+EDUCATION_SECTION = "Education"
+SKILLS_SECTION = "Skills"
+SECTION_ORDER = (CONTACT_SECTION, SUMMARY_SECTION, EXPERIENCE_SECTION, EDUCATION_SECTION, SKILLS_SECTION)
+
+SECTION_ALIASES = {
+    CONTACT_SECTION: ("contact", "contact information", "contact info", "contact details", "personal details"),
+    SUMMARY_SECTION: ("summary", "professional summary", "profile", "professional profile", "about", "about me",
+                      "objective", "career objective", "career summary", "overview"),
+    EXPERIENCE_SECTION: ("experience", "work experience", "professional experience", "employment",
+                         "employment history", "work history", "career history", "relevant experience"),
+    EDUCATION_SECTION: ("education", "academic background", "education and training", "academic qualifications",
+                        "qualifications"),
+    SKILLS_SECTION: ("skills", "technical skills", "core competencies", "competencies", "key skills",
+                     "skills and abilities", "areas of expertise", "expertise"),
+}
+_SECTION_BY_ALIAS = {alias: section for section, aliases in SECTION_ALIASES.items() for alias in aliases}
+
+TECHNICAL_SKILLS = "Technical Skills"
+SOFT_SKILLS = "Soft Skills"
+LANGUAGE_SKILLS = "Languages"
+SOFT_SKILL_WORDS = {"communication", "leadership", "teamwork", "collaboration", "mentoring", "problem solving",
+                    "problem-solving", "time management", "negotiation", "presentation", "public speaking",
+                    "adaptability", "creativity", "critical thinking", "organization", "stakeholder management",
+                    "conflict resolution", "coaching", "attention to detail", "customer service"}
+SPOKEN_LANGUAGES = {"english", "spanish", "french", "german", "italian", "portuguese", "dutch", "russian",
+                    "mandarin", "chinese", "cantonese", "japanese", "korean", "arabic", "hindi", "bengali",
+                    "urdu", "turkish", "polish", "swedish", "norwegian", "danish", "finnish", "greek", "hebrew",
+                    "vietnamese", "thai", "indonesian", "ukrainian", "czech", "romanian", "hungarian"}
+JOB_TITLE_WORDS = {"engineer", "developer", "manager", "analyst", "designer", "director", "lead", "intern",
+                   "consultant", "specialist", "scientist", "architect", "officer", "coordinator", "administrator",
+                   "associate", "assistant", "head", "vp", "president", "founder", "co-founder", "owner",
+                   "teacher", "nurse", "accountant", "programmer", "researcher", "technician", "representative",
+                   "supervisor", "executive", "strategist", "writer", "editor", "advisor", "partner", "principal",
+                   "cto", "ceo", "cfo", "coo", "sre", "devops", "product", "staff", "fellow"}
+
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_DATE_TOKEN = (r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?,?\s+\d{4}"
+               r"|\d{1,2}/\d{4}|(?:19|20)\d{2})")
+_DATE_RANGE = re.compile(rf"\(?\s*({_DATE_TOKEN})\s*(?:-|–|—|to|until)\s*({_DATE_TOKEN}|present|current|now|today)\s*\)?",
+                         re.I)
+_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+_LINKEDIN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[^\s|,]+", re.I)
+_URL = re.compile(r"(?:https?://|www\.)[^\s|,]+|\b[\w-]+\.(?:com|io|dev|me|net|org)/[^\s|,]*", re.I)
+_LOCATION = re.compile(r"^[A-Z][A-Za-z .'-]+(?:,\s*[A-Z][A-Za-z .'-]+){1,2}$")
+_CONTACT_LABEL = re.compile(r"^(email|e-mail|phone|tel|mobile|cell|location|address|linkedin|website|portfolio|github)"
+                            r"\s*:\s*", re.I)
+_CONTACT_SEPARATOR = re.compile(r"\s*(?:\||•|·|;|\t)\s*")
+_NAME = re.compile(r"^[A-Z][A-Za-z.'-]*(?:\s+[A-Z][A-Za-z.'-]*){1,4}$")
+_BULLET = re.compile(r"^(?:[-*+•●▪◦]|\d{1,2}[.)])\s+")
+_HEADING_MARKS = re.compile(r"^#{1,6}\s*|^\*\*|\*\*$|:$")
+_ROLE_SEPARATORS = (" at ", " @ ", " | ", " — ", " – ", " - ", ", ")
+_METRIC = re.compile(r"(?<![\w*])(?:[$€£]\d[\d,.]*\s?(?:[kKmMbB]|million|billion)?|\d+(?:\.\d+)?%|\d+(?:\.\d+)?[xX])(?![\w*])")
+_DEGREE = re.compile(r"\b(?:Bachelor|Master|Doctor|Ph\.?\s?D|MBA|B\.?\s?Sc?|B\.?\s?A|M\.?\s?Sc?|M\.?\s?A|B\.?\s?Eng|"
+                     r"M\.?\s?Eng|B\.?\s?Tech|M\.?\s?Tech|Associate|Diploma|Certificate|BBA|LLB|LLM|MD|JD)(?![\w])")
+_INSTITUTION = re.compile(r"\b(?:University|College|Institute|School|Academy|Polytechnic|Universidad|Université|"
+                          r"Universität)\b")
+_EDUCATION_DETAIL = re.compile(r"^(?:relevant\s+)?(coursework|courses|honou?rs|awards|gpa|thesis|minor|activities)\b",
+                               re.I)
+
+
+class FormattedResume:
+    """Result of rule-based formatting: formatted section bodies plus the sections left for the LLM."""
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.sections: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.unresolved: Dict[str, str] = {}
+
+    @property
+    def complete(self) -> bool:
+        return self.name is not None and not self.unresolved
+
+    def add(self, title: str, body: Optional[str], raw: str = "") -> None:
+        # A None body marks the section as unresolved; it keeps its place in the output order
+        self.sections[title] = body
+        if body is None:
+            self.unresolved[title] = raw
+
+    def resolve(self, title: str, body: str) -> None:
+        self.sections[title] = body.strip()
+        self.unresolved.pop(title, None)
+
+    def to_markdown(self) -> str:
+        parts = [f"# {self.name}"] if self.name else []
+        for title, body in self.sections.items():
+            if body:
+                parts.append(f"## {title}\n\n{body}")
+        return "\n\n".join(parts) + "\n"
+
+
+def section_for_heading(line: str) -> Optional[str]:
+    """The section a heading line starts, canonical where known, or None if the line is not a heading."""
+    had_marks = line.startswith("#") or line.startswith("**")
+    title = _HEADING_MARKS.sub("", line.strip()).strip(" *:")
+    normalized = re.sub(r"\s+", " ", title.lower().replace("&", "and"))
+    if normalized in _SECTION_BY_ALIAS:
+        return _SECTION_BY_ALIAS[normalized]
+    words = title.split()
+    if not words or len(words) > 4 or any(char.isdigit() for char in title) or _BULLET.match(line):
+        return None
+    if (had_marks and not line.startswith("###")) or (title.isupper() and len(title) > 3):
+        return title.title() if title.isupper() else title
+    return None
+
+
+def normalize_date(token: str) -> str:
+    token = token.strip().rstrip(".,")
+    if token.lower() in ("present", "current", "now", "today"):
+        return "Present"
+    year = token[-4:]
+    if "/" in token:
+        month = int(token.split("/")[0])
+        return f"{_MONTHS[month - 1]} {year}" if 1 <= month <= 12 else year
+    if token[:1].isalpha():
+        return f"{token[:3].title()} {year}"
+    return token
+
+
+def format_date_range(match: "re.Match") -> str:
+    return f"{normalize_date(match.group(1))} - {normalize_date(match.group(2))}"
+
+
+def format_bullet(text: str) -> str:
+    text = _BULLET.sub("", text.strip()).rstrip(";").strip()
+    text = text[:1].upper() + text[1:]
+    return "- " + _METRIC.sub(lambda m: f"**{m.group(0)}**", text)
+
+
+def format_resume_text(text: str) -> FormattedResume:
+    """Formats a plain-text or loosely formatted Markdown resume with rules only."""
+    lines = [line.strip() for line in text.replace("\r\n", "\n").split("\n")]
+    lines = [line for line in lines if line and not re.fullmatch(r"[-_=*]{3,}", line)]
+    header, blocks = _split_sections(lines)
+
+    name, contact, headline = _parse_header(header)
+    result = FormattedResume(name)
+    if CONTACT_SECTION in blocks:
+        more_contact, leftover = _parse_contact_lines(blocks.pop(CONTACT_SECTION))
+        contact.update({key: value for key, value in more_contact.items() if key not in contact})
+        headline.extend(leftover)
+    if contact:
+        result.add(CONTACT_SECTION, "\n".join(f"- {key}: {value}" for key, value in contact.items()))
+    summary_lines = headline + blocks.pop(SUMMARY_SECTION, [])
+    if summary_lines:
+        result.add(SUMMARY_SECTION, " ".join(_BULLET.sub("", line) for line in summary_lines))
+
+    parsers = {EXPERIENCE_SECTION: _format_experience, EDUCATION_SECTION: _format_education,
+               SKILLS_SECTION: _format_skills}
+    ordered = [title for title in SECTION_ORDER if title in blocks] + [title for title in blocks if title not in SECTION_ORDER]
+    for title in ordered:
+        section_lines = blocks[title]
+        body = parsers.get(title, _format_generic)(section_lines)
+        result.add(title, body, "\n".join(section_lines))
+    return result
+
+
+def _split_sections(lines: List[str]) -> Tuple[List[str], "OrderedDict[str, List[str]]"]:
+    header: List[str] = []
+    blocks: "OrderedDict[str, List[str]]" = OrderedDict()
+    current = None
+    for index, line in enumerate(lines):
+        # The first line is the name even when it is an all-caps heading look-alike
+        title = section_for_heading(line) if index > 0 or line.startswith("##") else None
+        if title is not None:
+            current = blocks.setdefault(title, [])
+        elif current is None:
+            header.append(line)
+        else:
+            current.append(line)
+    return header, blocks
+
+
+def _parse_header(lines: List[str]) -> Tuple[Optional[str], "OrderedDict[str, str]", List[str]]:
+    name = None
+    if lines:
+        first = lines[0]
+        candidate = re.sub(r"^#\s*", "", first).strip("* ")
+        if first.startswith("# ") or (_NAME.match(candidate) and not _EMAIL.search(candidate)):
+            name = candidate.title() if candidate.isupper() else candidate
+            lines = lines[1:]
+    contact, leftover = _parse_contact_lines(lines)
+    return name, contact, leftover
+
+
+def _parse_contact_lines(lines: List[str]) -> Tuple["OrderedDict[str, str]", List[str]]:
+    contact: "OrderedDict[str, str]" = OrderedDict()
+    leftover = []
+    for line in lines:
+        unmatched = []
+        for segment in _CONTACT_SEPARATOR.split(_BULLET.sub("", line)):
+            segment = _CONTACT_LABEL.sub("", segment).strip()
+            if not segment:
+                continue
+            for key, pattern in (("Email", _EMAIL), ("LinkedIn", _LINKEDIN), ("Website", _URL), ("Phone", _PHONE)):
+                match = pattern.search(segment)
+                if match and key not in contact and len(segment) - len(match.group(0)) < 4:
+                    contact[key] = match.group(0)
+                    break
+            else:
+                if "Location" not in contact and _LOCATION.match(segment) and len(segment) < 60:
+                    contact["Location"] = segment
+                else:
+                    unmatched.append(segment)
+        if unmatched:
+            leftover.append(" | ".join(unmatched))
+    ordered = OrderedDict((key, contact[key]) for key in ("Email", "Phone", "Location", "LinkedIn", "Website")
+                          if key in contact)
+    return ordered, leftover
+
+
+def _has_title_word(text: str) -> bool:
+    return any(word.strip(".,()").lower() in JOB_TITLE_WORDS for word in text.split())
+
+
+def _split_role(text: str) -> Tuple[Optional[str], Optional[str]]:
+    # "Title at Company", "Company | Title", "Title, Company"... the side with a job-title word is the title
+    text = text.strip(" ,|-–—()")
+    for separator in _ROLE_SEPARATORS:
+        if separator in text:
+            left, right = (part.strip(" ,|-–—") for part in text.split(separator, 1))
+            if not left or not right:
+                continue
+            if separator.strip() in ("at", "@") or _has_title_word(left):
+                return left, right
+            if _has_title_word(right):
+                return right, left
+            return None, None
+    return (text, None) if text else (None, None)
+
+
+def _format_experience(lines: List[str]) -> Optional[str]:
+    entries: List[Dict[str, object]] = []
+    pending: Optional[str] = None
+    for index, line in enumerate(lines):
+        is_bullet = bool(_BULLET.match(line))
+        dates = None if is_bullet else _DATE_RANGE.search(line)
+        if dates:
+            rest = (line[:dates.start()] + " " + line[dates.end():]).lstrip("#").strip(" ,|-–—()")
+            title, company = _split_role(rest)
+            if pending is not None:
+                if company is not None:
+                    # The role line is complete on its own, so the line before it would be dropped
+                    return None
+                if rest:
+                    title, company = (pending, rest) if _has_title_word(pending) or not _has_title_word(rest) else (rest, pending)
+                elif not rest:
+                    title, company = _split_role(pending)
+            if title is None or company is None:
+                return None
+            entries.append({"title": title, "company": company, "dates": format_date_range(dates), "bullets": []})
+            pending = None
+            continue
+        if pending is not None:
+            return None
+        next_line = lines[index + 1] if index + 1 < len(lines) else ""
+        if not is_bullet and next_line and not _BULLET.match(next_line) and _DATE_RANGE.search(next_line) \
+                and len(line) < 80:
+            pending = line.lstrip("#").strip()
+        elif entries:
+            entries[-1]["bullets"].append(format_bullet(line))
+        else:
+            # Text before the first recognizable role: the layout is not one the rules understand
+            return None
+    if pending is not None or not entries:
+        return None
+    # A blank line separates each "###" entry from its bullets, as in the format_resume prompt's layout
+    return "\n\n".join("\n\n".join([f"### {entry['title']} at {entry['company']} ({entry['dates']})"]
+                                     + (["\n".join(entry["bullets"])] if entry["bullets"] else []))
+                       for entry in entries)
+
+
+def _format_education(lines: List[str]) -> Optional[str]:
+    entries: List[Dict[str, object]] = []
+    for line in lines:
+        text = _BULLET.sub("", line).strip()
+        if _EDUCATION_DETAIL.match(text):
+            if not entries:
+                return None
+            entries[-1]["details"].append("- " + text[:1].upper() + text[1:])
+            continue
+        has_degree, has_institution = bool(_DEGREE.search(text)), bool(_INSTITUTION.search(text))
+        if not has_degree and not has_institution:
+            if not entries:
+                return None
+            entries[-1]["details"].append("- " + text)
+            continue
+        entry = entries[-1] if entries else None
+        if entry is None or (has_degree and entry["degree"]) or (has_institution and entry["institution"]):
+            entry = {"degree": None, "institution": None, "year": None, "details": []}
+            entries.append(entry)
+        _fill_education_entry(entry, text)
+    if not entries or any(not entry["degree"] or not entry["institution"] for entry in entries):
+        return None
+    formatted = []
+    for entry in entries:
+        year = f", {entry['year']}" if entry["year"] else ""
+        formatted.extend([f"- {entry['degree']} - {entry['institution']}{year}"] + entry["details"])
+    return "\n".join(formatted)
+
+
+def _fill_education_entry(entry: Dict[str, object], text: str) -> None:
+    dates = _DATE_RANGE.search(text)
+    years = _YEAR.findall(dates.group(2) if dates and _YEAR.search(dates.group(2)) else text)
+    if years:
+        entry["year"] = years[-1]
+    if dates:
+        text = text[:dates.start()] + text[dates.end():]
+    parts = [part.strip(" ()") for part in re.split(r"\s*(?:,|\||–|—|\s-\s)\s*", text)]
+    parts = [part for part in parts if part and not _YEAR.fullmatch(part) and not _DATE_RANGE.fullmatch(part)]
+    institution = [part for part in parts if _INSTITUTION.search(part)]
+    if institution and not entry["institution"]:
+        entry["institution"] = institution[0]
+    degree_index = next((i for i, part in enumerate(parts) if _DEGREE.search(part) and part not in institution), None)
+    if degree_index is not None and not entry["degree"]:
+        degree = parts[degree_index]
+        # "B.S., Computer Science" carries the major in the next part; "B.S. in Computer Science" does not
+        major = parts[degree_index + 1] if degree_index + 1 < len(parts) else None
+        if major and major not in institution and not re.search(r"\b(?:in|of)\b", degree):
+            degree = f"{degree}, {major}"
+        entry["degree"] = degree
+
+
+def _format_skills(lines: List[str]) -> Optional[str]:
+    groups: "OrderedDict[str, List[str]]" = OrderedDict()
+    seen = set()
+    for line in lines:
+        text = _BULLET.sub("", line).strip()
+        category = None
+        if ":" in text and len(text.split(":", 1)[0].split()) <= 4:
+            category, text = (part.strip() for part in text.split(":", 1))
+            category = category.strip("*").strip()
+        for item in re.split(r"\s*(?:,|;|\||•|·|\t)\s*", text):
+            item = item.strip(" .*")
+            if not item or item.lower() in seen:
+                continue
+            seen.add(item.lower())
+            groups.setdefault(category or _skill_category(item), []).append(item)
+    if not groups:
+        return None
+    return "\n".join(f"- {category}: {', '.join(items)}" for category, items in groups.items())
+
+
+def _skill_category(skill: str) -> str:
+    word = re.sub(r"\s*\(.*\)$", "", skill).strip().lower()
+    if word in SPOKEN_LANGUAGES:
+        return LANGUAGE_SKILLS
+    if word in SOFT_SKILL_WORDS:
+        return SOFT_SKILLS
+    return TECHNICAL_SKILLS
+
+
+def _format_generic(lines: List[str]) -> Optional[str]:
+    # Projects, certifications and the like: keep sub-headings, everything else becomes a bullet
+    blocks: List[List[str]] = []
+    for line in lines:
+        if line.startswith("###"):
+            blocks.extend([[line], []])
+        else:
+            if not blocks:
+                blocks.append([])
+            blocks[-1].append(format_bullet(line))
+    return "\n\n".join("\n".join(block) for block in blocks if block) or None
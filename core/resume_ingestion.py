@@ -0,0 +1,148 @@
+# core/resume_ingestion.py
+#
+# Resume uploads (PDF, DOCX or text) are hashed in fixed-size blocks, extracted page
+# by page in a worker process and cleaned up for layout. Results are cached by file
+# hash, together with the formatted Markdown, so re-uploading the same file skips
+# both the extraction and the format_resume call.
+
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from config import (RESUME_INGESTION_CACHE_DIR, RESUME_EXTRACTION_WORKERS, RESUME_EXTRACTION_TIMEOUT_SECONDS,
+                    RESUME_MAX_UPLOAD_BYTES, RESUME_MAX_PAGES)
+from utils.document_text import DocumentTextError, extract_document_text
+
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+class ResumeIngestionError(ValueError):
+    pass
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ResumeIngestor:
+    """Extracts resume text off the calling thread and caches extracted and formatted text by file hash."""
+
+    def __init__(self, cache_dir: str = RESUME_INGESTION_CACHE_DIR, workers: int = RESUME_EXTRACTION_WORKERS,
+                 timeout: float = RESUME_EXTRACTION_TIMEOUT_SECONDS, max_bytes: int = RESUME_MAX_UPLOAD_BYTES,
+                 max_pages: int = RESUME_MAX_PAGES):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"extractions": 0, "cache_hits": 0, "formatted_hits": 0}
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def extract(self, path: str) -> Dict[str, Any]:
+        """Returns {"hash", "text", "formatted", "cached"}; "formatted" is None until store_formatted is called."""
+        size = os.path.getsize(path)
+        if size > self.max_bytes:
+            raise ResumeIngestionError(f"Resume file is too large ({size // 1024} KB, limit {self.max_bytes // 1024} KB)")
+        digest = file_hash(path)
+        entry = self._read(digest)
+        if entry is not None:
+            with self._lock:
+                self.stats["cache_hits"] += 1
+            return {"hash": digest, "text": entry["text"], "formatted": entry.get("formatted"), "cached": True}
+
+        text = self._run_extraction(path)
+        if not text.strip():
+            raise ResumeIngestionError("No text could be extracted from the file (is it a scanned image?)")
+        with self._lock:
+            self.stats["extractions"] += 1
+        self._write(digest, {"text": text, "formatted": None})
+        return {"hash": digest, "text": text, "formatted": None, "cached": False}
+
+    def format(self, path: str, formatter: Callable[[str], str]) -> Dict[str, Any]:
+        # formatter (the format_resume call) only runs the first time a given file is seen
+        result = self.extract(path)
+        if result["formatted"] is not None:
+            with self._lock:
+                self.stats["formatted_hits"] += 1
+            return result
+        result["formatted"] = formatter(result["text"])
+        self.store_formatted(result["hash"], result["formatted"])
+        return result
+
+    def store_formatted(self, digest: str, formatted: str) -> None:
+        entry = self._read(digest)
+        if entry is not None:
+            entry["formatted"] = formatted
+            self._write(digest, entry)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # Spawned rather than forked: the UI process runs threads, and workers only need utils.document_text
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _run_extraction(self, path: str) -> str:
+        future = self._executor().submit(extract_document_text, path, self.max_pages)
+        try:
+            return future.result(timeout=self.timeout)
+        except DocumentTextError as e:
+            raise ResumeIngestionError(str(e)) from e
+        except FutureTimeoutError:
+            future.cancel()
+            raise ResumeIngestionError(f"Text extraction took longer than {self.timeout:.0f}s")
+        except BrokenProcessPool:
+            # A worker died (e.g. on a malformed PDF); start a fresh pool for the next upload
+            with self._lock:
+                self._pool = None
+            raise ResumeIngestionError("Text extraction failed for this file")
+
+    def _path_for(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _read(self, digest: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path_for(digest), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, digest: str, entry: Dict[str, Any]) -> None:
+        path = self._path_for(digest)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+_ingestor: Optional[ResumeIngestor] = None
+_ingestor_lock = threading.Lock()
+
+
+def get_resume_ingestor() -> ResumeIngestor:
+    global _ingestor
+    with _ingestor_lock:
+        if _ingestor is None:
+            _ingestor = ResumeIngestor()
+        return _ingestor
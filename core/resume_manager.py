@@ -1,11 +1,25 @@
+from core.resume_document import ResumeDocument
+
+
 class ResumeManager:
     def __init__(self):
-        self.resume_content = ""
+        self.document = ResumeDocument()
+
+    @property
+    def resume_content(self) -> str:
+        return self.document.text
 
     def update_resume(self, new_content):
-        self.resume_content = new_content
+        # Accepts text or an already parsed document, which is then shared rather than copied
+        if isinstance(new_content, ResumeDocument):
+            self.document = new_content
+        else:
+            self.document = ResumeDocument.parse(new_content, self.document)
 
     def get_resume(self):
-        return self.resume_content
+        return self.document.text
+
+    def get_document(self) -> ResumeDocument:
+        return self.document
 
-    # Add other shared methods here
+    # Add other shared methods here
\ No newline at end of file
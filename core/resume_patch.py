@@ -0,0 +1,113 @@
+# core/resume_patch.py
+
+import difflib
+import json
+import re
+from typing import Any, Dict, List, Tuple
+from utils.markdown_helper import split_markdown_sections
+
+# Path used for the text before the first "##" section (name line, contact details)
+HEADER_SECTION = "Header"
+PATH_SEPARATOR = "/"
+PATCH_OPERATIONS = ("replace", "replace_text", "insert_after", "delete")
+
+_CODE_FENCE = re.compile(r'^```(?:json)?\s*|\s*```$')
+_BLOCK_HEADING = re.compile(r'^(#{2,3})(?!#)[ \t]+(.+?)[ \t]*$', re.M)
+
+
+class ResumePatchError(ValueError):
+    pass
+
+
+def parse_resume_sections(resume: str) -> List[Tuple[str, str]]:
+    # Flattens the "##" / "###" layout into addressable (path, block) pairs in document order.
+    # A "##" section's own entry holds its heading and any text before its first "###" entry.
+    blocks = []
+    for title, block in split_markdown_sections(resume, level=2):
+        if not title:
+            blocks.append((HEADER_SECTION, block))
+            continue
+        for sub_title, sub_block in split_markdown_sections(block, level=3):
+            blocks.append((f"{title}{PATH_SEPARATOR}{sub_title}" if sub_title else title, sub_block))
+    return blocks
+
+
+def list_section_paths(resume: str) -> List[str]:
+    return [path for path, _ in parse_resume_sections(resume)]
+
+
+def parse_patch(response: str) -> Dict[str, Any]:
+    try:
+        patch = json.loads(_CODE_FENCE.sub('', response.strip()))
+    except ValueError as e:
+        raise ResumePatchError(f"Patch is not valid JSON: {str(e)}") from e
+    if not isinstance(patch, dict) or not isinstance(patch.get("operations"), list):
+        raise ResumePatchError("Patch must be an object with an 'operations' list")
+    return patch
+
+
+def apply_patch(resume: str, operations: List[Dict[str, Any]]) -> str:
+    blocks = parse_resume_sections(resume)
+    for index, operation in enumerate(operations):
+        try:
+            blocks = _apply_operation(blocks, operation)
+        except ResumePatchError as e:
+            raise ResumePatchError(f"Operation {index + 1} ({operation.get('op')}): {str(e)}") from None
+    patched = "".join(block for _, block in blocks).rstrip()
+    return patched + "\n" if resume.endswith("\n") else patched
+
+
+def diff_resumes(old: str, new: str, old_label: str = "current", new_label: str = "updated") -> str:
+    return "".join(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True),
+                                        fromfile=old_label, tofile=new_label))
+
+
+def _apply_operation(blocks: List[Tuple[str, str]], operation: Dict[str, Any]) -> List[Tuple[str, str]]:
+    op = operation.get("op")
+    path = operation.get("section", "")
+    if op not in PATCH_OPERATIONS:
+        raise ResumePatchError(f"Unknown operation, expected one of {PATCH_OPERATIONS}")
+
+    # A "##" path addresses the section together with all of its "###" entries
+    indexes = [i for i, (block_path, _) in enumerate(blocks)
+               if block_path == path or block_path.startswith(path + PATH_SEPARATOR)]
+    if not indexes:
+        raise ResumePatchError(f"Section '{path}' not found")
+
+    if op == "delete":
+        return [block for i, block in enumerate(blocks) if i not in indexes]
+
+    if op == "replace_text":
+        find, replacement = operation.get("find"), operation.get("replace")
+        if not find or replacement is None:
+            raise ResumePatchError("'find' and 'replace' are required")
+        section_text = "".join(blocks[i][1] for i in indexes)
+        occurrences = section_text.count(find)
+        if occurrences != 1:
+            raise ResumePatchError(f"'find' text occurs {occurrences} times in '{path}', expected exactly once")
+        i = next((i for i in indexes if find in blocks[i][1]), None)
+        if i is None:
+            raise ResumePatchError(f"'find' text spans several entries of '{path}'; replace the section instead")
+        return blocks[:i] + [(blocks[i][0], blocks[i][1].replace(find, replacement, 1))] + blocks[i + 1:]
+
+    content = operation.get("content")
+    if not isinstance(content, str) or not content.strip():
+        raise ResumePatchError("'content' is required")
+    content = content.strip("\n") + "\n\n"
+
+    if op == "replace":
+        # Keep the block path so later operations in the same patch can still address it
+        return blocks[:indexes[0]] + [(path, content)] + blocks[indexes[-1] + 1:]
+
+    # insert_after: the new block gets a path of its own so later operations can address it
+    heading = _BLOCK_HEADING.match(content)
+    if heading and len(heading.group(1)) == 2:
+        new_path = heading.group(2)
+    elif heading:
+        new_path = f"{path.split(PATH_SEPARATOR, 1)[0]}{PATH_SEPARATOR}{heading.group(2)}"
+    else:
+        new_path = path
+    last = indexes[-1]
+    if not blocks[last][1].endswith("\n"):
+        blocks = blocks[:last] + [(blocks[last][0], blocks[last][1] + "\n\n")] + blocks[last + 1:]
+    return blocks[:last + 1] + [(new_path, content)] + blocks[last + 1:]
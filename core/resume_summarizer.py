@@ -0,0 +1,81 @@
+# core/resume_summarizer.py
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+from config import RESUME_SUMMARY_THRESHOLD, RESUME_SECTION_SUMMARY_MIN_LENGTH
+from core.resume_document import ResumeDocument
+from utils.markdown_helper import content_hash
+
+
+class ResumeSummarizer:
+    """Summarizes each resume version once, section by section, reusing summaries of unchanged sections."""
+
+    def __init__(self, ai_manager, threshold: int = RESUME_SUMMARY_THRESHOLD, max_workers: int = 1):
+        self.ai_manager = ai_manager
+        self.threshold = threshold
+        self._summaries: Dict[str, str] = {}
+        self._section_summaries: Dict[str, str] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resume-summarizer")
+
+    def schedule(self, resume: str) -> Optional[Future]:
+        # Called from CAPTAINContextManager.update_master_resume so the work is done before anyone needs it
+        if len(resume) <= self.threshold:
+            return None
+        key = content_hash(resume)
+        with self._lock:
+            if key in self._summaries:
+                return None
+            future = self._pending.get(key)
+            if future is None:
+                future = self._executor.submit(self._summarize, key, resume)
+                self._pending[key] = future
+        return future
+
+    def get_summary(self, resume: str) -> str:
+        if len(resume) <= self.threshold:
+            return resume
+        key = content_hash(resume)
+        with self._lock:
+            summary = self._summaries.get(key)
+        if summary is not None:
+            return summary
+        future = self.schedule(resume)
+        if future is None:
+            return self._summaries[key]
+        return future.result()
+
+    def _summarize(self, key: str, resume: str) -> str:
+        try:
+            document = ResumeDocument.parse(resume)
+            blocks = ([(content_hash(document.header.strip()), document.header)] if document.header.strip() else []) + \
+                [(section.hash, section.block) for section in document]
+            summary = "\n\n".join(self._summarize_section(block, section_key) for section_key, block in blocks)
+            with self._lock:
+                self._summaries[key] = summary
+                # A summary that is itself long must not be summarized again downstream
+                self._summaries[content_hash(summary)] = summary
+            return summary
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def _summarize_section(self, section: str, key: str) -> str:
+        # Keyed by the section's content hash, so after an edit only the changed sections are summarized again
+        section = section.strip()
+        if len(section) <= RESUME_SECTION_SUMMARY_MIN_LENGTH:
+            return section
+        with self._lock:
+            summary = self._section_summaries.get(key)
+        if summary is None:
+            # The length budget depends only on the section itself, so unchanged sections hit the cache
+            max_length = max(RESUME_SECTION_SUMMARY_MIN_LENGTH, len(section) // 3)
+            summary = self.ai_manager.generate_response("summarize_resume_section", {
+                "section": section,
+                "max_length": max_length
+            }).strip()[:max_length]
+            with self._lock:
+                self._section_summaries[key] = summary
+        return summary
@@ -0,0 +1,177 @@
+# core/resume_tailoring.py
+#
+# Batch generation of tailored resume variants, one per job application. Each job
+# gets a patch against the tailorable sections of the master resume (summary,
+# experience, skills), produced on a bounded worker pool and stored as a per-job
+# variant in the resume version history. Results are cached by master resume
+# version and job description hash, so re-running a batch only tailors jobs whose
+# description or the master resume changed since, and jobs with the same description
+# in one batch share a single tailoring call.
+#
+# Run from the repository root:  python -m core.resume_tailoring --status "Not Started"
+
+import argparse
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from config import RESUME_TAILORING_CONCURRENCY, RESUME_TAILORING_SECTIONS, RESUME_TAILORING_DESCRIPTION_TOKENS
+from core.context_manager import CAPTAINContextManager
+from core.resume_document import ResumeDocument
+from core.resume_patch import apply_patch, list_section_paths, parse_patch
+from utils.markdown_helper import content_hash
+from utils.token_counter import truncate_to_tokens
+
+
+def tailoring_cache_key(resume_version: int, description: str) -> str:
+    return f"tailored_resume:{resume_version}:{content_hash(description)[:16]}"
+
+
+class ResumeTailoringPipeline:
+    """Tailors the master resume to many jobs in parallel and stores each result as that job's resume variant."""
+
+    def __init__(self, context_manager: CAPTAINContextManager, ai_manager, concurrency: int = RESUME_TAILORING_CONCURRENCY,
+                 sections: Iterable[str] = RESUME_TAILORING_SECTIONS,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        if context_manager.resume_versions is None:
+            raise ValueError("Resume tailoring needs a context manager with a state store attached")
+        self.context_manager = context_manager
+        self.ai_manager = ai_manager
+        self.concurrency = concurrency
+        self.sections = list(sections)
+        self.progress_callback = progress_callback or self._print_progress
+
+    def run(self, job_ids: Iterable[str], force: bool = False) -> Dict[str, Any]:
+        versions = self.context_manager.resume_versions
+        store = self.context_manager.store
+        if not self.context_manager.master_resume.strip():
+            raise ValueError("There is no master resume to tailor")
+        master_version = versions.commit(self.context_manager.master_resume)
+        document = ResumeDocument.parse(versions.checkout(master_version))
+        resume_sections = document.render(self.sections)
+        section_paths = "\n".join(f"- {path}" for path in list_section_paths(resume_sections))
+
+        report = {"requested": 0, "tailored": 0, "cached": 0, "skipped": 0, "failed": 0,
+                  "variants": {}, "errors": {}, "resume_version": master_version}
+        started = time.monotonic()
+        in_flight: Dict[Future, Tuple[str, str]] = {}
+        # Jobs waiting on an in-flight job with the same cache key (same description); they reuse its result
+        followers: Dict[str, List[str]] = {}
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="resume-tailoring")
+        try:
+            for job_id in job_ids:
+                report["requested"] += 1
+                job = self.context_manager.get_job_application(job_id)
+                description = job.get("description", "")
+                if not description.strip():
+                    report["skipped"] += 1
+                    report["errors"][job_id] = "No job description" if job else "Job application not found"
+                    continue
+                key = tailoring_cache_key(master_version, description)
+                cached = None if force else store.get_value(key)
+                if cached is not None:
+                    report["variants"][job_id] = self._reuse(job_id, cached["version"])
+                    report["cached"] += 1
+                    continue
+                if key in followers:
+                    followers[key].append(job_id)
+                    continue
+                followers[key] = []
+                future = executor.submit(self._tailor, document.text, resume_sections, section_paths, job)
+                in_flight[future] = (job_id, key)
+
+                # Bounded queue: no more jobs are read while the workers are saturated
+                while len(in_flight) >= 2 * self.concurrency:
+                    self._collect(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, followers, report, started)
+            while in_flight:
+                self._collect(wait(in_flight, return_when=FIRST_COMPLETED).done, in_flight, followers, report, started)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        report["elapsed_seconds"] = round(time.monotonic() - started, 2)
+        self.progress_callback(self._progress(report, started, 0))
+        return report
+
+    def _tailor(self, resume: str, resume_sections: str, section_paths: str, job: Dict[str, Any]) -> Tuple[str, str]:
+        # Runs on a worker thread and touches no shared state; jobs with the same prompt share one LLM call
+        description, _, _ = truncate_to_tokens(job["description"], RESUME_TAILORING_DESCRIPTION_TOKENS)
+        response = self.ai_manager.generate_response("resume_tailor", {
+            "resume_sections": resume_sections,
+            "section_paths": section_paths,
+            "job_title": job.get("position", ""),
+            "company": job.get("company", ""),
+            "job_description": description,
+        })
+        patch = parse_patch(response)
+        return apply_patch(resume, patch["operations"]), patch.get("explanation", "")
+
+    def _reuse(self, job_id: str, version: int) -> int:
+        # Same master version and description as an earlier run (or another job): reuse the tailored text
+        versions = self.context_manager.resume_versions
+        head = versions.head(job_id)
+        if head is not None and versions.get_version(head)["hash"] == versions.get_version(version)["hash"]:
+            return head
+        return self.context_manager.commit_resume_variant(job_id, versions.checkout(version), f"Tailored (reused v{version})")
+
+    def _collect(self, done, in_flight: Dict[Future, Tuple[str, str]], followers: Dict[str, List[str]],
+                 report: Dict[str, Any], started: float) -> None:
+        # Variants are committed on the calling thread, so the version store is only written from one place
+        for future in done:
+            job_id, key = in_flight.pop(future)
+            waiting = followers.pop(key, [])
+            try:
+                tailored, explanation = future.result()
+            except Exception as e:
+                report["failed"] += 1 + len(waiting)
+                for failed_id in [job_id] + waiting:
+                    report["errors"][failed_id] = str(e)
+                continue
+            job = self.context_manager.get_job_application(job_id)
+            version = self.context_manager.commit_resume_variant(
+                job_id, tailored, f"Tailored for {job.get('position', 'job')} at {job.get('company', 'company')}")
+            self.context_manager.store.set_value(key, {"version": version, "explanation": explanation})
+            report["variants"][job_id] = version
+            report["tailored"] += 1
+            for follower_id in waiting:
+                report["variants"][follower_id] = self._reuse(follower_id, version)
+                report["cached"] += 1
+            if report["tailored"] % self.concurrency == 0:
+                self.progress_callback(self._progress(report, started, len(in_flight)))
+
+    def _progress(self, report: Dict[str, Any], started: float, in_flight: int) -> Dict[str, Any]:
+        elapsed = time.monotonic() - started
+        counts = {key: value for key, value in report.items() if isinstance(value, int)}
+        return {**counts, "in_flight": in_flight, "elapsed_seconds": round(elapsed, 2),
+                "jobs_per_minute": round(60 * report["tailored"] / elapsed, 1) if elapsed > 0 else 0.0}
+
+    def _print_progress(self, progress: Dict[str, Any]) -> None:
+        print(f"Requested {progress['requested']} jobs: {progress['tailored']} tailored, {progress['cached']} cached, "
+              f"{progress['skipped']} skipped, {progress['failed']} failed, {progress['in_flight']} in flight "
+              f"({progress['jobs_per_minute']}/min)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a tailored resume variant for each job application.")
+    parser.add_argument("job_ids", nargs="*", help="applications to tailor for (default: all matching --status)")
+    parser.add_argument("--status", action="append", help="only applications with this status (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=RESUME_TAILORING_CONCURRENCY, help="parallel tailoring calls")
+    parser.add_argument("--force", action="store_true", help="tailor again even when a cached variant exists")
+    args = parser.parse_args()
+
+    from core.ai_manager import AIManager
+    from core.data_manager import DataManager
+
+    context_manager = CAPTAINContextManager()
+    data_manager = DataManager(context_manager)
+    data_manager.load_state()
+    job_ids: List[str] = args.job_ids or [job_id for job_id, application in context_manager.query_applications(status=args.status)
+                                          if not application.get("duplicate_of")]
+
+    pipeline = ResumeTailoringPipeline(context_manager, AIManager(), concurrency=args.concurrency)
+    report = pipeline.run(job_ids, force=args.force)
+    data_manager.save_state()
+    for job_id, error in report["errors"].items():
+        print(f"{job_id}: {error}")
+
+
+if __name__ == "__main__":
+    main()
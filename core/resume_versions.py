@@ -0,0 +1,167 @@
+# core/resume_versions.py
+#
+# Resume history in the state store. Each version is stored as a line-level delta
+# against an ancestor, chosen skip-delta style: a version at depth d in its ancestry
+# is stored against the ancestor at depth d & (d - 1), and every RESUME_SNAPSHOT_INTERVAL
+# levels holds a full snapshot. Rebuilding any version then takes at most
+# log2(RESUME_SNAPSHOT_INTERVAL) deltas, and no delta spans more than one interval.
+# Tailored per-job variants are versions whose parent is a master version, so they
+# are stored as deltas too.
+
+import difflib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Union
+from config import RESUME_SNAPSHOT_INTERVAL, RESUME_VERSION_CACHE_SIZE
+from core.resume_document import ResumeDocument
+from core.resume_patch import diff_resumes
+from core.state_store import StateStore
+from utils.markdown_helper import content_hash
+
+# A delta is a JSON list of [start, end] line ranges copied from the base and strings of new text
+Delta = List[Union[List[int], str]]
+
+
+class ResumeVersionError(KeyError):
+    pass
+
+
+def make_delta(base: str, text: str) -> Delta:
+    base_lines, lines = base.splitlines(keepends=True), text.splitlines(keepends=True)
+    delta: Delta = []
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(lines[j1:j2]))
+    return delta
+
+
+def apply_delta(base: str, delta: Delta) -> str:
+    base_lines = base.splitlines(keepends=True)
+    return "".join("".join(base_lines[op[0]:op[1]]) if isinstance(op, list) else op for op in delta)
+
+
+class ResumeVersionStore:
+    """Versioned master resume and per-job variants, stored as skip-deltas with periodic snapshots.
+
+    Versions are never modified; restoring an old version commits its text as a new one.
+    """
+
+    def __init__(self, store: StateStore, snapshot_interval: int = RESUME_SNAPSHOT_INTERVAL,
+                 cache_size: int = RESUME_VERSION_CACHE_SIZE):
+        if snapshot_interval & (snapshot_interval - 1):
+            raise ValueError("snapshot_interval must be a power of two")
+        self.store = store
+        self.snapshot_interval = snapshot_interval
+        self.cache_size = cache_size
+        # Rebuilt texts of recently used versions; they are immutable, so entries never go stale
+        self._texts: "OrderedDict[int, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def head(self, job_id: Optional[str] = None) -> Optional[int]:
+        return self.store.latest_resume_version(job_id)
+
+    def commit(self, text: str, job_id: Optional[str] = None, parent: Optional[int] = None, message: str = "") -> int:
+        """Stores text as a new version and returns its number, or the parent's if the text is unchanged.
+
+        Master versions follow the master head. A job variant follows that job's latest variant, or
+        branches from the master head the first time.
+        """
+        with self.store.transaction():
+            if parent is None:
+                parent = self.head(job_id) if job_id is not None else None
+                parent = parent if parent is not None else self.head()
+            parent_row = self._row(parent) if parent is not None else None
+            if parent_row is not None:
+                if parent_row["hash"] == content_hash(text) and parent_row["job_id"] == job_id:
+                    return parent
+                depth = parent_row["depth"] + 1
+            else:
+                depth = 0
+
+            skip = self._ancestor_at_depth(parent_row, depth & (depth - 1)) if parent_row is not None else None
+            base, data = None, text
+            if skip is not None and depth % self.snapshot_interval:
+                delta = json.dumps(make_delta(self.checkout(skip), text), separators=(",", ":"))
+                # A delta that is no smaller than the text is not worth a rebuild step
+                if len(delta) < len(text):
+                    base, data = skip, delta
+            version = self.store.add_resume_version(parent, job_id, depth, skip, base, data, content_hash(text), message)
+        self._remember(version, text)
+        return version
+
+    def checkout(self, version: int) -> str:
+        with self._lock:
+            text = self._texts.get(version)
+            if text is not None:
+                self._texts.move_to_end(version)
+                return text
+        # Walk the base chain back to a snapshot or a cached text, then apply the deltas forwards
+        chain = []
+        row = self._row(version)
+        while True:
+            with self._lock:
+                text = self._texts.get(row["version"])
+            if text is not None:
+                break
+            if row["base"] is None:
+                text = row["data"]
+                break
+            chain.append(row)
+            row = self._row(row["base"])
+        for row in reversed(chain):
+            text = apply_delta(text, json.loads(row["data"]))
+        self._remember(version, text)
+        return text
+
+    def checkout_document(self, version: int) -> ResumeDocument:
+        return ResumeDocument.parse(self.checkout(version))
+
+    def diff(self, from_version: int, to_version: int) -> str:
+        return diff_resumes(self.checkout(from_version), self.checkout(to_version),
+                            f"v{from_version}", f"v{to_version}")
+
+    def changed_sections(self, from_version: int, to_version: int) -> List[str]:
+        return self.checkout_document(to_version).changed_sections(self.checkout_document(from_version))
+
+    def log(self, job_id: Optional[str] = None, include_variants: bool = False,
+            limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.store.list_resume_versions(job_id, include_variants, limit)
+
+    def get_version(self, version: int) -> Dict[str, Any]:
+        row = self._row(version)
+        return {**{key: value for key, value in row.items() if key != "data"}, "size": len(row["data"])}
+
+    def get_stats(self) -> Dict[str, Any]:
+        versions = self.log(include_variants=True)
+        return {
+            "versions": len(versions),
+            "variants": sum(1 for version in versions if version["job_id"] is not None),
+            "snapshots": sum(1 for version in versions if version["base"] is None),
+            "stored_chars": sum(version["size"] for version in versions),
+            "cached_texts": len(self._texts),
+        }
+
+    def _row(self, version: int) -> Dict[str, Any]:
+        row = self.store.get_resume_version(version)
+        if row is None:
+            raise ResumeVersionError(f"Resume version {version} not found")
+        return row
+
+    def _ancestor_at_depth(self, row: Dict[str, Any], depth: int) -> int:
+        # Each version links to its ancestor at depth d & (d - 1); from the parent, those links reach
+        # the target in O(log depth) steps, with parent steps only where a skip would overshoot
+        while row["depth"] > depth:
+            skip_depth = row["depth"] & (row["depth"] - 1)
+            row = self._row(row["skip"] if row["skip"] is not None and skip_depth >= depth else row["parent"])
+        return row["version"]
+
+    def _remember(self, version: int, text: str) -> None:
+        with self._lock:
+            self._texts[version] = text
+            self._texts.move_to_end(version)
+            while len(self._texts) > self.cache_size:
+                self._texts.popitem(last=False)
@@ -0,0 +1,77 @@
+# core/section_parser.py
+
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# A numbered header at the start of a line: "3. Title", "12) Title", "**4. Title:**" or "### 5. Title".
+# Indented numbers are left alone so numbered lists inside a section stay part of its body.
+_SECTION_HEADER = re.compile(r"^(?:#{1,6}[ \t]*)?(?:\*\*)?\d{1,3}[.)](?:\*\*)?(?:[ \t]+(.*?))?[ \t]*$")
+_TITLE_STRIP = " \t*:"
+
+Section = Tuple[str, List[str]]
+
+
+class SectionParser:
+    """Single-pass parser for numbered-section responses.
+
+    Text can be fed in arbitrary chunks; each section is emitted as soon as the next header or the end of
+    the stream closes it. Text before the first header is ignored.
+    """
+
+    def __init__(self):
+        self._pending: List[str] = []
+        self._title: Optional[str] = None
+        self._lines: List[str] = []
+
+    def feed(self, chunk: str) -> List[Section]:
+        if "\n" not in chunk:
+            # Most stream chunks are a few tokens of one line; hold them until the line is complete
+            self._pending.append(chunk)
+            return []
+        self._pending.append(chunk)
+        lines = "".join(self._pending).split("\n")
+        self._pending = [lines.pop()]
+        completed = []
+        for line in lines:
+            self._consume(line, completed)
+        return completed
+
+    def close(self) -> List[Section]:
+        completed = []
+        self._consume("".join(self._pending), completed)
+        self._pending = []
+        if self._title is not None:
+            completed.append((self._title, self._lines))
+            self._title, self._lines = None, []
+        return completed
+
+    def _consume(self, line: str, completed: List[Section]) -> None:
+        match = _SECTION_HEADER.match(line)
+        if match:
+            if self._title is not None:
+                completed.append((self._title, self._lines))
+            self._title, self._lines = (match.group(1) or "").strip(_TITLE_STRIP), []
+            return
+        line = line.strip()
+        if line and self._title is not None:
+            self._lines.append(line)
+
+
+def parse_sections(text: str) -> List[Section]:
+    parser = SectionParser()
+    return parser.feed(text) + parser.close()
+
+
+def iter_sections(chunks: Iterable[str]) -> Iterator[Section]:
+    parser = SectionParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def sections_to_lists(sections: Iterable[Section]) -> Dict[str, List[str]]:
+    return dict(sections)
+
+
+def sections_to_text(sections: Iterable[Section]) -> Dict[str, str]:
+    return {title: " ".join(lines) for title, lines in sections}
@@ -0,0 +1,129 @@
+# core/single_flight.py
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterator, List
+
+
+class AbandonedCallError(RuntimeError):
+    pass
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.chunks: List[Any] = []
+        self.changed = threading.Condition()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one: the first caller runs it, the others wait.
+
+    Every waiter gets the leader's result, or its exception. Only calls that overlap in time are shared;
+    once a call finishes the next one with that key runs again, so this never serves stale results.
+    Sync, async and streaming callers can be mixed, across threads and event loops.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "coalesced": 0}
+
+    def _join(self, key: Hashable):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.stats["coalesced"] += 1
+                return call, False
+            call = self._calls[key] = _Call()
+            self.stats["calls"] += 1
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call, result: Any = None, error: BaseException = None) -> None:
+        with self._lock:
+            del self._calls[key]
+        with call.changed:
+            call.result, call.error = result, error
+            call.done.set()
+            call.changed.notify_all()
+
+    def _shared_error(self, error: BaseException) -> BaseException:
+        # The leader being cancelled or interrupted is not the followers' own cancellation; they see an abandoned call
+        if isinstance(error, Exception):
+            return error
+        return AbandonedCallError(f"The shared call was abandoned: {type(error).__name__}")
+
+    def _outcome(self, call: _Call) -> Any:
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            return self._outcome(call)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, error=self._shared_error(e))
+            raise
+        self._finish(key, call, result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call, leader = self._join(key)
+        if not leader:
+            # The leader may be on another thread or event loop, so wait on the thread-safe event off this loop
+            if not call.done.is_set():
+                await asyncio.to_thread(call.done.wait)
+            return self._outcome(call)
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, call, error=self._shared_error(e))
+            raise
+        self._finish(key, call, result)
+        return result
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        # Followers replay the chunks the leader has already received, then follow it live
+        call, leader = self._join(key)
+        if leader:
+            yield from self._lead_stream(key, call, fn)
+            return
+        position = 0
+        while True:
+            with call.changed:
+                while position == len(call.chunks) and not call.done.is_set():
+                    call.changed.wait()
+                pending, finished = call.chunks[position:], call.done.is_set()
+            for chunk in pending:
+                yield chunk
+            position += len(pending)
+            if finished and position == len(call.chunks):
+                self._outcome(call)
+                return
+
+    def _lead_stream(self, key: Hashable, call: _Call, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        error: BaseException = AbandonedCallError("The shared stream was abandoned before it finished")
+        try:
+            for chunk in fn():
+                with call.changed:
+                    call.chunks.append(chunk)
+                    call.changed.notify_all()
+                yield chunk
+        except Exception as e:
+            error = e
+            raise
+        else:
+            error = None
+        finally:
+            # Also runs when the leader's consumer stops early, so followers are never left waiting
+            self._finish(key, call, error=error)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "in_flight": len(self._calls)}
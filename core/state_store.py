@@ -0,0 +1,224 @@
+# core/state_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+from config import STATE_DB_FILE
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    job_id TEXT PRIMARY KEY,
+    company TEXT,
+    position TEXT,
+    status TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications(status);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications(company);
+
+-- Legacy: application history now lives in the segmented HistoryLog. Nothing writes this table any more;
+-- load_history() reads it once so stores from before the log can be migrated
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp REAL NOT NULL,
+    action TEXT NOT NULL,
+    job_id TEXT,
+    data TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_job_id ON history(job_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history(timestamp);
+
+CREATE TABLE IF NOT EXISTS resume_versions (
+    version INTEGER PRIMARY KEY,
+    parent INTEGER,
+    job_id TEXT,
+    depth INTEGER NOT NULL,
+    skip INTEGER,
+    base INTEGER,
+    data TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    message TEXT,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_resume_versions_job_id ON resume_versions(job_id, version);
+
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class StateStore:
+    """SQLite-backed application state with per-row upserts and atomic transactions."""
+
+    def __init__(self, db_path: str = STATE_DB_FILE):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Autocommit mode; multi-statement writes go through transaction()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        self._depth = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        # Re-entrant: nested blocks join the outermost transaction, which commits or rolls back as a whole
+        with self._lock:
+            if self._depth == 0:
+                self._conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self._conn
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._conn.execute("COMMIT")
+
+    def upsert_application(self, job_id: str, data: Dict[str, Any]) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO applications (job_id, company, position, status, data, updated_at) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET company=excluded.company, position=excluded.position, "
+                "status=excluded.status, data=excluded.data, updated_at=excluded.updated_at",
+                (job_id, data.get("company"), data.get("position"), data.get("status"), json.dumps(data), time.time())
+            )
+
+    def upsert_applications(self, applications: Dict[str, Dict[str, Any]]) -> None:
+        with self.transaction():
+            for job_id, data in applications.items():
+                self.upsert_application(job_id, data)
+
+    def delete_application(self, job_id: str) -> None:
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM applications WHERE job_id = ?", (job_id,))
+
+    def get_application(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM applications WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def get_applications_by_status(self, status: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id, data FROM applications WHERE status = ?", (status,)).fetchall()
+        return {job_id: json.loads(data) for job_id, data in rows}
+
+    def load_applications(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT job_id, data FROM applications ORDER BY rowid").fetchall()
+        return {job_id: json.loads(data) for job_id, data in rows}
+
+    def count_applications(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0]
+
+    def load_history(self, since: Optional[float] = None, job_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Migration only: reads the legacy history table written before the HistoryLog
+        query, params = "SELECT timestamp, action, job_id, data FROM history WHERE 1=1", []
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(since)
+        if job_id is not None:
+            query += " AND job_id = ?"
+            params.append(job_id)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY id", params).fetchall()
+
+        history = []
+        for timestamp, action, event_job_id, data in rows:
+            event = {"timestamp": timestamp, "action": action}
+            if event_job_id is not None:
+                event["job_id"] = event_job_id
+            if data:
+                event.update(json.loads(data))
+            history.append(event)
+        return history
+
+    def add_resume_version(self, parent: Optional[int], job_id: Optional[str], depth: int, skip: Optional[int],
+                           base: Optional[int], data: str, content_hash: str, message: str = "") -> int:
+        # base is None for a full snapshot; otherwise data is a delta against version base
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO resume_versions (parent, job_id, depth, skip, base, data, hash, message, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (parent, job_id, depth, skip, base, data, content_hash, message, time.time())
+            )
+            return cursor.lastrowid
+
+    def get_resume_version(self, version: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute("SELECT * FROM resume_versions WHERE version = ?", (version,))
+            row = cursor.fetchone()
+            return dict(zip((column[0] for column in cursor.description), row)) if row else None
+
+    def list_resume_versions(self, job_id: Optional[str] = None, include_variants: bool = False,
+                             limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        # Newest first, without the stored text or delta
+        query = "SELECT version, parent, job_id, depth, skip, base, hash, message, created_at, length(data) AS size FROM resume_versions"
+        params: List[Any] = []
+        if job_id is not None:
+            query += " WHERE job_id = ?"
+            params.append(job_id)
+        elif not include_variants:
+            query += " WHERE job_id IS NULL"
+        query += " ORDER BY version DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def latest_resume_version(self, job_id: Optional[str] = None) -> Optional[int]:
+        query = "SELECT MAX(version) FROM resume_versions WHERE " + ("job_id = ?" if job_id is not None else "job_id IS NULL")
+        with self._lock:
+            return self._conn.execute(query, (job_id,) if job_id is not None else ()).fetchone()[0]
+
+    def set_value(self, key: str, value: Any) -> None:
+        with self.transaction() as conn:
+            conn.execute("INSERT INTO kv (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value=excluded.value",
+                         (key, json.dumps(value)))
+
+    def get_value(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def migrate_from_files(self, resume_file: str, applications_file: str) -> bool:
+        # One-time import of the legacy resume.md / job_applications.json files
+        if self.get_value("migrated_from_files"):
+            return False
+        with self.transaction():
+            if os.path.exists(applications_file):
+                with open(applications_file, "r") as f:
+                    self.upsert_applications(json.load(f))
+            if os.path.exists(resume_file) and self.get_value("master_resume") is None:
+                with open(resume_file, "r") as f:
+                    self.set_value("master_resume", f.read())
+            self.set_value("migrated_from_files", time.time())
+        return True
+
+    def checkpoint(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
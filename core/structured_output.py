@@ -0,0 +1,176 @@
+# core/structured_output.py
+
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s*")
+_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+class TolerantJSONParser:
+    """Incremental JSON scanner for model output.
+
+    Chunks are consumed once each: prose or code fences around the value and trailing commas are dropped
+    as they stream in, and the cleaned prefix can be closed off at any point to get a partial value.
+    """
+
+    def __init__(self):
+        self._out: List[str] = []
+        self._stack: List[str] = []
+        self._started = False
+        self._complete = False
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        return self._complete
+
+    def feed(self, chunk: str) -> None:
+        for char in chunk:
+            if self._complete:
+                return
+            self._consume(char)
+
+    def _consume(self, char: str) -> None:
+        if self._in_string:
+            self._out.append(char)
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+            return
+        if not self._started:
+            if char not in "{[":
+                return
+            self._started = True
+        if char == '"':
+            self._in_string = True
+            self._out.append(char)
+        elif char in "{[":
+            self._stack.append("}" if char == "{" else "]")
+            self._out.append(char)
+        elif char in "}]":
+            self._drop_trailing_comma()
+            if self._stack:
+                self._stack.pop()
+            self._out.append(char)
+            if not self._stack:
+                self._complete = True
+        elif char.isspace():
+            # Raw newlines inside strings are kept (parsed with strict=False); outside them whitespace is collapsed
+            if self._out and not self._out[-1].isspace():
+                self._out.append(" ")
+        else:
+            self._out.append(char)
+
+    def _drop_trailing_comma(self) -> None:
+        while self._out and self._out[-1].isspace():
+            self._out.pop()
+        if self._out and self._out[-1] == ",":
+            self._out.pop()
+
+    def text(self) -> str:
+        return "".join(self._out)
+
+    def result(self) -> Any:
+        if not self._started:
+            raise StructuredOutputError("Response does not contain a JSON object")
+        text = self._normalize_literals(self.text())
+        try:
+            return json.loads(text if self._complete else self._close(text), strict=False)
+        except ValueError as e:
+            raise StructuredOutputError(f"Response is not valid JSON: {str(e)}") from None
+
+    def partial(self) -> Optional[Any]:
+        # Best-effort value of what has arrived so far; None until something parseable exists
+        if not self._started:
+            return None
+        try:
+            return json.loads(self._close(self._normalize_literals(self.text())), strict=False)
+        except ValueError:
+            return None
+
+    def _close(self, text: str) -> str:
+        if self._in_string:
+            # A dangling backslash is the first half of an escape that has not arrived yet; it is left out
+            if self._escape:
+                text = text[:-1]
+            text += '"'
+        text = text.rstrip()
+        if self._stack and self._stack[-1] == "}":
+            # A dangling key cannot be closed into valid JSON; cut back to the last complete member
+            text = re.sub(r'(,|\{)\s*"(?:[^"\\]|\\.)*"\s*:?\s*$', r"\1", text)
+        text = re.sub(r"[,:]\s*$", "", text)
+        return text + "".join(reversed(self._stack))
+
+    def _normalize_literals(self, text: str) -> str:
+        if not any(literal in text for literal in _LITERALS):
+            return text
+        return re.sub(r'("(?:[^"\\]|\\.)*")|\b(True|False|None)\b',
+                      lambda m: m.group(1) or _LITERALS[m.group(2)], text)
+
+
+def parse_json_response(response: str) -> Any:
+    parser = TolerantJSONParser()
+    parser.feed(response)
+    return parser.result()
+
+
+def validate(data: Any, schema: Dict[str, Any], path: str = "$") -> Any:
+    # Checks a JSON-schema subset (object/array/string/number/integer/boolean) and coerces the harmless
+    # mismatches models produce, such as a bulleted string where a list was asked for
+    expected = schema.get("type")
+    if expected == "object":
+        if not isinstance(data, dict):
+            raise StructuredOutputError(f"{path}: expected an object")
+        missing = [key for key in schema.get("required", []) if key not in data]
+        if missing:
+            raise StructuredOutputError(f"{path}: missing required keys {missing}")
+        properties = schema.get("properties", {})
+        return {key: validate(value, properties[key], f"{path}.{key}") if key in properties else value
+                for key, value in data.items()}
+    if expected == "array":
+        if isinstance(data, str):
+            data = [_BULLET.sub("", line).strip() for line in data.splitlines() if line.strip()]
+        if not isinstance(data, list):
+            raise StructuredOutputError(f"{path}: expected an array")
+        items = schema.get("items")
+        return [validate(item, items, f"{path}[{i}]") if items else item for i, item in enumerate(data)]
+    if expected == "string":
+        if isinstance(data, list) and all(isinstance(item, str) for item in data):
+            return "\n".join(data)
+        if isinstance(data, (int, float)) and not isinstance(data, bool):
+            return str(data)
+        if not isinstance(data, str):
+            raise StructuredOutputError(f"{path}: expected a string")
+        return data
+    if expected in ("number", "integer"):
+        if isinstance(data, str):
+            try:
+                data = float(data) if expected == "number" else int(data)
+            except ValueError:
+                raise StructuredOutputError(f"{path}: expected a {expected}") from None
+        if isinstance(data, bool) or not isinstance(data, (int, float)):
+            raise StructuredOutputError(f"{path}: expected a {expected}")
+        return int(data) if expected == "integer" else data
+    if expected == "boolean":
+        if not isinstance(data, bool):
+            raise StructuredOutputError(f"{path}: expected a boolean")
+        return data
+    return data
+
+
+def parse_structured(response: str, schema: Dict[str, Any]) -> Any:
+    return validate(parse_json_response(response), schema)
+
+
+def format_instructions(schema: Dict[str, Any]) -> str:
+    return json.dumps(schema, separators=(",", ":"))
@@ -0,0 +1,336 @@
+# core/vector_index.py
+
+import glob
+import json
+import logging
+import math
+import os
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from config import EMBEDDING_MODEL, EMBEDDING_HASH_DIMENSIONS, EMBEDDING_CHUNK_CHARS
+from utils.markdown_helper import content_hash, split_markdown_sections
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+RESUME_DOCUMENT_ID = "resume"
+DOCUMENT_KINDS = ("job", "resume")
+
+
+def chunk_text(text: str, max_chars: int = EMBEDDING_CHUNK_CHARS) -> List[str]:
+    # Chunks never straddle a "##" section, so a resume's skills and experience are matched separately
+    chunks = []
+    for _, block in split_markdown_sections(text):
+        current = ""
+        for paragraph in re.split(r"\n\s*\n", block):
+            paragraph = paragraph.strip()
+            while len(paragraph) > max_chars:
+                cut = paragraph.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(paragraph[:cut])
+                paragraph = paragraph[cut:].strip()
+            if not paragraph:
+                continue
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+class HashingEmbedder:
+    """Signed feature hashing of unigrams and bigrams; IDF weights are applied by the index at query time."""
+
+    uses_idf = True
+
+    def __init__(self, dimensions: int = EMBEDDING_HASH_DIMENSIONS):
+        self.dimensions = dimensions
+        self.name = f"hashing-{dimensions}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN.findall(text.lower())
+            features = Counter(tokens)
+            features.update(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+            for feature, count in features.items():
+                # crc32 rather than hash() so vectors stay stable across processes
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if (digest // self.dimensions) & 1 else -1.0
+                vectors[row, digest % self.dimensions] += sign * (1.0 + math.log(count))
+        return vectors
+
+
+class SentenceTransformerEmbedder:
+    """Dense embeddings from a locally available sentence-transformers model."""
+
+    uses_idf = False
+
+    def __init__(self, model_name: str):
+        self.model = SentenceTransformer(model_name)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+        self.name = f"sentence-transformers-{model_name}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        return np.asarray(self.model.encode(list(texts), normalize_embeddings=True), dtype=np.float32)
+
+
+def get_default_embedder():
+    if EMBEDDING_MODEL and SentenceTransformer is not None:
+        try:
+            return SentenceTransformerEmbedder(EMBEDDING_MODEL)
+        except Exception as e:
+            logger.warning("Falling back to hashed TF-IDF embeddings: %s", e)
+    return HashingEmbedder()
+
+
+class VectorIndex:
+    """Chunk vectors for resumes and job descriptions in one matrix, scored against a query in a single pass."""
+
+    def __init__(self, directory: Optional[str] = None, embedder=None, chunk_chars: int = EMBEDDING_CHUNK_CHARS):
+        self.directory = directory
+        self.embedder = embedder if embedder is not None else get_default_embedder()
+        self.chunk_chars = chunk_chars
+        self._lock = threading.RLock()
+        # Number of the last saved matrix file; each save writes a new one so index.json never points at a
+        # matrix it was not written with
+        self._generation = 0
+        self._reset()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def _reset(self) -> None:
+        self._matrix = np.zeros((0, self.embedder.dimensions), dtype=np.float32)
+        self._size = 0
+        # Per row: owning document slot (-1 once removed) and document kind
+        self._row_slots = np.zeros(0, dtype=np.int32)
+        self._row_kinds = np.zeros(0, dtype=np.int8)
+        self._slot_ids: List[Optional[str]] = []
+        self._documents: Dict[str, Dict] = {}
+        # Number of live rows with a non-zero value in each dimension, for IDF
+        self._document_frequency = np.zeros(self.embedder.dimensions, dtype=np.float64)
+        self._live_rows = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def add(self, doc_id: str, text: str, kind: str = "job") -> bool:
+        # Returns False when the document is already indexed with the same content
+        key = content_hash(text)
+        with self._lock:
+            document = self._documents.get(doc_id)
+            if document is not None and document["hash"] == key and document["kind"] == kind:
+                return False
+        chunks = chunk_text(text, self.chunk_chars) or [""]
+        vectors = self.embedder.embed(chunks)
+        with self._lock:
+            self.remove(doc_id)
+            start = self._append_rows(vectors, len(self._slot_ids), DOCUMENT_KINDS.index(kind))
+            self._slot_ids.append(doc_id)
+            self._documents[doc_id] = {"hash": key, "kind": kind, "slot": len(self._slot_ids) - 1,
+                                       "rows": list(range(start, start + len(vectors)))}
+        return True
+
+    def remove(self, doc_id: str) -> None:
+        with self._lock:
+            document = self._documents.pop(doc_id, None)
+            if document is None:
+                return
+            rows = document["rows"]
+            self._row_slots[rows] = -1
+            self._slot_ids[document["slot"]] = None
+            self._document_frequency -= (self._matrix[rows] != 0).sum(axis=0)
+            self._live_rows -= len(rows)
+
+    def sync(self, documents: Dict[str, str], kind: str = "job") -> int:
+        # Brings one kind of document in line with the given texts; unchanged ones are not re-embedded
+        with self._lock:
+            stale = [doc_id for doc_id, document in self._documents.items()
+                     if document["kind"] == kind and doc_id not in documents]
+        for doc_id in stale:
+            self.remove(doc_id)
+        return sum(self.add(doc_id, text, kind) for doc_id, text in documents.items())
+
+    def _append_rows(self, vectors: np.ndarray, slot: int, kind_code: int) -> int:
+        needed = self._size + len(vectors)
+        if needed > len(self._matrix) or not self._matrix.flags.writeable:
+            # Grows geometrically; this also turns a read-only memory-mapped matrix into an in-memory one
+            capacity = max(needed, 2 * len(self._matrix), 64)
+            matrix = np.zeros((capacity, self.embedder.dimensions), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            row_slots = np.full(capacity, -1, dtype=np.int32)
+            row_slots[:self._size] = self._row_slots[:self._size]
+            row_kinds = np.zeros(capacity, dtype=np.int8)
+            row_kinds[:self._size] = self._row_kinds[:self._size]
+            self._matrix, self._row_slots, self._row_kinds = matrix, row_slots, row_kinds
+        start = self._size
+        self._matrix[start:needed] = vectors
+        self._row_slots[start:needed] = slot
+        self._row_kinds[start:needed] = kind_code
+        self._size = needed
+        self._document_frequency += (vectors != 0).sum(axis=0)
+        self._live_rows += len(vectors)
+        return start
+
+    def _weights(self) -> Optional[np.ndarray]:
+        if not self.embedder.uses_idf:
+            return None
+        return (np.log((1.0 + self._live_rows) / (1.0 + self._document_frequency)) + 1.0).astype(np.float32)
+
+    def _row_scores(self, query_vectors: np.ndarray, kind: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        # Cosine similarity of every live row against every query chunk, keeping each row's best match
+        rows = self._row_slots[:self._size] >= 0
+        if kind is not None:
+            rows &= self._row_kinds[:self._size] == DOCUMENT_KINDS.index(kind)
+        row_indexes = np.flatnonzero(rows)
+        matrix = self._matrix[row_indexes]
+        weights = self._weights()
+        if weights is not None:
+            matrix = matrix * weights
+            query_vectors = query_vectors * weights
+        matrix_norms = np.linalg.norm(matrix, axis=1)
+        query_norms = np.linalg.norm(query_vectors, axis=1)
+        matrix_norms[matrix_norms == 0] = 1.0
+        query_norms[query_norms == 0] = 1.0
+        similarities = (matrix @ query_vectors.T) / np.outer(matrix_norms, query_norms)
+        return row_indexes, similarities.max(axis=1) if similarities.size else np.zeros(len(row_indexes), dtype=np.float32)
+
+    def _document_scores(self, query_vectors: np.ndarray, kind: Optional[str], exclude: Optional[str] = None) -> Dict[str, float]:
+        with self._lock:
+            if not self._documents or not len(query_vectors):
+                return {}
+            row_indexes, row_scores = self._row_scores(query_vectors, kind)
+            # A document scores as its best-matching chunk
+            slot_scores = np.full(len(self._slot_ids), -np.inf, dtype=np.float32)
+            np.maximum.at(slot_scores, self._row_slots[row_indexes], row_scores)
+            return {self._slot_ids[slot]: float(slot_scores[slot]) for slot in np.flatnonzero(np.isfinite(slot_scores))
+                    if self._slot_ids[slot] is not None and self._slot_ids[slot] != exclude}
+
+    def _query_vectors(self, text: str) -> np.ndarray:
+        return self.embedder.embed(chunk_text(text, self.chunk_chars) or [text])
+
+    def rank(self, text: str, kind: Optional[str] = "job") -> List[Tuple[str, float]]:
+        scores = self._document_scores(self._query_vectors(text), kind)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def search(self, text: str, k: int = 5, kind: Optional[str] = "job") -> List[Tuple[str, float]]:
+        return self.rank(text, kind)[:k]
+
+    def similar_to(self, doc_id: str, k: int = 5, kind: Optional[str] = "job") -> List[Tuple[str, float]]:
+        with self._lock:
+            document = self._documents.get(doc_id)
+            if document is None:
+                return []
+            query_vectors = np.array(self._matrix[document["rows"]])
+        scores = self._document_scores(query_vectors, kind, exclude=doc_id)
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def save(self) -> None:
+        if not self.directory:
+            return
+        with self._lock:
+            self._compact()
+            self._generation += 1
+            matrix_name = f"vectors-{self._generation}.npy"
+            meta = {
+                "embedder": self.embedder.name,
+                "generation": self._generation,
+                "matrix": matrix_name,
+                "rows": self._size,
+                "documents": {doc_id: {"hash": document["hash"], "kind": document["kind"],
+                                       "rows": [document["rows"][0], document["rows"][-1] + 1]}
+                              for doc_id, document in self._documents.items()},
+            }
+            # The matrix goes to a new file the old metadata does not reference; replacing the metadata file
+            # is the commit point, after which older matrices are no longer needed
+            tmp_matrix = self._path("vectors.tmp.npy")
+            np.save(tmp_matrix, self._matrix[:self._size])
+            os.replace(tmp_matrix, self._path(matrix_name))
+            tmp_meta = self._path("index.json.tmp")
+            with open(tmp_meta, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta, self._path("index.json"))
+            for path in glob.glob(self._path("vectors*.npy")):
+                if os.path.basename(path) != matrix_name:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        # Still memory-mapped on platforms that lock mapped files; removed by a later save
+                        pass
+
+    def _compact(self) -> None:
+        # Drops removed rows and lays each document's rows out contiguously
+        if self._live_rows == self._size and len(self._slot_ids) == len(self._documents):
+            return
+        documents = list(self._documents.items())
+        rows = [row for _, document in documents for row in document["rows"]]
+        self._matrix = np.array(self._matrix[rows])
+        self._row_kinds = np.array(self._row_kinds[rows])
+        self._row_slots = np.zeros(len(rows), dtype=np.int32)
+        self._slot_ids = []
+        start = 0
+        for slot, (doc_id, document) in enumerate(documents):
+            count = len(document["rows"])
+            self._row_slots[start:start + count] = slot
+            document["rows"] = list(range(start, start + count))
+            document["slot"] = slot
+            self._slot_ids.append(doc_id)
+            start += count
+        self._size = self._live_rows = len(rows)
+
+    def _load(self) -> None:
+        meta_path = self._path("index.json")
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path, "r") as f:
+            meta = json.load(f)
+        self._generation = meta.get("generation", 0)
+        # Indexes saved before matrix files were versioned use a fixed name
+        matrix_path = self._path(meta.get("matrix", "vectors.npy"))
+        if meta.get("embedder") != self.embedder.name or not os.path.exists(matrix_path):
+            # Vectors from a different embedder are not comparable; documents are re-embedded on the next sync
+            return
+        # Memory-mapped read-only; the first write copies it into memory
+        matrix = np.load(matrix_path, mmap_mode="r")
+        expected_rows = meta.get("rows", max((document["rows"][1] for document in meta["documents"].values()), default=0))
+        if len(matrix) != expected_rows or matrix.shape[1:] != (self.embedder.dimensions,):
+            logger.warning("Vector index matrix does not match index.json; documents will be re-embedded")
+            return
+        with self._lock:
+            self._reset()
+            self._matrix = matrix
+            self._size = self._live_rows = len(matrix)
+            self._row_slots = np.zeros(len(matrix), dtype=np.int32)
+            self._row_kinds = np.zeros(len(matrix), dtype=np.int8)
+            for slot, (doc_id, document) in enumerate(meta["documents"].items()):
+                start, end = document["rows"]
+                self._row_slots[start:end] = slot
+                self._row_kinds[start:end] = DOCUMENT_KINDS.index(document["kind"])
+                self._slot_ids.append(doc_id)
+                self._documents[doc_id] = {"hash": document["hash"], "kind": document["kind"], "slot": slot,
+                                           "rows": list(range(start, end))}
+            self._document_frequency = (matrix != 0).sum(axis=0).astype(np.float64)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
@@ -49,3 +49,468 @@ Provide helpful, professional advice based on the user's questions or requests.
 User: {user_input}
 AI Assistant:
 """
+
+RESUME_CHAT_SYSTEM_PROMPT = """You are an AI assistant specializing in resume and job application advice. You have access to the user's current resume:
+
+{resume_content}
+
+Provide helpful, professional advice based on the user's questions or requests. If you need more information, ask clarifying questions."""
+
+RESUME_EDIT_PROMPT = """You are editing the user's master resume. The current version is:
+
+{current_resume}
+
+The user has requested the following change:
+
+{edit_request}
+
+Implement this change while maintaining the overall structure and formatting of the resume. Provide your response in the following format:
+
+1. Updated Resume:
+[Provide the complete updated resume in Markdown]
+
+2. Explanation of Changes:
+[Explain what was changed and why]
+
+3. Potential Impact:
+[Discuss how this change might affect the overall resume and job applications]
+
+4. Additional Suggestions:
+[Offer any related improvements or cautions]"""
+
+FORMAT_RESUME_PROMPT = """Format and improve the following resume content:
+
+{resume_content}
+
+Please format the resume using the following guidelines:
+1. Use Markdown formatting throughout.
+2. Start with the candidate's name as a top-level header (# Name).
+# [Candidate Name]
+3. Structure the resume with the following sections, using second-level headers:
+## Contact Information
+## Professional Summary
+## Work Experience
+## Education
+## Skills
+4. Under each section header, use the following formatting:
+Contact Information:
+
+Use a single line for each piece of contact information.
+Include only available information; do not leave blank lines.
+Format:
+- Email: [email address]
+- Phone: [phone number]
+- Location: [city, state/province, country]
+- LinkedIn: [profile URL] (if available)
+Professional Summary:
+
+Write a brief paragraph (3-5 sentences) summarizing key qualifications and career objectives.
+Use italics for emphasis on key points:
+*[Key skill or qualification]*
+Work Experience:
+
+List each job in reverse chronological order.
+Use third-level headers (###) for job titles and companies:
+Copy### [Job Title] at [Company Name]
+
+Include employment dates on the same line as the job title:
+Copy### [Job Title] at [Company Name] (Month Year - Month Year or Present)
+
+Use bullet points (-) for responsibilities and achievements.
+Start each bullet point with a strong action verb.
+Highlight key achievements or metrics in bold:
+Copy- Increased sales by **25%** through implementation of new marketing strategies
+
+
+Education:
+
+List degrees in reverse chronological order.
+Use the following format:
+Copy- [Degree Name], [Major] - [University Name], [Graduation Year]
+
+Include any relevant coursework, honors, or GPA if noteworthy:
+Copy- Relevant coursework: [Course names]
+- Honors: [Honor or award names]
+- GPA: [X.XX] (if 3.5 or above)
+
+
+Skills:
+
+Group skills into categories (e.g., Technical Skills, Soft Skills, Languages).
+Use a bullet point list for each category:
+Copy- Technical Skills: [Skill 1], [Skill 2], [Skill 3]
+- Soft Skills: [Skill 1], [Skill 2], [Skill 3]
+- Languages: [Language 1] (Fluent), [Language 2] (Intermediate)
+5. Ensure consistent spacing:
+Add a blank line before and after each section header.
+Add a blank line between each job entry in the Work Experience section.
+6. If a section has no content, omit it entirely rather than leaving it empty.
+7. Use consistent capitalization for job titles, degree names, and skill categories.
+8. Limit the use of special characters and formatting to maintain a clean, professional appearance.
+
+Provide the formatted and improved resume:"""
+
+JOB_DESCRIPTION_ANALYSIS_PROMPT = "Analyze the following job description and compare it to the resume:\n\nJob Description:\n{job_description}\n\nResume:\n{resume}\n\nProvide analysis in the following categories:\n1. Key Requirements\n2. Matching Skills\n3. Missing Skills\n4. Tailoring Suggestions"
+
+APPLICATIONS_OVERVIEW_PROMPT = "Generate a job search overview based on the following information:\n\nJob Applications:\n{applications}\n\nResume:\n{resume}\n\nProvide an overview including:\n1. Summary of active applications\n2. Overall application success rate\n3. Suggestions for improvement\n4. Next steps in the job search"
+
+# Captain prompts
+
+JOB_SEARCH_OVERVIEW_PROMPT = """Provide a comprehensive overview of the user's current job search status. Use the following information:
+
+Active Job Applications:
+{active_applications}
+
+Recent Resume Changes:
+{recent_resume_changes}
+
+Job Market Trends:
+{job_market_trends}
+
+Overall Application Success Rate:
+{success_rate}
+
+Analyze this information and provide:
+1. Summary of active applications and their statuses
+2. Insights on application success rate and areas for improvement
+3. Suggestions for new job opportunities based on the user's profile
+4. Advice on resume improvements or skills to develop
+5. Motivational message and next steps for the user's job search
+6. Gamification update (e.g., "Job Search Level" or "Application Streaks")
+
+Your response should be strategic, insightful, and actionable, with a focus on motivation and progress."""
+
+WEEKEND_PROJECT_PROMPT = """Based on the user's current job applications, resume, and market trends, suggest a weekend project that would enhance their skills and job prospects. Consider the following information:
+
+Active Job Applications:
+{active_applications}
+
+Recent Resume Changes:
+{recent_resume_changes}
+
+Job Market Trends:
+{job_market_trends}
+
+Skill Gaps Identified:
+{skill_gaps}
+
+Provide a weekend project suggestion in the following format:
+1. Project Title:
+2. Skills Developed:
+3. Relevance to Job Search:
+4. Project Description:
+5. Expected Outcomes:
+6. How to Showcase in Applications/Interviews:
+7. Resources Needed:
+8. Estimated Time Commitment:"""
+
+FIRST_DAY_SIMULATION_PROMPT = """Based on the job description and company information for the {job_title} position at {company}, create a simulation of what the user's first day might look like. Include:
+
+1. Arrival and Onboarding Process:
+2. Key People to Meet:
+3. Main Tasks and Responsibilities:
+4. Potential Challenges and How to Address Them:
+5. Tips for Making a Great First Impression:
+6. What to Prepare Before the First Day:
+7. Expected Outcomes from the First Day:
+8. How This Experience Aligns with Career Goals:
+
+Use the following job details to inform your simulation:
+{job_description_summary}
+{company_culture_info}"""
+
+WEEKLY_GOALS_PROMPT = """Based on the current job search status, generate a list of weekly goals:
+
+Job Applications:
+{applications}
+
+Resume:
+{resume}
+
+Please provide a list of 5 specific, actionable weekly goals to improve the job search process.
+
+Weekly goals:"""
+
+MOTIVATION_PROMPT = """Provide a motivational message based on the following job search status:
+
+Number of Applications: {num_applications}
+Application Success Rate: {success_rate:.2%}
+Applications by Status: {status_counts}
+Average Days to Hear Back: {average_response_days}
+
+Please give an encouraging and motivational message to keep the job seeker inspired and focused on their goals.
+
+Motivational message:"""
+
+SKILL_IMPROVEMENT_PROMPT = """Based on the current job applications and resume, suggest skills to improve:
+
+Job Applications:
+{applications}
+
+Resume:
+{resume}
+
+Please provide suggestions for skill improvement in the following categories:
+1. Technical Skills
+2. Soft Skills
+3. Industry Knowledge
+
+For each category, list 3-5 specific skills or areas of knowledge to focus on.
+
+Skill improvement suggestions:"""
+
+LONG_TERM_CAREER_PLAN_PROMPT = """Based on the current resume and job applications, generate a long-term career plan:
+
+Resume:
+{resume}
+
+Job Applications:
+{applications}
+
+Please provide a 5-year career plan, including:
+1. Career goals
+2. Skill development roadmap
+3. Potential job positions to target
+4. Industry trends to watch
+5. Networking and personal branding strategies
+
+Long-term career plan:"""
+
+# Job opportunity prompts
+
+NAVIGATOR_NAME_PROMPT = "Generate a unique and memorable name for an AI assistant specializing in the {job_title} position at {company}. The name should be professional yet friendly, and relate to the job or industry."
+
+NAVIGATOR_SYSTEM_PROMPT = """You are {navigator_name}, an AI assistant specializing in the {job_title} position at {company}. Your role is to guide the user through their application process, provide insights about the job and company, and optimize their application strategy.
+
+Key Responsibilities:
+1. Analyze job descriptions and align with user's resume
+2. Suggest resume enhancements to the Resume Tab
+3. Provide application status updates and next steps
+4. Offer interview preparation advice and potential questions
+5. Share insights about the company culture and job responsibilities
+6. Identify skill gaps and suggest improvement strategies
+
+You are part of the CAPTAIN system. Collaborate with the Resume Tab and Captain for a comprehensive job search strategy. Always maintain a professional, supportive, and encouraging tone."""
+
+JOB_ANALYSIS_PROMPT = """Analyze the following job description for the {job_title} position at {company}. Identify key requirements, skills, and qualifications. Then, compare these to the user's master resume and suggest specific tailoring strategies.
+
+Job Description:
+{job_description}
+
+Master Resume Summary:
+{resume_summary}
+
+Respond only with a JSON object in which every value is a list of short strings:
+{{"key_requirements": [...], "essential_skills": [...], "desired_qualifications": [...], "resume_tailoring_suggestions": [...], "skill_gap_analysis": [...], "application_strategy_recommendations": [...]}}"""
+
+STATUS_UPDATE_PROMPT = """The user has updated their application status for the {job_title} position at {company}. The new status is: {new_status}
+
+Previous status: {previous_status}
+
+Based on this status change, respond only with a JSON object with these string fields:
+{{"encouragement": "<congratulations or encouragement message>", "next_steps": "<suggested next steps>", "challenges": "<potential challenges to prepare for>", "questions": "<questions to ask the user about their experience so far>", "reminders": "<important information or documents they might need next>", "standout_advice": "<how to stand out in the next stage of the process>"}}"""
+
+SKILL_SUGGESTION_PROMPT = """Based on the job description for {job_title} at {company}, identify skills or experiences from the user's master resume that should be highlighted or added. If there are gaps, suggest potential weekend projects or learning opportunities.
+
+Job Description Key Points:
+{job_description_summary}
+
+Current Resume Skills:
+{current_resume_skills}
+
+Respond only with a JSON object in which every value is a list of short strings:
+{{"skills_to_highlight": [...], "experiences_to_emphasize": [...], "suggested_additions": [...], "weekend_projects": [...], "learning_opportunities": [...], "alignment_with_requirements": [...]}}"""
+
+NETWORKING_STRATEGIES_PROMPT = """Suggest networking strategies for the following job application:
+
+Position: {job_title}
+Company: {company}
+
+Please provide a list of networking strategies that could help with this job application. Consider both online and offline networking opportunities."""
+
+APPLICATION_STRATEGY_PROMPT = """Generate an application strategy for the following job:
+
+Position: {job_title}
+Company: {company}
+Job Description: {job_description}
+
+Candidate's Resume:
+{resume}
+
+Please provide a comprehensive application strategy, including:
+1. Key points to emphasize in the application
+2. Suggested changes or additions to the resume
+3. Cover letter writing tips
+4. Preparation for potential interview questions
+5. Research to conduct about the company
+6. Any additional steps to stand out as a candidate
+
+Your strategy:"""
+
+INTERVIEW_QUESTIONS_PROMPT = """Generate a set of potential interview questions and suggested answers for the following job:
+
+Position: {job_title}
+Company: {company}
+Job Description: {job_description}
+
+Candidate's Resume:
+{resume}
+
+Please provide 5 likely interview questions and suggested answers. Respond only with a JSON object of this form:
+{{"questions": [{{"question": "...", "suggested_answer": "..."}}]}}"""
+
+COMPANY_CULTURE_PROMPT = """Analyze the company culture for {company} based on the following job description:
+
+{job_description}
+
+Respond only with a JSON object with a string insight for each category:
+{{"work_environment": "...", "company_values": "...", "team_dynamics": "...", "growth_opportunities": "...", "work_life_balance": "..."}}"""
+
+RESUME_PATCH_PROMPT = """You are editing the user's master resume. The current version is:
+
+{current_resume}
+
+The resume is divided into these addressable sections ("##" sections, and "###" entries written as "Section/Entry"):
+{section_paths}
+
+The user has requested the following change:
+
+{edit_request}
+
+Do not rewrite the resume. Respond only with a JSON object describing the smallest set of edits that implements the change:
+{{"operations": [...], "explanation": "<what was changed and why>"}}
+
+Each operation is one of:
+- {{"op": "replace_text", "section": "<section path>", "find": "<exact text that occurs once in that section>", "replace": "<new text>"}}
+- {{"op": "replace", "section": "<section path>", "content": "<full new Markdown for that section, including its heading>"}}
+- {{"op": "insert_after", "section": "<section path>", "content": "<new Markdown block, including its heading>"}}
+- {{"op": "delete", "section": "<section path>"}}
+
+Prefer replace_text for changes within a line or bullet. Keep the existing Markdown structure."""
+
+RESUME_TAILOR_PROMPT = """You are tailoring the user's resume for one job application. These are the resume sections that may be tailored:
+
+{resume_sections}
+
+Addressable sections ("##" sections, and "###" entries written as "Section/Entry"):
+{section_paths}
+
+The job is {job_title} at {company}. Job description:
+
+{job_description}
+
+Reorder, reword and emphasize the existing material so the most relevant experience and skills for this job stand out, using the job's own terminology where it truthfully applies. Never invent employers, titles, dates, metrics or skills the resume does not support.
+
+Respond only with a JSON object describing the edits:
+{{"operations": [...], "explanation": "<what was tailored and why>"}}
+
+Each operation is one of:
+- {{"op": "replace_text", "section": "<section path>", "find": "<exact text that occurs once in that section>", "replace": "<new text>"}}
+- {{"op": "replace", "section": "<section path>", "content": "<full new Markdown for that section, including its heading>"}}
+- {{"op": "insert_after", "section": "<section path>", "content": "<new Markdown block, including its heading>"}}
+- {{"op": "delete", "section": "<section path>"}}
+
+Keep the existing Markdown structure."""
+
+FORMAT_RESUME_SECTION_PROMPT = """Format the "{section_title}" section of a resume as Markdown. Return only the section body, without the "## {section_title}" header and without any commentary.
+
+Guidelines:
+- Work Experience: one "### [Job Title] at [Company Name] (Month Year - Month Year or Present)" header per job, newest first, followed by "-" bullet points that start with an action verb; put metrics in bold.
+- Education: one "- [Degree Name], [Major] - [University Name], [Graduation Year]" line per degree, followed by any coursework, honors or GPA as "-" bullet points.
+- Skills: one "- [Category]: [Skill 1], [Skill 2]" line per category (e.g. Technical Skills, Soft Skills, Languages).
+- Any other section: "-" bullet points, with "###" headers for named entries.
+Keep every fact from the original text and do not invent new ones.
+
+Section text:
+{section_content}
+
+Formatted section:"""
+
+SUMMARIZE_RESUME_SECTION_PROMPT = """Summarize the following resume section in no more than {max_length} characters. Keep job titles, company names, dates, metrics and named skills; drop filler words.
+
+Section:
+{section}
+
+Summary:"""
+
+SUMMARIZE_CONVERSATION_PROMPT = """Update the running summary of a conversation between the user and their job search assistant with the turns below. Keep facts, decisions, preferences and open questions; drop pleasantries. Use no more than {max_tokens} tokens.
+
+Current summary:
+{summary}
+
+New turns:
+{transcript}
+
+Updated summary:"""
+
+REPAIR_JSON_PROMPT = """The following response was supposed to be a JSON value matching this JSON Schema:
+{schema}
+
+Response:
+{response}
+
+It could not be used because: {error}
+
+Respond only with the corrected JSON value. Keep the original content; fix only the structure."""
+
+# Registry of every prompt the application uses, keyed by the name passed to AIManager.generate_response
+PROMPT_TEMPLATES = {
+    "resume_analysis": RESUME_ANALYSIS_PROMPT,
+    "resume_improvements": RESUME_IMPROVEMENT_PROMPT,
+    "cover_letter": COVER_LETTER_PROMPT,
+    "resume_chat": RESUME_CHAT_PROMPT,
+    "resume_chat_system": RESUME_CHAT_SYSTEM_PROMPT,
+    "resume_edit": RESUME_EDIT_PROMPT,
+    "resume_patch": RESUME_PATCH_PROMPT,
+    "resume_tailor": RESUME_TAILOR_PROMPT,
+    "format_resume": FORMAT_RESUME_PROMPT,
+    "format_resume_section": FORMAT_RESUME_SECTION_PROMPT,
+    "job_description_analysis": JOB_DESCRIPTION_ANALYSIS_PROMPT,
+    "applications_overview": APPLICATIONS_OVERVIEW_PROMPT,
+    "job_search_overview": JOB_SEARCH_OVERVIEW_PROMPT,
+    "weekend_project": WEEKEND_PROJECT_PROMPT,
+    "first_day_simulation": FIRST_DAY_SIMULATION_PROMPT,
+    "weekly_goals": WEEKLY_GOALS_PROMPT,
+    "motivation": MOTIVATION_PROMPT,
+    "skill_improvement": SKILL_IMPROVEMENT_PROMPT,
+    "long_term_career_plan": LONG_TERM_CAREER_PLAN_PROMPT,
+    "navigator_name": NAVIGATOR_NAME_PROMPT,
+    "navigator_system": NAVIGATOR_SYSTEM_PROMPT,
+    "job_analysis": JOB_ANALYSIS_PROMPT,
+    "status_update": STATUS_UPDATE_PROMPT,
+    "skill_suggestion": SKILL_SUGGESTION_PROMPT,
+    "networking_strategies": NETWORKING_STRATEGIES_PROMPT,
+    "application_strategy": APPLICATION_STRATEGY_PROMPT,
+    "interview_questions": INTERVIEW_QUESTIONS_PROMPT,
+    "company_culture": COMPANY_CULTURE_PROMPT,
+    "summarize_resume_section": SUMMARIZE_RESUME_SECTION_PROMPT,
+    "summarize_conversation": SUMMARIZE_CONVERSATION_PROMPT,
+    "repair_json": REPAIR_JSON_PROMPT,
+}
+
+
+def _string_lists(*keys):
+    return {"type": "object", "required": list(keys),
+            "properties": {key: {"type": "array", "items": {"type": "string"}} for key in keys}}
+
+
+def _strings(*keys):
+    return {"type": "object", "required": list(keys), "properties": {key: {"type": "string"} for key in keys}}
+
+
+# JSON Schemas for prompts whose responses are parsed; these go through AIManager.generate_structured
+OUTPUT_SCHEMAS = {
+    "job_analysis": _string_lists("key_requirements", "essential_skills", "desired_qualifications",
+                                  "resume_tailoring_suggestions", "skill_gap_analysis",
+                                  "application_strategy_recommendations"),
+    "status_update": _strings("encouragement", "next_steps", "challenges", "questions", "reminders", "standout_advice"),
+    "skill_suggestion": _string_lists("skills_to_highlight", "experiences_to_emphasize", "suggested_additions",
+                                      "weekend_projects", "learning_opportunities", "alignment_with_requirements"),
+    "interview_questions": {
+        "type": "object",
+        "required": ["questions"],
+        "properties": {"questions": {"type": "array", "items": _strings("question", "suggested_answer")}},
+    },
+    "company_culture": _strings("work_environment", "company_values", "team_dynamics", "growth_opportunities",
+                                "work_life_balance"),
+}
@@ -0,0 +1,6 @@
+# tests/conftest.py
+
+import os
+
+# The LLM client is built at import time and refuses to start without a key; tests never reach the real API
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
@@ -0,0 +1,121 @@
+# tests/fake_llm_server.py
+#
+# Local stand-in for the OpenAI chat completions endpoint, for exercising the LLM
+# transport (retries, 429 handling, timeouts, the circuit breaker) without a network.
+#
+#   with FakeLLMServer(reply="Hello") as server:
+#       server.fail_next(2, status=429, retry_after=0.1)
+#       transport = LLMTransport(base_url=server.base_url)
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+class FakeLLMServer:
+    """Serves /v1/chat/completions (plain and streamed) with scripted failures and latency."""
+
+    def __init__(self, reply: Union[str, Callable[[List[Dict[str, Any]]], str]] = "OK", latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        self.reply = reply
+        self.latency = latency
+        self.requests: List[Dict[str, Any]] = []
+        self._failures: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def fail_next(self, count: int = 1, status: int = 500, retry_after: Optional[float] = None, delay: float = 0.0) -> None:
+        # The next count requests get this status (after delay seconds); later requests succeed again
+        with self._lock:
+            self._failures.extend({"status": status, "retry_after": retry_after, "delay": delay} for _ in range(count))
+
+    def start(self) -> "FakeLLMServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-llm-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _next_failure(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._failures.pop(0) if self._failures else None
+
+    def _reply_for(self, messages: List[Dict[str, Any]]) -> str:
+        return self.reply(messages) if callable(self.reply) else self.reply
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                with server._lock:
+                    server.requests.append(body)
+                failure = server._next_failure()
+                if failure is not None:
+                    time.sleep(failure["delay"])
+                    headers = {"retry-after": str(failure["retry_after"])} if failure["retry_after"] is not None else {}
+                    return self._send_json(failure["status"], {"error": {"message": "Scripted failure",
+                                                                         "type": "fake_error"}}, headers)
+                if not self.path.endswith("/chat/completions"):
+                    return self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                time.sleep(server.latency)
+                text = server._reply_for(body.get("messages", []))
+                if body.get("stream"):
+                    return self._send_stream(body.get("model", "fake"), text)
+                self._send_json(200, {
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                })
+
+            def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_stream(self, model: str, text: str):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                words = text.split(" ")
+                for i, word in enumerate(words):
+                    delta = {"content": word + (" " if i < len(words) - 1 else "")}
+                    if i == 0:
+                        delta["role"] = "assistant"
+                    chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.close_connection = True
+
+        return Handler
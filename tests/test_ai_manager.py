@@ -0,0 +1,66 @@
+# tests/test_ai_manager.py
+
+import pytest
+from core.ai_manager import AIManager
+from core.llm_transport import LLMTransport
+from core.response_cache import ResponseCache
+from tests.fake_llm_server import FakeLLMServer
+
+REPLY = "Reach out to alumni at Acme"
+CONTEXT = {"job_title": "Engineer", "company": "Acme"}
+
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(reply=REPLY) as server:
+        yield server
+
+
+@pytest.fixture
+def ai_manager(server, tmp_path):
+    transport = LLMTransport("fake-model", base_url=server.base_url, requests_per_minute=6000, tokens_per_minute=10 ** 7,
+                             timeout=10, request_timeout=5, backoff_seconds=0.01, max_backoff_seconds=0.05)
+    return AIManager(response_cache=ResponseCache(str(tmp_path / "cache")), transport=transport)
+
+
+def test_stream_response_caches_the_reply_only_once_complete(ai_manager, server):
+    cache_key = ai_manager.get_cache_key("networking_strategies", CONTEXT)
+    stream = ai_manager.stream_response("networking_strategies", CONTEXT)
+    chunks = [next(stream)]
+    assert ai_manager.response_cache.get(cache_key) is None
+    chunks.extend(stream)
+    assert len(chunks) > 1
+    assert "".join(chunks) == REPLY
+    assert ai_manager.response_cache.get(cache_key) == REPLY
+    # The next stream is served from the cache in one piece
+    assert list(ai_manager.stream_response("networking_strategies", CONTEXT)) == [REPLY]
+    assert len(server.requests) == 1
+
+
+def test_abandoned_stream_response_is_not_cached(ai_manager):
+    stream = ai_manager.stream_response("networking_strategies", CONTEXT)
+    next(stream)
+    stream.close()
+    assert ai_manager.response_cache.get(ai_manager.get_cache_key("networking_strategies", CONTEXT)) is None
+
+
+def test_stream_chat_records_the_turn_only_once_complete(ai_manager, server):
+    stream = ai_manager.stream_chat("Who should I contact?", scope="job:acme")
+    chunks = [next(stream)]
+    assert ai_manager.conversations.messages("job:acme") == []
+    chunks.extend(stream)
+    assert "".join(chunks) == REPLY
+    assert [message.content for message in ai_manager.conversations.messages("job:acme")] == ["Who should I contact?", REPLY]
+
+    # The recorded turn is sent with the next message of the same scope only
+    list(ai_manager.stream_chat("And then?", scope="job:acme"))
+    assert [message["content"] for message in server.requests[-1]["messages"]] == ["Who should I contact?", REPLY, "And then?"]
+    list(ai_manager.stream_chat("Hi", scope="captain"))
+    assert [message["content"] for message in server.requests[-1]["messages"]] == ["Hi"]
+
+
+def test_abandoned_stream_chat_leaves_no_half_turn(ai_manager):
+    stream = ai_manager.stream_chat("Who should I contact?", scope="job:acme")
+    next(stream)
+    stream.close()
+    assert ai_manager.conversations.messages("job:acme") == []
@@ -0,0 +1,88 @@
+# tests/test_application_index.py
+
+import random
+from core.application_index import ApplicationIndex
+from core.context_manager import CAPTAINContextManager
+
+STATUSES = ["Not Started", "Applied", "Interview Scheduled", "Rejected"]
+COMPANIES = ["Acme", "Globex", "Initech"]
+
+
+def random_applications(count=200, seed=7):
+    rng = random.Random(seed)
+    return {f"job{i:03d}": {"status": rng.choice(STATUSES), "company": rng.choice(COMPANIES), "position": "Engineer",
+                            "added": rng.uniform(0, 1000)} for i in range(count)}
+
+
+def build_index(applications):
+    index = ApplicationIndex()
+    for job_id, data in applications.items():
+        index.add(job_id, data, data["added"])
+    return index
+
+
+def test_select_matches_a_full_scan():
+    applications = random_applications()
+    index = build_index(applications)
+    result = index.select({"status": ["Applied", "Rejected"], "company": " acme "}, {"added_at": (100.0, 600.0)})
+    expected = {job_id for job_id, data in applications.items()
+                if data["status"] in ("Applied", "Rejected") and data["company"] == "Acme" and 100 <= data["added"] <= 600}
+    assert result == expected
+
+
+def test_select_without_filters_returns_none():
+    index = build_index(random_applications(10))
+    assert index.select({"status": None}, {"added_at": (None, None)}) is None
+
+
+def test_updates_move_entries_between_index_values():
+    index = build_index({"a": {"status": "Applied", "company": "Acme", "added": 1.0}})
+    index.update("a", {"status": "Rejected", "company": "Acme"}, 5.0)
+    assert index.select({"status": "Applied"}, {}) == set()
+    assert index.select({"status": "Rejected"}, {}) == {"a"}
+    assert index.get_timestamp("updated_at", "a") == 5.0
+    assert index.values("status") == ["rejected"]
+
+
+def test_remove_clears_every_index():
+    index = build_index(random_applications(5))
+    index.remove("job000")
+    assert "job000" not in index
+    assert "job000" not in list(index.iter_by_time("added_at"))
+    assert all("job000" not in index.select({"company": company}, {}) for company in COMPANIES)
+
+
+def test_timeline_is_newest_first():
+    applications = random_applications(50)
+    order = list(build_index(applications).iter_by_time("added_at"))
+    assert order == sorted(applications, key=lambda job_id: applications[job_id]["added"], reverse=True)
+
+
+def test_timeline_walks_lazily_in_batches():
+    applications = random_applications(50)
+    index = build_index(applications)
+    newest_first = sorted(applications, key=lambda job_id: applications[job_id]["added"], reverse=True)
+    assert list(index.iter_by_time("added_at", batch_size=3)) == newest_first
+    assert list(index.iter_by_time("added_at", descending=False, batch_size=3)) == newest_first[::-1]
+
+    walk = index.iter_by_time("updated_at", batch_size=3)
+    seen = [next(walk) for _ in range(10)]
+    # An entry touched mid-walk moves ahead of the walk and is not repeated; the rest of the walk is unaffected
+    index.update(seen[5], applications[seen[5]], 2000.0)
+    index.remove(newest_first[40])
+    assert seen + list(walk) == [job_id for job_id in newest_first if job_id != newest_first[40]]
+
+
+def test_query_applications_pages_both_ways():
+    context_manager = CAPTAINContextManager()
+    for job_id, data in random_applications(60).items():
+        context_manager.add_job_application(job_id, dict(data))
+    everything = context_manager.query_applications(sort_by="updated_at")
+    pages = [context_manager.query_applications(sort_by="updated_at", offset=offset, limit=25) for offset in (0, 25, 50)]
+    assert [job_id for page in pages for job_id, _ in page] == [job_id for job_id, _ in everything]
+
+    # A selective filter sorts its few matches instead of walking the timeline
+    rejected = context_manager.query_applications(status="Rejected", company="Globex", sort_by="company")
+    assert {job_id for job_id, _ in rejected} == {job_id for job_id, data in context_manager.job_applications.items()
+                                                  if data["status"] == "Rejected" and data["company"] == "Globex"}
+    assert context_manager.count_applications(status="Rejected", company="Globex") == len(rejected)
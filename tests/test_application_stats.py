@@ -0,0 +1,69 @@
+# tests/test_application_stats.py
+
+from core.application_stats import ApplicationStats, SECONDS_PER_DAY
+
+T0 = 1_700_000_000.0
+
+
+def build():
+    stats = ApplicationStats()
+    stats.on_add("a", {"company": "Acme", "status": "Not Started"}, T0)
+    stats.on_add("b", {"company": "Acme", "status": "Applied"}, T0)
+    stats.on_add("c", {"company": "Globex", "status": "Applied"}, T0)
+    stats.on_update("a", {"status": "Applied"}, T0 + SECONDS_PER_DAY)
+    stats.on_update("b", {"status": "Interview Scheduled"}, T0 + 2 * SECONDS_PER_DAY)
+    stats.on_update("b", {"status": "Offer Received"}, T0 + 10 * SECONDS_PER_DAY)
+    stats.on_update("c", {"status": "Rejected"}, T0 + 40 * SECONDS_PER_DAY)
+    return stats
+
+
+def test_counts_follow_updates():
+    stats = build().get_stats()
+    assert stats["total_applications"] == 3
+    assert stats["status_counts"] == {"Applied": 1, "Offer Received": 1, "Rejected": 1}
+    assert stats["company_counts"] == {"Acme": 2, "Globex": 1}
+    assert stats["success_rate"] == 1 / 3
+    assert stats["funnel"]["Applied"] == 3
+    assert stats["status_transitions"]["Applied -> Interview Scheduled"] == 1
+
+
+def test_time_to_response_histogram():
+    response = build().get_stats()["time_to_response"]
+    assert response["responses"] == 2
+    assert response["min_days"] == 2
+    assert response["max_days"] == 40
+    assert response["histogram"]["1-3 days"] == 1
+    assert response["histogram"]["30+ days"] == 1
+
+
+def test_adding_an_existing_job_replaces_it():
+    stats = build()
+    stats.on_add("a", {"company": "Initech", "status": "Not Started"}, T0)
+    result = stats.get_stats()
+    assert result["total_applications"] == 3
+    assert result["company_counts"] == {"Acme": 1, "Globex": 1, "Initech": 1}
+    assert "Applied" not in result["status_counts"]
+
+
+def test_updates_to_unknown_jobs_are_ignored():
+    stats = ApplicationStats()
+    stats.on_update("missing", {"status": "Applied"}, T0)
+    assert stats.get_stats()["total_applications"] == 0
+
+
+def test_rebuild_from_history_matches_incremental():
+    events = [
+        {"job_id": "a", "timestamp": T0, "to_status": "Not Started"},
+        {"job_id": "b", "timestamp": T0, "to_status": "Applied"},
+        {"job_id": "c", "timestamp": T0, "to_status": "Applied"},
+        {"job_id": "a", "timestamp": T0 + SECONDS_PER_DAY, "from_status": "Not Started", "to_status": "Applied"},
+        {"job_id": "b", "timestamp": T0 + 2 * SECONDS_PER_DAY, "to_status": "Interview Scheduled"},
+        {"job_id": "b", "timestamp": T0 + 10 * SECONDS_PER_DAY, "to_status": "Offer Received"},
+        {"job_id": "c", "timestamp": T0 + 40 * SECONDS_PER_DAY, "to_status": "Rejected"},
+        {"job_id": "gone", "timestamp": T0, "to_status": "Applied"},
+    ]
+    applications = {"a": {"company": "Acme", "status": "Applied"}, "b": {"company": "Acme", "status": "Offer Received"},
+                    "c": {"company": "Globex", "status": "Rejected"}}
+    rebuilt = ApplicationStats()
+    rebuilt.rebuild(applications, events)
+    assert rebuilt.get_stats() == build().get_stats()
@@ -0,0 +1,68 @@
+# tests/test_captain_ai.py
+
+import asyncio
+import pytest
+from ai.captain_ai import CaptainAI
+from core.context_manager import CAPTAINContextManager
+
+REPORT_SECTIONS = ["job_search_overview", "weekend_project", "weekly_goals", "skill_improvement", "long_term_career_plan"]
+
+RESPONSES = {
+    "job_search_overview": "Steady progress.",
+    "weekend_project": "1. Project Title:\nBuild a CLI\n2. Description:\nA small tool",
+    "weekly_goals": "Apply to 3 jobs\nUpdate resume",
+    "skill_improvement": "1. Technical Skills:\n- Go\n- Rust",
+    "long_term_career_plan": "1. Year One:\nGrow as a backend engineer",
+}
+
+
+class PassthroughSummarizer:
+    def get_summary(self, resume):
+        return resume
+
+
+class AsyncAIManager:
+    # Later sections answer first, so results have to be put back in section order
+    def __init__(self, failing=(), hanging=()):
+        self.failing, self.hanging = set(failing), set(hanging)
+        self.resume_summarizer = PassthroughSummarizer()
+        self.running = 0
+        self.max_running = 0
+
+    async def agenerate_response(self, prompt_name, context):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(60 if prompt_name in self.hanging else 0.05 * (5 - REPORT_SECTIONS.index(prompt_name)))
+            if prompt_name in self.failing:
+                raise RuntimeError(f"{prompt_name} failed")
+            return RESPONSES[prompt_name]
+        finally:
+            self.running -= 1
+
+
+def make_captain(tmp_path, monkeypatch, **kwargs):
+    monkeypatch.chdir(tmp_path)
+    context_manager = CAPTAINContextManager()
+    context_manager.update_master_resume("# Jane Doe\n\n## Skills\n\n- Python\n")
+    context_manager.add_job_application("job1", {"company": "Acme", "position": "Engineer", "status": "Applied"})
+    return CaptainAI(AsyncAIManager(**kwargs), context_manager)
+
+
+def test_full_report_runs_sections_concurrently_within_the_limit(tmp_path, monkeypatch):
+    captain = make_captain(tmp_path, monkeypatch)
+    report = asyncio.run(captain.agenerate_full_report(max_concurrency=2))
+    assert captain.ai_manager.max_running == 2
+    assert report["errors"] == {}
+    assert list(report["sections"]) == REPORT_SECTIONS
+    assert report["sections"]["weekend_project"] == {"Project Title": "Build a CLI", "Description": "A small tool"}
+    assert report["sections"]["weekly_goals"] == ["Apply to 3 jobs", "Update resume"]
+    assert report["sections"]["skill_improvement"] == {"Technical Skills": ["- Go", "- Rust"]}
+
+
+def test_failed_and_timed_out_sections_do_not_discard_the_others(tmp_path, monkeypatch):
+    captain = make_captain(tmp_path, monkeypatch, failing={"weekly_goals"}, hanging={"weekend_project"})
+    report = captain.generate_full_report(max_concurrency=5, timeout=0.5)
+    assert report["errors"] == {"weekly_goals": "weekly_goals failed", "weekend_project": "Timed out after 0.5 seconds"}
+    assert list(report["sections"]) == ["job_search_overview", "skill_improvement", "long_term_career_plan"]
+    assert captain.ai_manager.max_running == 5
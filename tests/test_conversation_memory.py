@@ -0,0 +1,81 @@
+# tests/test_conversation_memory.py
+
+import threading
+from core.conversation_memory import ConversationMemory
+
+
+def long_text(words=50):
+    return " ".join(["word"] * words)
+
+
+def test_window_keeps_the_prompt_bounded():
+    memory = ConversationMemory(summarize=None, window_tokens=200)
+    for i in range(20):
+        memory.record("chat", f"question {i} {long_text()}", long_text())
+    messages = memory.messages("chat")
+    assert 0 < len(messages) < 40
+    assert messages[-2].content.startswith("question 19")
+
+
+def test_old_turns_are_folded_into_the_summary():
+    calls = []
+
+    def summarize(previous, transcript, tokens):
+        calls.append(transcript)
+        return "summary of the start"
+
+    memory = ConversationMemory(summarize=summarize, window_tokens=200)
+    for i in range(6):
+        memory.record("chat", f"question {i} {long_text()}", long_text())
+    assert calls
+    messages = memory.messages("chat")
+    assert messages[0].content.endswith("summary of the start")
+
+
+def test_scopes_are_independent():
+    memory = ConversationMemory()
+    memory.record("a", "hello", "hi")
+    assert memory.messages("b") == []
+
+
+def test_readers_do_not_wait_for_the_summarizer():
+    started, release = threading.Event(), threading.Event()
+
+    def summarize(previous, transcript, tokens):
+        started.set()
+        release.wait(5)
+        return "folded"
+
+    memory = ConversationMemory(summarize=summarize, window_tokens=200)
+    for i in range(3):
+        memory.record("chat", long_text(), long_text())
+    writer = threading.Thread(target=memory.record, args=("chat", long_text(), long_text()))
+    writer.start()
+    assert started.wait(5)
+    reader = threading.Thread(target=memory.messages, args=("chat",))
+    reader.start()
+    reader.join(1)
+    assert not reader.is_alive()
+    release.set()
+    writer.join(5)
+    assert memory.messages("chat")[0].content.endswith("folded")
+
+
+def test_a_summary_is_dropped_when_the_conversation_was_cleared():
+    started, release = threading.Event(), threading.Event()
+
+    def summarize(previous, transcript, tokens):
+        started.set()
+        release.wait(5)
+        return "stale"
+
+    memory = ConversationMemory(summarize=summarize, window_tokens=200)
+    for i in range(3):
+        memory.record("chat", long_text(), long_text())
+    writer = threading.Thread(target=memory.record, args=("chat", long_text(), long_text()))
+    writer.start()
+    assert started.wait(5)
+    memory.clear("chat")
+    release.set()
+    writer.join(5)
+    assert memory.messages("chat") == []
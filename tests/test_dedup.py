@@ -0,0 +1,102 @@
+# tests/test_dedup.py
+
+import random
+import threading
+import pytest
+from core.dedup import MinHasher, NearDuplicateIndex, estimate_jaccard, optimal_bands, shingles
+
+WORDS = [f"word{i}" for i in range(500)]
+
+
+def posting(seed, length=200):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def edit(text, changes, seed=0):
+    rng = random.Random(seed)
+    words = text.split()
+    for _ in range(changes):
+        words[rng.randrange(len(words))] = "changed"
+    return " ".join(words)
+
+
+def jaccard(first, second):
+    a, b = shingles(first), shingles(second)
+    return len(a & b) / len(a | b)
+
+
+def test_shingles_ignore_case_whitespace_and_punctuation():
+    assert shingles("Senior  Engineer, Python!", size=2) == shingles("senior engineer python", size=2)
+    assert shingles("two words", size=5) == {"two words"}
+    assert shingles("", size=5) == set()
+
+
+def test_signature_estimates_jaccard():
+    hasher = MinHasher(num_permutations=256)
+    first = posting(1)
+    second = edit(first, 8)
+    estimate = estimate_jaccard(hasher.signature(first), hasher.signature(second))
+    assert estimate == pytest.approx(jaccard(first, second), abs=0.1)
+
+
+def test_same_seed_gives_comparable_signatures():
+    text = posting(2)
+    assert (MinHasher(seed=3).signature(text) == MinHasher(seed=3).signature(text)).all()
+
+
+def test_optimal_bands_fit_the_permutations():
+    bands, rows = optimal_bands(0.8, 128)
+    assert bands * rows <= 128
+    assert bands > 1 and rows > 1
+
+
+def test_reposts_match_and_distinct_postings_do_not():
+    index = NearDuplicateIndex(threshold=0.8)
+    originals = {f"job{i}": posting(i) for i in range(30)}
+    for job_id, text in originals.items():
+        assert index.add_or_match(job_id, text) is None
+    match = index.add_or_match("repost", edit(originals["job7"], 2))
+    assert match is not None and match[0] == "job7"
+    assert "repost" not in index
+    assert index.query(posting(999)) == []
+
+
+def test_duplicates_link_to_the_canonical_posting():
+    index = NearDuplicateIndex(threshold=0.8)
+    original = posting(5)
+    index.add_or_match("canonical", original)
+    assert index.add_or_match("first_repost", edit(original, 1, seed=1))[0] == "canonical"
+    assert index.add_or_match("second_repost", edit(original, 2, seed=2))[0] == "canonical"
+    assert len(index) == 1
+
+
+def test_remove_drops_the_posting_from_every_bucket():
+    index = NearDuplicateIndex(threshold=0.8)
+    text = posting(6)
+    index.add("a", text)
+    index.remove("a")
+    assert index.query(text) == []
+    assert all(not buckets for buckets in index._buckets)
+
+
+def test_concurrent_near_duplicates_elect_one_canonical_posting():
+    index = NearDuplicateIndex(threshold=0.7)
+    base = posting(7)
+    texts = [edit(base, 2, seed=i) for i in range(8)]
+    barrier = threading.Barrier(len(texts))
+    results = {}
+
+    def add(i):
+        barrier.wait()
+        results[i] = index.add_or_match(f"job{i}", texts[i])
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    canonical = [i for i, match in results.items() if match is None]
+    assert len(canonical) == 1
+    assert len(index) == 1
+    assert all(match[0] == f"job{canonical[0]}" for match in results.values() if match is not None)
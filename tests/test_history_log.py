@@ -0,0 +1,96 @@
+# tests/test_history_log.py
+
+import os
+from core.history_log import ACTIVE_RECORD, HistoryLog
+
+DAY = 24 * 60 * 60
+
+
+def fill(log, count, start=1_000_000.0, step=60.0):
+    for i in range(count):
+        log.append("update", f"job{i % 3}", start + i * step, "Not Started", "Applied")
+
+
+def test_events_reload_from_sealed_segments_and_the_active_tail(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=4, retention_days=None)
+    fill(log, 10)
+    assert len([name for name in os.listdir(tmp_path) if name.startswith("segment-")]) == 2
+
+    reloaded = HistoryLog(str(tmp_path), segment_size=4, retention_days=None)
+    assert reloaded.events() == log.events()
+    assert len(reloaded) == 10
+
+
+def test_appends_after_a_reload_continue_the_log(tmp_path):
+    fill(HistoryLog(str(tmp_path), segment_size=4, retention_days=None), 5)
+    log = HistoryLog(str(tmp_path), segment_size=4, retention_days=None)
+    log.append("add", "job9", 2_000_000.0)
+    reloaded = HistoryLog(str(tmp_path), segment_size=4, retention_days=None)
+    assert len(reloaded) == 6
+    assert reloaded.events(limit=1)[0]["job_id"] == "job9"
+
+
+def test_a_torn_final_record_is_ignored(tmp_path):
+    fill(HistoryLog(str(tmp_path), segment_size=100, retention_days=None), 3)
+    with open(tmp_path / "active.bin", "ab") as f:
+        f.write(b"\x00" * (ACTIVE_RECORD.size // 2))
+    assert len(HistoryLog(str(tmp_path), segment_size=100, retention_days=None)) == 3
+
+
+def test_queries_by_job_and_time_range():
+    log = HistoryLog(retention_days=None)
+    fill(log, 9)
+    assert [event["job_id"] for event in log.events(job_id="job1")] == ["job1"] * 3
+    assert log.count(start=1_000_000.0 + 60, end=1_000_000.0 + 180) == 3
+    assert len(log.events(limit=2)) == 2
+    assert log.status_transitions() == {"Not Started -> Applied": 9}
+    assert log.last_timestamp("job2") == 1_000_000.0 + 8 * 60
+
+
+def test_timestamps_stay_sorted():
+    log = HistoryLog(retention_days=None)
+    log.append("add", "a", 100.0)
+    assert log.append("add", "b", 50.0) == 100.0
+
+
+def test_retention_drops_old_events_and_persists(tmp_path):
+    now = 1_000_000_000.0
+    log = HistoryLog(str(tmp_path), segment_size=4, retention_days=30)
+    for i in range(6):
+        log.append("add", f"old{i}", now - 40 * DAY + i)
+    for i in range(5):
+        log.append("update", f"new{i}", now - DAY + i)
+    assert log.apply_retention(now=now) == 6
+    assert len(log) == 5
+    assert all(event["job_id"].startswith("new") for event in log.events())
+
+    reloaded = HistoryLog(str(tmp_path), segment_size=4, retention_days=30)
+    assert reloaded.events() == log.events()
+    assert reloaded.events(job_id="old0") == []
+    assert sorted(name for name in os.listdir(tmp_path) if name.startswith("segment-")) == \
+        sorted(segment["file"] for segment in reloaded._segments)
+
+
+def test_compaction_keeps_every_event(tmp_path):
+    log = HistoryLog(str(tmp_path), segment_size=3, retention_days=None)
+    fill(log, 7)
+    before = log.events()
+    log.compact()
+    assert log.events() == before
+    assert HistoryLog(str(tmp_path), segment_size=3, retention_days=None).events() == before
+
+
+def test_last_timestamp_per_action_survives_reload_and_retention(tmp_path):
+    now = 1_000_000_000.0
+    log = HistoryLog(str(tmp_path), segment_size=4, retention_days=30)
+    log.append("resume_update", None, now - 40 * DAY)
+    fill(log, 6, start=now - 2 * DAY)
+    log.append("add", "job7", now - DAY)
+    assert log.last_timestamp_for_action("resume_update") == now - 40 * DAY
+    assert log.last_timestamp_for_action("update") == now - 2 * DAY + 5 * 60
+    assert HistoryLog(str(tmp_path), segment_size=4, retention_days=30).last_timestamp_for_action("add") == now - DAY
+
+    log.apply_retention(now=now)
+    assert log.last_timestamp_for_action("resume_update") is None
+    assert log.get_rollups()["last_resume_update"] is None
+    assert log.last_timestamp_for_action("add") == now - DAY
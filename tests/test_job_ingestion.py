@@ -0,0 +1,86 @@
+# tests/test_job_ingestion.py
+
+import json
+import pytest
+from core.context_manager import CAPTAINContextManager
+from core.job_ingestion import JobIngestionPipeline, IngestionCheckpoint, normalize_posting, posting_job_id
+
+DESCRIPTION = " ".join(f"We are hiring engineers to build reliable data pipelines, team {i} owns the ingestion layer."
+                       for i in range(12))
+
+
+class ScriptedJobAI:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def analyze_job_description(self, job_id, description, save=True):
+        self.calls.append(job_id)
+        if job_id in self.failing:
+            raise RuntimeError("analysis failed")
+        return {"summary": f"analysis of {job_id}"}
+
+
+@pytest.fixture
+def postings(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "postings.jsonl"
+    rows = [{"company": "Acme", "title": "Engineer", "description": DESCRIPTION},
+            {"company": "Acme Corp", "title": "Engineer", "description": DESCRIPTION + " Apply today."},
+            {"company": "Globex", "title": "Designer", "description": "Design things for people."},
+            {"title": "No description"}]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    return str(path)
+
+
+def make_pipeline(context_manager, job_ai):
+    return JobIngestionPipeline(context_manager, job_ai, concurrency=2, requests_per_minute=6000,
+                                progress_callback=lambda progress: None)
+
+
+def test_normalize_posting_maps_aliases_and_strips_html():
+    posting = normalize_posting({"Company_Name": " Acme ", "Job_Title": "Engineer", "body": "<p>Build&nbsp;things</p>"})
+    assert posting["company"] == "Acme"
+    assert posting["position"] == "Engineer"
+    assert posting["description"] == "Build things"
+    assert normalize_posting({"title": "Engineer"}) is None
+
+
+def test_run_adds_links_and_analyzes(postings):
+    context_manager = CAPTAINContextManager()
+    job_ai = ScriptedJobAI()
+    report = make_pipeline(context_manager, job_ai).run(postings)
+    assert report["read"] == 4
+    assert report["invalid"] == 1
+    assert report["near_duplicates"] == 1
+    assert report["analyzed"] == 2
+    duplicates = [app for app in context_manager.job_applications.values() if app.get("duplicate_of")]
+    assert len(duplicates) == 1
+    assert duplicates[0]["analysis"] == context_manager.job_applications[duplicates[0]["duplicate_of"]]["analysis"]
+    # The repost never gets an analysis call of its own
+    assert len(job_ai.calls) == 2
+
+
+def test_rerun_skips_known_postings(postings):
+    context_manager = CAPTAINContextManager()
+    make_pipeline(context_manager, ScriptedJobAI()).run(postings)
+    job_ai = ScriptedJobAI()
+    report = make_pipeline(context_manager, job_ai).run(postings)
+    assert report["added"] == 0
+    assert job_ai.calls == []
+
+
+def test_linked_duplicates_get_the_analysis_after_a_resumed_run(postings):
+    context_manager = CAPTAINContextManager()
+    canonical_id = posting_job_id(normalize_posting({"company": "Acme", "title": "Engineer", "description": DESCRIPTION}))
+    report = make_pipeline(context_manager, ScriptedJobAI(failing={canonical_id})).run(postings)
+    assert report["failed"] == 1
+    assert canonical_id in IngestionCheckpoint(postings).pending
+
+    # A new process: the links from the first run are gone, the stored applications are not
+    job_ai = ScriptedJobAI()
+    make_pipeline(context_manager, job_ai).run(postings)
+    assert job_ai.calls == [canonical_id]
+    duplicate = next(app for app in context_manager.job_applications.values() if app.get("duplicate_of"))
+    assert duplicate["analysis"] == {"summary": f"analysis of {canonical_id}"}
+    assert not IngestionCheckpoint(postings).pending
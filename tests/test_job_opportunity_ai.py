@@ -0,0 +1,57 @@
+# tests/test_job_opportunity_ai.py
+
+import pytest
+from ai.job_opportunity_ai import JobOpportunityAI
+from core.context_manager import CAPTAINContextManager
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.resumes = []
+
+    def get_summary(self, resume):
+        self.resumes.append(resume)
+        return "resume summary"
+
+
+class RecordingAIManager:
+    def __init__(self):
+        self.calls = []
+        self.resume_summarizer = RecordingSummarizer()
+
+    def generate_structured(self, prompt_name, context):
+        self.calls.append((prompt_name, context))
+        return {"required_skills": [f"skill from {context['job_description']}"]}
+
+
+@pytest.fixture
+def job_ai(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    context_manager = CAPTAINContextManager()
+    context_manager.master_resume = "# Jane Doe\n\n## Skills\nPython"
+    context_manager.add_job_application("canonical", {"company": "Acme", "position": "Engineer",
+                                                      "status": "Not Started", "description": "Original posting"})
+    context_manager.add_job_application("repost", {"company": "Acme Corp", "position": "Engineer",
+                                                   "status": "Not Started", "description": "Original posting, reposted",
+                                                   "duplicate_of": "canonical"})
+    return JobOpportunityAI(RecordingAIManager(), context_manager)
+
+
+def test_duplicates_are_analyzed_as_their_canonical_posting(job_ai):
+    analysis = job_ai.analyze_job_description("repost", "Original posting, reposted")
+    (prompt_name, context), = job_ai.ai_manager.calls
+    assert prompt_name == "job_analysis"
+    assert context["company"] == "Acme"
+    assert context["job_description"] == "Original posting"
+    assert context["resume_summary"] == "resume summary"
+    assert job_ai.ai_manager.resume_summarizer.resumes == [job_ai.context_manager.get_master_resume()]
+    # Stored on both postings, so the next analysis of either one is free
+    assert job_ai.context_manager.get_job_application("canonical")["analysis"] == analysis
+    assert job_ai.context_manager.get_job_application("repost")["analysis"] == analysis
+    assert job_ai.analyze_job_description("repost", "Original posting, reposted") == analysis
+    assert len(job_ai.ai_manager.calls) == 1
+
+
+def test_analysis_can_be_returned_without_saving(job_ai):
+    job_ai.analyze_job_description("canonical", "Original posting", save=False)
+    assert "analysis" not in job_ai.context_manager.get_job_application("canonical")
@@ -0,0 +1,141 @@
+# tests/test_llm_transport.py
+
+import asyncio
+import time
+import pytest
+from core.llm_transport import CircuitBreaker, CircuitOpenError, DeadlineExceeded, LLMTransport, RateLimiter
+from tests.fake_llm_server import FakeLLMServer
+
+
+@pytest.fixture
+def server():
+    with FakeLLMServer(reply="Hello there") as server:
+        yield server
+
+
+def make_transport(server, **kwargs):
+    options = {"base_url": server.base_url, "requests_per_minute": 6000, "tokens_per_minute": 10 ** 7,
+               "timeout": 10, "request_timeout": 5, "backoff_seconds": 0.01, "max_backoff_seconds": 0.05}
+    options.update(kwargs)
+    return LLMTransport("fake-model", **options)
+
+
+def invoke(transport):
+    return transport.call(lambda: transport.llm.invoke("hi")).content
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_call_returns_the_reply(server):
+    assert invoke(make_transport(server)) == "Hello there"
+
+
+def test_429_honours_retry_after_and_pauses_the_limiter(server):
+    transport = make_transport(server)
+    server.fail_next(1, status=429, retry_after=0.3)
+    started = time.monotonic()
+    assert invoke(transport) == "Hello there"
+    assert time.monotonic() - started >= 0.3
+    assert transport.stats["rate_limited"] == 1
+    assert transport.stats["retries"] == 1
+    assert len(server.requests) == 2
+
+
+def test_non_retryable_errors_are_raised_at_once(server):
+    transport = make_transport(server)
+    server.fail_next(1, status=400)
+    with pytest.raises(Exception):
+        invoke(transport)
+    assert len(server.requests) == 1
+    assert transport.breaker.state == "closed"
+
+
+def test_retries_stop_at_the_deadline(server):
+    transport = make_transport(server, timeout=0.5, max_retries=10)
+    server.fail_next(10, status=503, retry_after=0.4)
+    with pytest.raises(DeadlineExceeded):
+        invoke(transport)
+
+
+def test_breaker_opens_fails_fast_and_closes_after_a_probe(server):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.2)
+    transport = make_transport(server, breaker=breaker, max_retries=1)
+    server.fail_next(2, status=500)
+    with pytest.raises(Exception):
+        invoke(transport)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        invoke(transport)
+    assert len(server.requests) == 2
+    time.sleep(0.25)
+    assert invoke(transport) == "Hello there"
+    assert breaker.state == "closed"
+
+
+def test_half_open_allows_a_single_probe():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    open_breaker(breaker)
+    breaker.allow()
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_cancelled_probe_releases_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    transport = LLMTransport("fake-model", requests_per_minute=6000, tokens_per_minute=10 ** 7, breaker=breaker)
+    open_breaker(breaker)
+
+    async def hang():
+        await asyncio.sleep(10)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(transport.acall(hang), 0.05)
+
+    asyncio.run(run())
+    # The next caller gets to probe instead of being rejected until a restart
+    breaker.allow()
+    assert breaker.state == "half_open"
+
+
+def test_closing_a_stream_during_the_probe_releases_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.0)
+    transport = LLMTransport("fake-model", requests_per_minute=6000, tokens_per_minute=10 ** 7, breaker=breaker)
+    open_breaker(breaker)
+    stream = transport.stream(lambda: iter(["a", "b", "c"]))
+    assert next(stream) == "a"
+    stream.close()
+    breaker.allow()
+
+
+def test_stream_retries_only_before_the_first_chunk(server):
+    transport = make_transport(server)
+    server.fail_next(1, status=503)
+    chunks = list(transport.stream(lambda: transport.llm.stream("hi")))
+    assert "".join(chunk.content for chunk in chunks) == "Hello there"
+    assert transport.stats["retries"] == 1
+
+
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(requests_per_minute=60, burst_seconds=1.0)
+    waits = [limiter.reserve() for _ in range(3)]
+    assert waits[0] == 0
+    assert waits[1] == pytest.approx(1.0, abs=0.05)
+    assert waits[2] == pytest.approx(2.0, abs=0.05)
+    with pytest.raises(DeadlineExceeded):
+        limiter.reserve(deadline=time.monotonic())
+
+
+def test_idle_rate_limiter_admits_a_minute_of_budget_at_once():
+    limiter = RateLimiter(requests_per_minute=500, tokens_per_minute=30000)
+    assert [limiter.reserve(4500) for _ in range(6)] == [0.0] * 6
+    # 3000 of the 30000 tokens are left, so the next caller waits for the other 1500 at 500 tokens/s
+    assert limiter.reserve(4500) == pytest.approx(3.0, abs=0.05)
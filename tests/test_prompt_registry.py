@@ -0,0 +1,50 @@
+# tests/test_prompt_registry.py
+
+import pytest
+from langchain_core.language_models import FakeListChatModel
+import prompts
+from core.prompt_registry import PromptRegistry, get_default_registry, parse_input_variables
+
+
+def test_every_shipped_prompt_registers():
+    registry = get_default_registry()
+    assert set(registry.names()) == set(prompts.PROMPT_TEMPLATES)
+    for name in prompts.OUTPUT_SCHEMAS:
+        assert registry.get_schema(name) is not None
+
+
+def test_input_variables_are_parsed_once_each():
+    assert parse_input_variables("{a} and {b.c} and {a} but {{literal}}") == ["a", "b"]
+
+
+@pytest.mark.parametrize("template", ["{unclosed", "{0}", "{}"])
+def test_invalid_templates_are_rejected(template):
+    with pytest.raises(ValueError):
+        PromptRegistry().register("bad", template)
+
+
+def test_declared_variables_must_match():
+    with pytest.raises(ValueError):
+        PromptRegistry().register("greeting", "Hello {name}", input_variables=["name", "title"])
+
+
+def test_missing_context_is_reported():
+    registry = PromptRegistry({"greeting": "Hello {name}"})
+    with pytest.raises(ValueError, match="name"):
+        registry.format("greeting", {})
+    assert registry.format("greeting", {"name": "Jane"}) == "Hello Jane"
+
+
+def test_chains_are_compiled_once_and_rebuilt_after_reregistering():
+    registry = PromptRegistry({"greeting": "Hello {name}"})
+    llm = FakeListChatModel(responses=["Hi Jane"])
+    chain = registry.get_chain("greeting", llm)
+    assert registry.get_chain("greeting", llm) is chain
+    assert chain.invoke({"name": "Jane"}) == "Hi Jane"
+    registry.register("greeting", "Good morning {name}")
+    assert registry.get_chain("greeting", llm) is not chain
+
+
+def test_unknown_prompts_raise():
+    with pytest.raises(ValueError):
+        PromptRegistry().get_template("missing")
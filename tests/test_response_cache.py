@@ -0,0 +1,86 @@
+# tests/test_response_cache.py
+
+import threading
+import time
+from core.response_cache import ResponseCache, make_cache_key
+
+
+def test_cache_key_depends_on_every_input_but_not_key_order():
+    key = make_cache_key("template", "model", 0.7, {"a": 1, "b": 2})
+    assert key == make_cache_key("template", "model", 0.7, {"b": 2, "a": 1})
+    assert key != make_cache_key("template", "model", 0.2, {"a": 1, "b": 2})
+    assert key != make_cache_key("other", "model", 0.7, {"a": 1, "b": 2})
+    assert key != make_cache_key("template", "model", 0.7, {"a": 1, "b": 3})
+
+
+def test_entries_survive_a_restart_through_the_disk_tier(tmp_path):
+    ResponseCache(str(tmp_path)).set("k1", "response")
+    cache = ResponseCache(str(tmp_path))
+    assert cache.get("k1") == "response"
+    assert cache.get("k1") == "response"
+    stats = cache.get_stats()
+    assert (stats["disk_hits"], stats["memory_hits"], stats["disk_entries"]) == (1, 1, 1)
+    assert cache.get("missing") is None
+
+
+def test_memory_tier_is_a_bounded_lru(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_memory_entries=2)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+    assert cache.get_stats()["memory_entries"] == 2
+    assert cache.get("a") == "a"
+    assert cache.get_stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl_seconds=0.1)
+    cache.set("k", "response")
+    time.sleep(0.15)
+    assert cache.get("k") is None
+    assert cache.get_stats()["disk_entries"] == 0
+
+
+def test_disk_tier_is_pruned_to_its_limit(tmp_path):
+    cache = ResponseCache(str(tmp_path), max_memory_entries=1, max_disk_entries=10)
+    for i in range(15):
+        cache.set(f"key{i:02d}", str(i))
+    assert cache.get_stats()["disk_entries"] <= 10
+    assert len(cache._disk_files()) == cache.get_stats()["disk_entries"]
+    assert cache.get("key14") == "14"
+
+
+def test_invalidate_and_clear(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    cache.clear()
+    assert cache.get("b") is None
+    assert cache.get_stats()["disk_entries"] == 0
+
+
+def test_concurrent_invalidation_keeps_the_disk_count_exact(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    for i in range(20):
+        cache.set(f"key{i:02d}", str(i))
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def invalidate_all():
+        barrier.wait()
+        try:
+            for i in range(20):
+                cache.invalidate(f"key{i:02d}")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=invalidate_all) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert cache.get_stats()["disk_entries"] == 0
+    cache.invalidate("missing")
+    assert cache.get_stats()["disk_entries"] == 0
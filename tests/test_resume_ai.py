@@ -0,0 +1,70 @@
+# tests/test_resume_ai.py
+
+from ai.resume_ai import ResumeAI, parse_edit_response
+from core.context_manager import CAPTAINContextManager
+from core.resume_manager import ResumeManager
+
+RESUME = "# Jane Doe\n\n## Skills\n\n- Python\n- SQL\n"
+
+EDIT_RESPONSE = """1. Updated Resume:
+# Jane Doe
+
+## Skills
+
+- Python
+- SQL
+- Go
+
+2. Explanation of Changes:
+Added Go to the skills.
+
+3. Potential Impact:
+Broader backend roles.
+
+4. Additional Suggestions:
+1. Add a Go project."""
+
+
+class ScriptedAIManager:
+    def __init__(self, responses):
+        self.responses = responses
+
+    def generate_response(self, prompt_name, context):
+        return self.responses[prompt_name]
+
+
+def make_resume_ai(responses):
+    context_manager = CAPTAINContextManager()
+    resume_manager = ResumeManager()
+    resume_ai = ResumeAI(ScriptedAIManager(responses), context_manager, resume_manager)
+    resume_ai.update_resume(RESUME)
+    return resume_ai
+
+
+def test_parse_edit_response_keeps_the_resume_verbatim():
+    sections = parse_edit_response(EDIT_RESPONSE)
+    assert sections["Updated Resume"] == "# Jane Doe\n\n## Skills\n\n- Python\n- SQL\n- Go"
+    assert sections["Explanation of Changes"] == "Added Go to the skills."
+    assert sections["Additional Suggestions"] == "1. Add a Go project."
+
+
+def test_parse_edit_response_unwraps_a_code_fence():
+    sections = parse_edit_response("**1. Updated Resume:**\n```markdown\n# Jane Doe\n```\n**2. Explanation of Changes:**\nNone.")
+    assert sections["Updated Resume"] == "# Jane Doe"
+
+
+def test_full_edit_fallback_commits_only_the_resume():
+    resume_ai = make_resume_ai({"resume_patch": "not a patch", "resume_edit": EDIT_RESPONSE})
+    result = resume_ai.edit_resume("Add Go")
+    stored = resume_ai.context_manager.get_master_resume()
+    assert "Explanation of Changes" not in stored
+    assert "- Go" in stored
+    assert result["Updated Resume"] == stored
+    assert result["Explanation of Changes"] == "Added Go to the skills."
+
+
+def test_full_edit_without_a_resume_changes_nothing():
+    resume_ai = make_resume_ai({"resume_patch": "not a patch", "resume_edit": "I cannot do that."})
+    result = resume_ai.edit_resume("Add Go")
+    assert "error" in result
+    assert resume_ai.context_manager.get_master_resume() == RESUME
@@ -0,0 +1,76 @@
+# tests/test_resume_document.py
+
+from core.resume_document import ResumeDocument, section_key
+
+RESUME = """# Jane Doe
+jane@example.com
+
+## Professional Summary
+Backend engineer.
+
+## Experience
+
+### Senior Engineer at Acme (Jan 2020 - Present)
+- Built **billing**
+- Led a team of 4
+
+### Engineer at Globex
+- Maintained APIs
+
+## Skills
+- Technical Skills: Python, Go, SQL
+- Docker
+"""
+
+
+def test_text_round_trips_exactly():
+    assert ResumeDocument.parse(RESUME).text == RESUME
+
+
+def test_sections_are_found_by_title_or_alias():
+    document = ResumeDocument.parse(RESUME)
+    assert document.name == "Jane Doe"
+    assert document.titles() == ["Professional Summary", "Experience", "Skills"]
+    assert document.section("Work Experience") is document.section("experience")
+    assert "work experience" in document
+    assert section_key("Skills & Tools") == section_key("skills and tools")
+
+
+def test_entries_bullets_and_skills_are_parsed():
+    document = ResumeDocument.parse(RESUME)
+    first, second = document.section("Experience").entries
+    assert (first.title, first.company, first.dates) == ("Senior Engineer", "Acme", "Jan 2020 - Present")
+    assert first.bullets == ("Built **billing**", "Led a team of 4")
+    assert second.dates is None
+    assert document.section("Skills").skills == {"Technical Skills": ["Python", "Go", "SQL"], "Skills": ["Docker"]}
+
+
+def test_unchanged_sections_are_reused_and_changes_reported():
+    previous = ResumeDocument.parse(RESUME)
+    edited = ResumeDocument.parse(RESUME.replace("Maintained APIs", "Maintained public APIs"), previous)
+    assert edited.section("Skills") is previous.section("Skills")
+    assert edited.section("Experience") is not previous.section("Experience")
+    assert edited.changed_sections(previous) == ["Experience"]
+    assert ResumeDocument.parse(RESUME, previous) is previous
+
+
+def test_added_removed_and_header_changes_are_reported():
+    previous = ResumeDocument.parse(RESUME)
+    edited = RESUME.replace("jane@example.com", "jane@doe.dev").replace("## Skills", "## Projects")
+    changed = ResumeDocument.parse(edited, previous).changed_sections(previous)
+    assert sorted(changed) == ["", "Projects", "Skills"]
+    assert ResumeDocument.parse(RESUME).changed_sections(None) == ["", "Professional Summary", "Experience", "Skills"]
+
+
+def test_repeated_titles_are_kept():
+    document = ResumeDocument.parse("## Projects\nA\n\n## Projects\nB\n")
+    assert len(document) == 2
+    assert document.section("Projects").body == "A"
+
+
+def test_render_selects_sections_in_document_order():
+    document = ResumeDocument.parse(RESUME)
+    rendered = document.render(["Skills", "Professional Summary"], include_header=False)
+    assert rendered.startswith("## Professional Summary")
+    assert "## Experience" not in rendered and "## Skills" in rendered
+    assert document.render(["Nonexistent"]) == RESUME
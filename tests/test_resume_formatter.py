@@ -0,0 +1,90 @@
+# tests/test_resume_formatter.py
+
+from core.resume_formatter import (CONTACT_SECTION, EDUCATION_SECTION, EXPERIENCE_SECTION, SKILLS_SECTION,
+                                   SUMMARY_SECTION, format_bullet, format_resume_text, section_for_heading)
+
+RAW_RESUME = """JANE DOE
+jane@example.com | +1 555 123 4567 | Austin, TX | linkedin.com/in/janedoe
+
+SUMMARY
+Backend engineer with 8 years of experience.
+
+EXPERIENCE
+Senior Engineer at Acme Corp (Jan 2020 - Present)
+• led migration to Kubernetes, cutting costs 30%
+• mentored 4 engineers
+Globex
+Software Developer, 06/2016 - 12/2019
+* built billing APIs
+
+EDUCATION
+B.S., Computer Science, University of Texas, 2016
+
+SKILLS
+Python, SQL, Leadership, Spanish
+
+PROJECTS
+### Side project
+Built a CLI used by 2x more teams
+"""
+
+
+def test_formats_a_plain_text_resume_without_the_llm():
+    formatted = format_resume_text(RAW_RESUME)
+    assert formatted.complete
+    assert formatted.name == "Jane Doe"
+    assert list(formatted.sections) == [CONTACT_SECTION, SUMMARY_SECTION, EXPERIENCE_SECTION, EDUCATION_SECTION,
+                                        SKILLS_SECTION, "Projects"]
+    assert formatted.sections[CONTACT_SECTION].splitlines() == [
+        "- Email: jane@example.com", "- Phone: +1 555 123 4567", "- Location: Austin, TX",
+        "- LinkedIn: linkedin.com/in/janedoe"]
+    assert formatted.sections[EDUCATION_SECTION] == "- B.S., Computer Science - University of Texas, 2016"
+    assert formatted.sections[SKILLS_SECTION].splitlines() == [
+        "- Technical Skills: Python, SQL", "- Soft Skills: Leadership", "- Languages: Spanish"]
+
+
+def test_entries_are_headed_and_separated_from_their_bullets():
+    markdown = format_resume_text(RAW_RESUME).to_markdown()
+    assert ("### Senior Engineer at Acme Corp (Jan 2020 - Present)\n\n"
+            "- Led migration to Kubernetes, cutting costs **30%**\n- Mentored 4 engineers\n\n"
+            "### Software Developer at Globex (Jun 2016 - Dec 2019)\n\n- Built billing APIs") in markdown
+    assert "### Side project\n\n- Built a CLI used by **2x** more teams" in markdown
+
+
+def test_formatting_is_idempotent():
+    markdown = format_resume_text(RAW_RESUME).to_markdown()
+    assert format_resume_text(markdown).to_markdown() == markdown
+
+
+def test_heading_and_bullet_normalization():
+    assert section_for_heading("## Work History") == EXPERIENCE_SECTION
+    assert section_for_heading("**Technical Skills:**") == SKILLS_SECTION
+    assert section_for_heading("VOLUNTEERING") == "Volunteering"
+    assert section_for_heading("### Acme") is None
+    assert section_for_heading("Built 3 services") is None
+    assert format_bullet("• grew revenue $2M;") == "- Grew revenue **$2M**"
+    assert format_bullet("2) cut latency 40%") == "- Cut latency **40%**"
+
+
+def test_only_sections_the_rules_cannot_structure_are_left_for_the_llm():
+    formatted = format_resume_text("""Jane Doe
+jane@example.com
+
+EXPERIENCE
+Worked on many interesting things over the years.
+Senior Engineer at Acme Corp (Jan 2020 - Present)
+
+EDUCATION
+Self-taught through online courses
+
+SKILLS
+Python, SQL
+""")
+    assert not formatted.complete
+    assert set(formatted.unresolved) == {EXPERIENCE_SECTION, EDUCATION_SECTION}
+    assert formatted.unresolved[EDUCATION_SECTION] == "Self-taught through online courses"
+    # Unresolved sections keep their place once resolved
+    formatted.resolve(EXPERIENCE_SECTION, "### Engineer at Acme (2020 - Present)")
+    formatted.resolve(EDUCATION_SECTION, "- Online courses")
+    assert formatted.complete
+    assert list(formatted.sections) == [CONTACT_SECTION, EXPERIENCE_SECTION, EDUCATION_SECTION, SKILLS_SECTION]
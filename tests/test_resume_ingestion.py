@@ -0,0 +1,119 @@
+# tests/test_resume_ingestion.py
+
+import zipfile
+import pytest
+from core.resume_ingestion import ResumeIngestionError, ResumeIngestor
+from utils.document_text import clean_document_text, extract_document_text
+
+WORD_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def write_docx(path, paragraphs):
+    # Paragraphs are (style, text) pairs; a None text is a page break
+    body = []
+    for style, text in paragraphs:
+        if text is None:
+            body.append('<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+            continue
+        properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        body.append(f"<w:p>{properties}<w:r><w:t>{text}</w:t></w:r></w:p>")
+    document = f'<?xml version="1.0"?><w:document xmlns:w="{WORD_NS}"><w:body>{"".join(body)}<w:sectPr/></w:body></w:document>'
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", document)
+    return str(path)
+
+
+def write_pdf(path, pages):
+    # Smallest PDF PyPDF2 reads: one Helvetica text stream per page and an exact xref table
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>",
+               f"<< /Type /Pages /Kids [{' '.join(f'{4 + 2 * i} 0 R' for i in range(len(pages)))}] /Count {len(pages)} >>",
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    for i, lines in enumerate(pages):
+        stream = "BT /F1 12 Tf 72 720 Td 14 TL " + " ".join(f"({line}) Tj T*" for line in lines) + " ET"
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+                       f"/Contents {5 + 2 * i} 0 R >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+
+@pytest.fixture
+def ingestor(tmp_path):
+    ingestor = ResumeIngestor(cache_dir=str(tmp_path / "cache"), workers=1, timeout=60)
+    yield ingestor
+    ingestor.close()
+
+
+def test_docx_headings_lists_and_page_limit(tmp_path):
+    path = write_docx(tmp_path / "resume.docx", [("Title", "Jane Doe"), ("Heading2", "Skills"), ("ListParagraph", "Python"),
+                                                 (None, None), ("Heading2", "Education"), (None, "BSc, MIT")])
+    assert extract_document_text(path) == "# Jane Doe\n## Skills\nPython\n## Education\nBSc, MIT"
+    assert extract_document_text(path, max_pages=1) == "# Jane Doe\n## Skills\nPython"
+
+
+def test_pdf_pages_are_bounded(tmp_path):
+    path = write_pdf(tmp_path / "resume.pdf", [["Jane Doe", "Backend engineer."], ["Skills"], ["Page three"]])
+    assert "Backend engineer." in extract_document_text(path)
+    text = extract_document_text(path, max_pages=2)
+    assert "Skills" in text
+    assert "Page three" not in text
+
+
+def test_cleanup_undoes_layout_artifacts():
+    pages = ["Jane Doe\nBuilt data pipe-\nlines for analytics\n• Python\n1", "Jane Doe\nMore text\n2", "Jane Doe\nEnd\n3"]
+    assert clean_document_text(pages) == "Built data pipelines for analytics\n- Python\nMore text\nEnd"
+
+
+def test_same_bytes_hit_the_cache(ingestor, tmp_path):
+    first = write_pdf(tmp_path / "first.pdf", [["Jane Doe", "Backend engineer."]])
+    copy = tmp_path / "copy.pdf"
+    copy.write_bytes((tmp_path / "first.pdf").read_bytes())
+    calls = []
+
+    def formatter(text):
+        calls.append(text)
+        return "# " + text
+
+    result = ingestor.format(first, formatter)
+    assert not result["cached"]
+    cached = ingestor.format(str(copy), formatter)
+    assert cached["cached"]
+    assert cached["formatted"] == result["formatted"]
+    assert len(calls) == 1
+    assert ingestor.get_stats() == {"extractions": 1, "cache_hits": 1, "formatted_hits": 1}
+
+
+def test_corrupt_and_oversized_files_are_rejected(ingestor, tmp_path):
+    corrupt_pdf = tmp_path / "corrupt.pdf"
+    corrupt_pdf.write_bytes(b"%PDF-1.4\nnot really a pdf")
+    with pytest.raises(ResumeIngestionError):
+        ingestor.extract(str(corrupt_pdf))
+
+    corrupt_docx = tmp_path / "corrupt.docx"
+    with zipfile.ZipFile(corrupt_docx, "w") as archive:
+        archive.writestr("word/document.xml", "<w:document")
+    with pytest.raises(ResumeIngestionError):
+        ingestor.extract(str(corrupt_docx))
+
+    not_word = tmp_path / "archive.zip"
+    with zipfile.ZipFile(not_word, "w") as archive:
+        archive.writestr("notes.txt", "hello")
+    with pytest.raises(ResumeIngestionError, match="not a Word document"):
+        ingestor.extract(str(not_word))
+
+    ingestor.max_bytes = 10
+    with pytest.raises(ResumeIngestionError, match="too large"):
+        ingestor.extract(str(corrupt_pdf))
+    # Nothing that failed was cached
+    assert ingestor.get_stats()["extractions"] == 0
@@ -0,0 +1,69 @@
+# tests/test_resume_patch.py
+
+import pytest
+from core.resume_patch import HEADER_SECTION, ResumePatchError, apply_patch, list_section_paths, parse_patch
+
+RESUME = """# Jane Doe
+jane@example.com
+
+## Summary
+Backend engineer.
+
+## Experience
+### Acme
+- Built APIs
+
+### Globex
+- Ran migrations
+
+## Skills
+Python, SQL
+"""
+
+
+def test_section_paths_follow_document_order():
+    assert list_section_paths(RESUME) == [HEADER_SECTION, "Summary", "Experience", "Experience/Acme",
+                                          "Experience/Globex", "Skills"]
+
+
+def test_replace_text_edits_only_the_addressed_entry():
+    patched = apply_patch(RESUME, [{"op": "replace_text", "section": "Experience/Globex",
+                                    "find": "Ran migrations", "replace": "Led migrations"}])
+    assert "- Led migrations" in patched
+    assert patched.replace("Led", "Ran") == RESUME
+
+
+def test_replace_text_requires_a_unique_match():
+    with pytest.raises(ResumePatchError, match="occurs 0 times"):
+        apply_patch(RESUME, [{"op": "replace_text", "section": "Skills", "find": "Rust", "replace": "Go"}])
+
+
+def test_replace_keeps_path_addressable_for_later_operations():
+    patched = apply_patch(RESUME, [
+        {"op": "replace", "section": "Summary", "content": "## Summary\nPlatform engineer."},
+        {"op": "replace_text", "section": "Summary", "find": "Platform", "replace": "Staff platform"},
+    ])
+    assert "## Summary\nStaff platform engineer.\n\n## Experience" in patched
+
+
+def test_insert_after_and_delete():
+    patched = apply_patch(RESUME, [
+        {"op": "insert_after", "section": "Experience/Acme", "content": "### Initech\n- Wrote reports"},
+        {"op": "delete", "section": "Experience/Globex"},
+    ])
+    assert list_section_paths(patched) == [HEADER_SECTION, "Summary", "Experience", "Experience/Acme",
+                                           "Experience/Initech", "Skills"]
+    assert "Globex" not in patched
+
+
+def test_errors_name_the_failing_operation():
+    with pytest.raises(ResumePatchError, match=r"Operation 2 \(delete\): Section 'Awards' not found"):
+        apply_patch(RESUME, [{"op": "delete", "section": "Skills"}, {"op": "delete", "section": "Awards"}])
+
+
+def test_parse_patch_accepts_fenced_json_and_rejects_other_shapes():
+    assert parse_patch('```json\n{"operations": []}\n```') == {"operations": []}
+    with pytest.raises(ResumePatchError):
+        parse_patch('{"ops": []}')
+    with pytest.raises(ResumePatchError):
+        parse_patch("not json")
@@ -0,0 +1,70 @@
+# tests/test_resume_summarizer.py
+
+import threading
+import pytest
+from core.resume_summarizer import ResumeSummarizer
+
+
+def section(title, topic, lines=12):
+    return f"## {title}\n\n" + "".join(f"- {topic} accomplishment number {i} with measurable impact\n" for i in range(lines))
+
+
+RESUME = "# Jane Doe\n\n" + section("Professional Summary", "Summary") + "\n" + section("Work Experience", "Work") + \
+    "\n" + section("Skills", "Skill") + "\n## Education\n\n- BSc - MIT, 2015\n"
+
+
+class CountingAIManager:
+    def __init__(self):
+        self.sections = []
+        self._lock = threading.Lock()
+
+    def generate_response(self, prompt_name, context):
+        assert prompt_name == "summarize_resume_section"
+        with self._lock:
+            self.sections.append(context["section"].splitlines()[0])
+        return f"Summary of {context['section'].splitlines()[0]}"
+
+
+@pytest.fixture
+def summarizer():
+    return ResumeSummarizer(CountingAIManager(), threshold=500)
+
+
+def test_each_long_section_is_summarized_once(summarizer):
+    summary = summarizer.get_summary(RESUME)
+    assert sorted(summarizer.ai_manager.sections) == ["## Professional Summary", "## Skills", "## Work Experience"]
+    # Short sections are kept verbatim, in document order
+    assert summary.index("Summary of ## Work Experience") < summary.index("- BSc - MIT, 2015")
+    assert summary.startswith("# Jane Doe")
+
+
+def test_unchanged_resume_hits_the_cache(summarizer):
+    first = summarizer.get_summary(RESUME)
+    assert summarizer.schedule(RESUME) is None
+    assert summarizer.get_summary(RESUME) == first
+    # A summary is never summarized again when it is passed back in
+    assert summarizer.get_summary(first) == first
+    assert len(summarizer.ai_manager.sections) == 3
+
+
+def test_only_changed_sections_are_summarized_again(summarizer):
+    summarizer.get_summary(RESUME)
+    edited = RESUME.replace(section("Skills", "Skill"), section("Skills", "Skill", lines=13))
+    summarizer.get_summary(edited)
+    assert summarizer.ai_manager.sections[3:] == ["## Skills"]
+
+
+def test_short_resumes_are_not_summarized(summarizer):
+    assert summarizer.get_summary("# Jane Doe\n\n## Skills\n\n- Python\n") == "# Jane Doe\n\n## Skills\n\n- Python\n"
+    assert summarizer.ai_manager.sections == []
+
+
+def test_concurrent_requests_share_one_summary(summarizer):
+    summaries = []
+    threads = [threading.Thread(target=lambda: summaries.append(summarizer.get_summary(RESUME))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(summaries)) == 1
+    assert len(summarizer.ai_manager.sections) == 3
@@ -0,0 +1,133 @@
+# tests/test_resume_tailoring.py
+
+import json
+import threading
+import time
+import pytest
+from core.context_manager import CAPTAINContextManager
+from core.resume_tailoring import ResumeTailoringPipeline, tailoring_cache_key
+from core.state_store import StateStore
+
+RESUME = """# Jane Doe
+
+## Professional Summary
+
+Backend engineer.
+
+## Work Experience
+
+### Engineer at Acme (Jan 2020 - Present)
+
+- Built APIs
+
+## Skills
+
+- Technical Skills: Python
+
+## Education
+
+- BSc - MIT, 2015
+"""
+
+
+class TailoringAIManager:
+    def __init__(self, failing=(), delay=0.0):
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def generate_response(self, prompt_name, context):
+        with self._lock:
+            self.calls.append(context)
+        time.sleep(self.delay)
+        try:
+            if context["company"] in self.failing:
+                raise RuntimeError("tailoring failed")
+            return json.dumps({"explanation": "Focused the summary", "operations": [
+                {"op": "replace_text", "section": "Professional Summary", "find": "Backend engineer.",
+                 "replace": f"Backend engineer for {context['job_description']}."}]})
+        finally:
+            with self._lock:
+                self.completed += 1
+
+
+@pytest.fixture
+def context_manager(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = StateStore(str(tmp_path / "captain.db"))
+    context_manager = CAPTAINContextManager()
+    context_manager.attach_store(store)
+    context_manager.update_master_resume(RESUME)
+    for i, (company, description) in enumerate([("Acme", "payments"), ("Globex", "search"), ("Initech", "payments"),
+                                                ("Hooli", ""), ("Umbrella", "billing")]):
+        context_manager.add_job_application(f"job{i}", {"company": company, "position": "Engineer",
+                                                        "status": "Not Started", "description": description})
+    yield context_manager
+    store.close()
+
+
+def make_pipeline(context_manager, ai_manager, concurrency=2):
+    return ResumeTailoringPipeline(context_manager, ai_manager, concurrency=concurrency,
+                                   progress_callback=lambda progress: None)
+
+
+def test_tailors_each_job_and_reuses_identical_descriptions(context_manager):
+    ai_manager = TailoringAIManager()
+    report = make_pipeline(context_manager, ai_manager).run(["job0", "job1", "job2", "job3"])
+    # job0 and job2 share a description, so only one of them is sent to the model
+    assert sorted(call["job_description"] for call in ai_manager.calls) == ["payments", "search"]
+    assert (report["tailored"], report["cached"], report["skipped"], report["failed"]) == (2, 1, 1, 0)
+    assert report["errors"] == {"job3": "No job description"}
+    for job_id, description in (("job0", "payments"), ("job1", "search"), ("job2", "payments")):
+        tailored = context_manager.get_resume_for_job(job_id)
+        assert f"Backend engineer for {description}." in tailored
+        assert "## Education" in tailored
+    assert context_manager.get_master_resume() == RESUME
+
+
+def test_rerun_hits_the_cache_until_the_master_resume_changes(context_manager):
+    ai_manager = TailoringAIManager()
+    pipeline = make_pipeline(context_manager, ai_manager)
+    first = pipeline.run(["job0", "job1"])
+    second = pipeline.run(["job0", "job1"])
+    assert len(ai_manager.calls) == 2
+    assert second["cached"] == 2
+    # Same master version and description: the existing variant is kept rather than committed again
+    assert second["variants"] == first["variants"]
+    key = tailoring_cache_key(first["resume_version"], "payments")
+    assert context_manager.store.get_value(key)["version"] == first["variants"]["job0"]
+
+    context_manager.update_master_resume(RESUME.replace("Python", "Python, Go"))
+    third = pipeline.run(["job0"])
+    assert third["tailored"] == 1
+    assert third["resume_version"] != first["resume_version"]
+    assert "Python, Go" in context_manager.get_resume_for_job("job0")
+
+
+def test_failures_are_counted_for_every_job_waiting_on_the_call(context_manager):
+    context_manager.add_job_application("job5", {"company": "Acme", "position": "Engineer", "status": "Not Started",
+                                                 "description": "payments"})
+    report = make_pipeline(context_manager, TailoringAIManager(failing={"Acme"})).run(["job0", "job1", "job5", "missing"])
+    assert (report["tailored"], report["failed"], report["skipped"]) == (1, 2, 1)
+    assert report["errors"]["job0"] == report["errors"]["job5"] == "tailoring failed"
+    assert report["errors"]["missing"] == "Job application not found"
+    assert context_manager.resume_versions.head("job0") is None
+
+
+def test_jobs_are_read_only_as_fast_as_they_are_tailored(context_manager):
+    for i in range(5, 30):
+        context_manager.add_job_application(f"job{i}", {"company": f"Company {i}", "position": "Engineer",
+                                                        "status": "Not Started", "description": f"role {i}"})
+    ai_manager = TailoringAIManager(delay=0.01)
+    read_ahead = []
+
+    def job_ids():
+        for i in range(5, 30):
+            read_ahead.append(i - 5 - ai_manager.completed)
+            yield f"job{i}"
+
+    report = make_pipeline(context_manager, ai_manager, concurrency=2).run(job_ids())
+    assert report["tailored"] == 25
+    assert max(read_ahead) <= 2 * 2
@@ -0,0 +1,105 @@
+# tests/test_resume_versions.py
+
+import random
+import pytest
+from core.resume_versions import ResumeVersionStore, apply_delta, make_delta
+from core.state_store import StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(str(tmp_path / "captain.db"))
+    yield store
+    store.close()
+
+
+def resume_texts(count, seed=3):
+    rng = random.Random(seed)
+    lines = [f"- Accomplishment {i}\n" for i in range(60)]
+    texts = []
+    for i in range(count):
+        lines[rng.randrange(len(lines))] = f"- Edited line {i}\n"
+        if i % 5 == 0:
+            lines.insert(rng.randrange(len(lines)), f"- Added line {i}\n")
+        texts.append("# Jane Doe\n\n## Work Experience\n" + "".join(lines))
+    return texts
+
+
+class CountingStore:
+    # Counts row reads so checkouts can be checked against the skip-delta bound
+    def __init__(self, store):
+        self.store, self.reads = store, 0
+
+    def get_resume_version(self, version):
+        self.reads += 1
+        return self.store.get_resume_version(version)
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+@pytest.mark.parametrize("base, text", [
+    ("a\nb\nc\n", "a\nB\nc\nd\n"),
+    ("a\nb", "a\nb\nc"),
+    ("", "new\n"),
+    ("old\n", ""),
+])
+def test_delta_round_trips(base, text):
+    assert apply_delta(base, make_delta(base, text)) == text
+
+
+def test_every_version_checks_out_cold_within_the_bound(store):
+    texts = resume_texts(70)
+    versions = [ResumeVersionStore(store, snapshot_interval=16).commit(text) for text in texts]
+    counting = CountingStore(store)
+    cold = ResumeVersionStore(counting, snapshot_interval=16, cache_size=0)
+    for version, text in zip(versions, texts):
+        counting.reads = 0
+        assert cold.checkout(version) == text
+        # The version itself plus at most log2(16) bases
+        assert counting.reads <= 1 + 4
+
+
+def test_deltas_are_smaller_than_full_copies(store):
+    texts = resume_texts(40)
+    history = ResumeVersionStore(store, snapshot_interval=16)
+    for text in texts:
+        history.commit(text)
+    stats = history.get_stats()
+    assert stats["snapshots"] == 3
+    assert stats["stored_chars"] < sum(len(text) for text in texts) / 4
+
+
+def test_unchanged_text_returns_the_parent(store):
+    history = ResumeVersionStore(store)
+    first = history.commit("# Jane Doe\n")
+    assert history.commit("# Jane Doe\n") == first
+    assert history.head() == first
+
+
+def test_variants_branch_from_the_master_head(store):
+    history = ResumeVersionStore(store)
+    master = history.commit("# Jane Doe\n\n## Skills\n- Python\n")
+    variant = history.commit("# Jane Doe\n\n## Skills\n- Python\n- Go\n", job_id="job1")
+    assert history.get_version(variant)["parent"] == master
+    assert history.head() == master
+    assert history.head("job1") == variant
+    assert history.changed_sections(master, variant) == ["Skills"]
+    assert [entry["version"] for entry in history.log()] == [master]
+    # The same text for a job is a new variant even though the master already has it
+    assert history.commit("# Jane Doe\n\n## Skills\n- Python\n", job_id="job2") != master
+
+
+def test_restoring_commits_the_old_text_as_a_new_version(store):
+    history = ResumeVersionStore(store)
+    first = history.commit("one\n")
+    history.commit("two\n")
+    restored = history.commit(history.checkout(first), message=f"Restored v{first}")
+    assert restored > first
+    assert history.checkout(restored) == "one\n"
+    assert "+one" in history.diff(restored - 1, restored)
+
+
+def test_snapshot_interval_must_be_a_power_of_two(store):
+    with pytest.raises(ValueError):
+        ResumeVersionStore(store, snapshot_interval=12)
@@ -0,0 +1,58 @@
+# tests/test_section_parser.py
+
+import pytest
+from core.section_parser import SectionParser, iter_sections, parse_sections, sections_to_lists, sections_to_text
+
+RESPONSE = """Here is your plan.
+
+1. Weekend Project:
+Build a CLI.
+  1. Parse the input
+  2. Print a report
+
+**2. Skill Improvement:**
+Learn Rust.
+
+### 3) Long-Term Plan
+Become a staff engineer.
+"""
+
+EXPECTED = [
+    ("Weekend Project", ["Build a CLI.", "1. Parse the input", "2. Print a report"]),
+    ("Skill Improvement", ["Learn Rust."]),
+    ("Long-Term Plan", ["Become a staff engineer."]),
+]
+
+
+def test_parse_sections_handles_every_header_style():
+    assert parse_sections(RESPONSE) == EXPECTED
+
+
+def test_text_before_the_first_header_is_ignored():
+    assert parse_sections("Intro only, no sections.") == []
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_chunk_boundaries_do_not_change_the_result(size):
+    chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+    assert list(iter_sections(chunks)) == EXPECTED
+
+
+def test_sections_are_emitted_as_soon_as_the_next_header_starts():
+    parser = SectionParser()
+    assert parser.feed("1. First\nbody\n") == []
+    assert parser.feed("2. Second\n") == [("First", ["body"])]
+    assert parser.close() == [("Second", [])]
+
+
+def test_a_final_line_without_newline_is_kept():
+    assert parse_sections("1. Only\nlast line") == [("Only", ["last line"])]
+
+
+def test_a_bare_number_header_has_an_empty_title():
+    assert parse_sections("1.\nbody") == [("", ["body"])]
+
+
+def test_conversions():
+    assert sections_to_lists(EXPECTED)["Skill Improvement"] == ["Learn Rust."]
+    assert sections_to_text(EXPECTED)["Weekend Project"] == "Build a CLI. 1. Parse the input 2. Print a report"
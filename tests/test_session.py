@@ -0,0 +1,86 @@
+# tests/test_session.py
+
+import sqlite3
+import threading
+import types
+import pytest
+from ui.session import DEFAULT_SESSION_ID, SessionRegistry, session_id_for
+
+
+def browser(cookie=None, username=None, session_hash="page-load"):
+    return types.SimpleNamespace(username=username, session_hash=session_hash,
+                                 cookies={"captain_session": cookie} if cookie else {})
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    registry = SessionRegistry(base_dir=str(tmp_path / "sessions"), max_sessions=1, idle_seconds=3600, per_browser=True)
+    yield registry
+    registry.close()
+
+
+def test_session_id_survives_a_page_reload():
+    assert session_id_for(browser("abc", session_hash="one"), True) == session_id_for(browser("abc", session_hash="two"), True)
+
+
+def test_session_id_falls_back_to_the_default_store():
+    assert session_id_for(None) == DEFAULT_SESSION_ID
+    assert session_id_for(browser("abc"), per_browser=False) == DEFAULT_SESSION_ID
+
+
+def test_anonymous_browsers_are_isolated_by_default():
+    assert session_id_for(browser("abc")) != session_id_for(browser("xyz"))
+    # Without a cookie the page still gets a session of its own instead of the shared store
+    assert session_id_for(browser(session_hash="one")) == "page-one"
+    assert session_id_for(browser(session_hash="one")) != session_id_for(browser(session_hash="two"))
+
+
+def test_logged_in_users_get_their_own_session():
+    alice = session_id_for(browser(username="alice"), per_browser=False)
+    assert alice != DEFAULT_SESSION_ID
+    assert alice != session_id_for(browser(username="bob"), per_browser=False)
+    assert "/" not in session_id_for(browser(username="../etc"), per_browser=False)
+
+
+def test_session_in_use_is_not_evicted(registry):
+    with registry.use(browser("a")) as first:
+        with registry.use(browser("b")):
+            pass
+        with registry.use(browser("c")):
+            pass
+        # "a" is still in use, so only the other sessions were spilled to make room
+        with registry.use(browser("a")) as again:
+            assert again is first
+
+
+def test_state_survives_eviction(registry):
+    with registry.use(browser("a")) as session:
+        session.context_manager.add_job_application("job1", {"company": "Acme", "position": "Engineer", "status": "Applied"})
+    with registry.use(browser("b")):
+        pass
+    assert len(registry) == 1
+    with registry.use(browser("a")) as session:
+        assert session.context_manager.get_job_application("job1")["company"] == "Acme"
+
+
+def test_evicted_session_closes_its_store(registry):
+    with registry.use(browser("a")) as first:
+        pass
+    with registry.use(browser("b")):
+        pass
+    with pytest.raises(sqlite3.ProgrammingError):
+        first.data_manager.store.get_value("master_resume")
+
+
+def test_concurrent_first_requests_load_one_session(registry):
+    sessions = []
+    threads = [threading.Thread(target=lambda: sessions.append(registry.acquire(browser("a")))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(session is sessions[0] for session in sessions)
+    assert sessions[0].users == 4
+    for session in sessions:
+        registry.release(session)
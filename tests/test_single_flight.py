@@ -0,0 +1,141 @@
+# tests/test_single_flight.py
+
+import asyncio
+import threading
+import time
+import pytest
+from core.single_flight import AbandonedCallError, SingleFlight
+
+
+def run_concurrently(count, target):
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(target())
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def slow(value, calls, delay=0.2):
+    def fn():
+        calls.append(1)
+        time.sleep(delay)
+        return value
+    return fn
+
+
+def test_concurrent_calls_share_one_upstream_call():
+    flight, calls = SingleFlight(), []
+    results, errors = run_concurrently(5, lambda: flight.do("key", slow("value", calls)))
+    assert results == ["value"] * 5 and not errors
+    assert len(calls) == 1
+    assert flight.get_stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_are_not_shared():
+    flight, calls = SingleFlight(), []
+    assert flight.do("a", slow(1, calls, 0)) == 1
+    assert flight.do("b", slow(2, calls, 0)) == 2
+    assert len(calls) == 2
+
+
+def test_sequential_calls_run_again():
+    flight, calls = SingleFlight(), []
+    flight.do("key", slow(1, calls, 0))
+    flight.do("key", slow(1, calls, 0))
+    assert len(calls) == 2
+
+
+def test_every_waiter_gets_the_error():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.2)
+        raise ValueError("upstream failed")
+
+    results, errors = run_concurrently(4, lambda: flight.do("key", fail))
+    assert not results
+    assert len(errors) == 4 and all(isinstance(error, ValueError) for error in errors)
+
+
+def test_async_callers_on_different_loops_share_a_call():
+    flight, calls = SingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.2)
+        return "value"
+
+    results, errors = run_concurrently(3, lambda: asyncio.run(flight.ado("key", fetch)))
+    assert results == ["value"] * 3 and not errors
+    assert len(calls) == 1
+
+
+def test_followers_of_a_cancelled_leader_see_an_abandoned_call():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    async def hang():
+        started.set()
+        await asyncio.sleep(10)
+
+    async def cancelled_leader():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.ado("key", hang), 0.3)
+
+    leader = threading.Thread(target=lambda: asyncio.run(cancelled_leader()))
+    leader.start()
+    assert started.wait(5)
+    with pytest.raises(AbandonedCallError):
+        flight.do("key", lambda: "never called")
+    leader.join(5)
+
+
+def test_stream_followers_replay_then_follow_live():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def chunks():
+        yield "a"
+        yield "b"
+        release.wait(5)
+        yield "c"
+
+    leader = flight.stream("key", chunks)
+    assert next(leader) == "a" and next(leader) == "b"
+    follower_result = []
+    follower = threading.Thread(target=lambda: follower_result.extend(flight.stream("key", lambda: iter(["x"]))))
+    follower.start()
+    release.set()
+    assert list(leader) == ["c"]
+    follower.join(5)
+    assert follower_result == ["a", "b", "c"]
+
+
+def test_stream_followers_are_released_when_the_leader_stops_early():
+    flight = SingleFlight()
+    leader = flight.stream("key", lambda: iter(["a", "b", "c"]))
+    assert next(leader) == "a"
+    errors = []
+
+    def follow():
+        try:
+            list(flight.stream("key", lambda: iter([])))
+        except AbandonedCallError as e:
+            errors.append(e)
+
+    follower = threading.Thread(target=follow)
+    follower.start()
+    time.sleep(0.1)
+    leader.close()
+    follower.join(5)
+    assert not follower.is_alive()
+    assert len(errors) == 1
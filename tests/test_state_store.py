@@ -0,0 +1,75 @@
+# tests/test_state_store.py
+
+import json
+import pytest
+from core.context_manager import CAPTAINContextManager
+from core.data_manager import DataManager
+from core.state_store import StateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(str(tmp_path / "captain.db"))
+    yield store
+    store.close()
+
+
+def test_upsert_replaces_the_row(store):
+    store.upsert_application("a", {"company": "Acme", "status": "Not Started"})
+    store.upsert_application("a", {"company": "Acme", "status": "Applied"})
+    assert store.count_applications() == 1
+    assert store.get_application("a")["status"] == "Applied"
+    assert list(store.get_applications_by_status("Applied")) == ["a"]
+
+
+def test_transaction_rolls_back_as_a_whole(store):
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.upsert_application("a", {"company": "Acme"})
+            with store.transaction():
+                store.set_value("resume", "text")
+            raise RuntimeError("abort")
+    assert store.count_applications() == 0
+    assert store.get_value("resume") is None
+
+
+def test_values_round_trip_as_json(store):
+    store.set_value("insights", {"skills": ["Python"]})
+    assert store.get_value("insights") == {"skills": ["Python"]}
+    assert store.get_value("missing", "default") == "default"
+
+
+def test_migrate_from_files_runs_once(store, tmp_path):
+    resume_file, applications_file = tmp_path / "resume.md", tmp_path / "job_applications.json"
+    resume_file.write_text("# Jane Doe")
+    applications_file.write_text(json.dumps({"a": {"company": "Acme", "status": "Applied"}}))
+    assert store.migrate_from_files(str(resume_file), str(applications_file))
+    assert store.get_value("master_resume") == "# Jane Doe"
+    assert store.get_application("a")["company"] == "Acme"
+
+    resume_file.write_text("# Someone Else")
+    assert not store.migrate_from_files(str(resume_file), str(applications_file))
+    assert store.get_value("master_resume") == "# Jane Doe"
+
+
+def test_migration_keeps_a_resume_already_in_the_store(store, tmp_path):
+    store.set_value("master_resume", "# Stored")
+    resume_file = tmp_path / "resume.md"
+    resume_file.write_text("# From file")
+    store.migrate_from_files(str(resume_file), str(tmp_path / "missing.json"))
+    assert store.get_value("master_resume") == "# Stored"
+
+
+def test_state_survives_a_restart(tmp_path):
+    context_manager = CAPTAINContextManager()
+    data_manager = DataManager(context_manager, data_dir=str(tmp_path))
+    data_manager.load_state()
+    context_manager.add_job_application("a", {"company": "Acme", "position": "Engineer", "status": "Not Started"})
+    context_manager.update_job_application("a", {"status": "Applied"})
+    context_manager.update_master_resume("# Jane Doe\n\n## Skills\n\n- Python\n")
+    data_manager.store.close()
+
+    restarted = CAPTAINContextManager()
+    DataManager(restarted, data_dir=str(tmp_path)).load_state()
+    assert restarted.get_job_application("a")["status"] == "Applied"
+    assert restarted.get_master_resume().startswith("# Jane Doe")
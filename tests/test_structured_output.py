@@ -0,0 +1,76 @@
+# tests/test_structured_output.py
+
+import pytest
+from core.structured_output import (StructuredOutputError, TolerantJSONParser, parse_json_response, parse_structured,
+                                    validate)
+
+SCHEMA = {"type": "object", "required": ["skills", "score"],
+          "properties": {"skills": {"type": "array", "items": {"type": "string"}}, "score": {"type": "integer"},
+                         "summary": {"type": "string"}, "remote": {"type": "boolean"}}}
+
+
+def test_prose_fences_and_trailing_commas_are_dropped():
+    response = 'Sure! Here it is:\n```json\n{"skills": ["Python", "SQL",], "score": 7,}\n```\nAnything else?'
+    assert parse_json_response(response) == {"skills": ["Python", "SQL"], "score": 7}
+
+
+def test_python_literals_outside_strings_are_converted():
+    assert parse_json_response('{"remote": True, "note": "True story", "x": None}') == \
+        {"remote": True, "note": "True story", "x": None}
+
+
+def test_braces_and_escapes_inside_strings_are_kept():
+    assert parse_json_response(r'{"a": "} { ] [", "b": "say \"hi\"", "c": "back\\slash"}') == \
+        {"a": "} { ] [", "b": 'say "hi"', "c": "back\\slash"}
+
+
+def test_raw_newlines_inside_strings_are_accepted():
+    assert parse_json_response('{"a": "line one\nline two"}') == {"a": "line one\nline two"}
+
+
+def test_text_after_the_value_is_ignored():
+    assert parse_json_response('{"a": 1} and then {"b": 2}') == {"a": 1}
+
+
+def test_chunked_feed_matches_a_single_feed():
+    response = '```json\n{"skills": ["Python", "Go"], "score": "8", "summary": "ok"}\n```'
+    parser = TolerantJSONParser()
+    for char in response:
+        parser.feed(char)
+    assert parser.complete
+    assert parser.result() == parse_json_response(response)
+
+
+@pytest.mark.parametrize("prefix, expected", [
+    ('{"skills": ["Pyt', {"skills": ["Pyt"]}),
+    ('{"skills": ["Python", "SQL"], "sco', {"skills": ["Python", "SQL"]}),
+    ('{"skills": ["Python"], "score":', {"skills": ["Python"]}),
+    ('{"a": "x\\', {"a": "x"}),
+    ('Thinking...', None),
+])
+def test_partial_values_while_streaming(prefix, expected):
+    parser = TolerantJSONParser()
+    parser.feed(prefix)
+    assert not parser.complete
+    assert parser.partial() == expected
+
+
+def test_missing_json_is_an_error():
+    with pytest.raises(StructuredOutputError):
+        parse_json_response("I could not do that.")
+
+
+def test_validate_coerces_harmless_mismatches():
+    data = {"skills": "- Python\n- SQL\n", "score": "7", "summary": ["a", "b"]}
+    assert validate(data, SCHEMA) == {"skills": ["Python", "SQL"], "score": 7, "summary": "a\nb"}
+
+
+@pytest.mark.parametrize("response", [
+    '{"skills": ["Python"]}',
+    '{"skills": ["Python"], "score": "high"}',
+    '{"skills": ["Python"], "score": 1, "remote": "yes"}',
+    '["Python"]',
+])
+def test_parse_structured_rejects_schema_violations(response):
+    with pytest.raises(StructuredOutputError):
+        parse_structured(response, SCHEMA)
@@ -0,0 +1,65 @@
+# tests/test_token_budget.py
+
+import json
+from core.context_manager import CAPTAINContextManager
+from utils.token_counter import count_tokens, truncate_to_tokens
+
+TEXT = "Led the migration of a billing platform to event sourcing, cutting reconciliation time by 80 percent. " * 40
+
+
+def test_short_text_is_not_truncated():
+    text, tokens, truncated = truncate_to_tokens("Short text.", 100)
+    assert (text, truncated) == ("Short text.", False)
+    assert tokens == count_tokens("Short text.")
+
+
+def test_long_text_is_cut_to_the_budget():
+    text, tokens, truncated = truncate_to_tokens(TEXT, 50)
+    assert truncated
+    assert tokens == 50
+    assert TEXT.startswith(text)
+    assert count_tokens(text) <= 51
+
+
+def test_a_negative_budget_gives_nothing():
+    assert truncate_to_tokens(TEXT, -5)[0] == ""
+
+
+def build_context_manager(count=120):
+    context_manager = CAPTAINContextManager()
+    statuses = ["Rejected", "Not Started", "Applied", "Interview Scheduled"]
+    for i in range(count):
+        context_manager.add_job_application(f"job{i:03d}", {
+            "company": f"Company {i}", "position": "Backend Engineer", "status": statuses[i % len(statuses)],
+            "description": TEXT,
+        })
+    context_manager.update_master_resume("# Jane Doe\n\n## Work Experience\n" + TEXT * 3)
+    return context_manager
+
+
+def test_captain_context_stays_within_the_budget():
+    context = build_context_manager().build_captain_context(token_budget=1500)
+    report = context["truncation_report"]
+    assert report["tokens_used"] <= 1500
+    assert report["resume_truncated"]
+    assert report["applications_included"] + report["applications_omitted"] == 120
+    assert sum(report["applications_omitted_by_status"].values()) == report["applications_omitted"]
+    used = sum(count_tokens(context[key]) for key in ("applications", "master_resume", "job_market_trends",
+                                                      "skill_gaps", "recent_history"))
+    assert used <= 1500
+
+
+def test_actionable_applications_are_packed_first():
+    context = build_context_manager().build_captain_context(token_budget=1500)
+    included = json.loads(context["applications"])
+    assert included and included[0]["status"] == "Interview Scheduled"
+    assert "Rejected" in context["truncation_report"]["applications_omitted_by_status"]
+    # Full descriptions never go into the compact records
+    assert all("description" not in record for record in included)
+
+
+def test_everything_fits_a_large_budget():
+    report = build_context_manager(10).build_captain_context(token_budget=100000)["truncation_report"]
+    assert report["applications_omitted"] == 0
+    assert not report["resume_truncated"]
+    assert not report["history_truncated"]
@@ -0,0 +1,75 @@
+# tests/test_vector_index.py
+
+import json
+import os
+import numpy as np
+from core.vector_index import HashingEmbedder, VectorIndex, chunk_text
+
+PYTHON_JOB = "Senior Python engineer building Django APIs and PostgreSQL data pipelines."
+DESIGN_JOB = "Product designer for mobile apps, owning Figma prototypes and user research."
+SALES_JOB = "Enterprise account executive closing SaaS deals with Fortune 500 customers."
+
+
+def make_index(directory=None):
+    return VectorIndex(str(directory) if directory else None, embedder=HashingEmbedder(256), chunk_chars=200)
+
+
+def test_chunks_never_straddle_sections():
+    chunks = chunk_text("## Skills\nPython\n\n## Experience\nAcme", max_chars=200)
+    assert len(chunks) == 2
+    assert "Acme" not in chunks[0]
+
+
+def test_add_and_search_rank_the_closest_document_first():
+    index = make_index()
+    assert index.add("py", PYTHON_JOB)
+    index.add("design", DESIGN_JOB)
+    index.add("sales", SALES_JOB)
+    assert not index.add("py", PYTHON_JOB)
+    assert index.search("Python Django developer", k=1)[0][0] == "py"
+    assert [doc_id for doc_id, _ in index.similar_to("py", k=5)] == [doc_id for doc_id, _ in index.rank(PYTHON_JOB)][1:]
+    assert index.search("Python", kind="resume") == []
+
+
+def test_sync_reembeds_changed_documents_and_drops_missing_ones():
+    index = make_index()
+    index.sync({"py": PYTHON_JOB, "design": DESIGN_JOB})
+    assert index.sync({"py": PYTHON_JOB, "sales": SALES_JOB}) == 1
+    assert "design" not in index
+    assert index.search("Figma prototypes", k=1)[0][0] != "design"
+    index.sync({"py": SALES_JOB, "sales": SALES_JOB})
+    assert index.search("Django PostgreSQL", k=1)[0][1] < 0.5
+
+
+def test_save_and_load_round_trip(tmp_path):
+    index = make_index(tmp_path)
+    index.sync({"py": PYTHON_JOB, "design": DESIGN_JOB, "sales": SALES_JOB})
+    index.remove("sales")
+    index.save()
+    reloaded = make_index(tmp_path)
+    assert len(reloaded) == 2
+    assert reloaded.search("Django APIs", k=2) == index.search("Django APIs", k=2)
+    # Incremental updates on top of the memory-mapped matrix
+    assert reloaded.sync({"py": PYTHON_JOB, "design": DESIGN_JOB}) == 0
+    reloaded.add("sales", SALES_JOB)
+    reloaded.save()
+    assert make_index(tmp_path).search("SaaS deals", k=1)[0][0] == "sales"
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".npy")] == ["vectors-2.npy"]
+
+
+def test_metadata_never_points_at_a_matrix_it_was_not_saved_with(tmp_path):
+    index = make_index(tmp_path)
+    index.sync({"py": PYTHON_JOB, "design": DESIGN_JOB})
+    index.save()
+    expected = index.search("Django", k=2)
+    # A crash after the next save wrote its matrix but before it replaced index.json
+    np.save(tmp_path / "vectors-2.npy", np.ones((5, 256), dtype=np.float32))
+    assert make_index(tmp_path).search("Django", k=2) == expected
+
+    # A matrix whose row count disagrees with the metadata is discarded rather than misread
+    with open(tmp_path / "index.json") as f:
+        meta = json.load(f)
+    meta["matrix"] = "vectors-2.npy"
+    with open(tmp_path / "index.json", "w") as f:
+        json.dump(meta, f)
+    assert len(make_index(tmp_path)) == 0
@@ -1,38 +1,32 @@
 # ui/app.py
 
 import gradio as gr
-from core.context_manager import CAPTAINContextManager
-from core.ai_manager import AIManager
 from ui.resume_tab import create_resume_tab
 from ui.job_applications_tab import create_job_applications_tab
 from ui.captain_tab import create_captain_tab
-from core.resume_manager import ResumeManager
-from ai.resume_ai import ResumeAI
-from ai.captain_ai import CaptainAI
+from ui.session import SessionRegistry
 
-def create_app():
-    context_manager = CAPTAINContextManager()
-    ai_manager = AIManager()
-    resume_manager = ResumeManager()
-    resume_ai = ResumeAI(ai_manager, context_manager, resume_manager)
-    captain_ai = CaptainAI(ai_manager, context_manager)
+def create_app(sessions: SessionRegistry = None):
+    # One registry per process: each user gets their own state, all of them share the LLM client
+    sessions = sessions if sessions is not None else SessionRegistry()
 
-    with gr.Blocks(title="CAPTAIN - AI-Powered Job Application Tracker") as app:
+    with gr.Blocks(title="CAPTAIN - AI-Powered Job Application Tracker", head=sessions.head_html) as app:
         gr.Markdown("# CAPTAIN: Comprehensive AI-Powered Tracking And INtegration")
         
         with gr.Tabs():
             with gr.TabItem("Resume"):
-                create_resume_tab(context_manager, ai_manager, resume_manager, resume_ai)
+                create_resume_tab(app, sessions)
             
             with gr.TabItem("Job Opportunities"):
-                create_job_applications_tab(context_manager, ai_manager)
+                create_job_applications_tab(app, sessions)
             
             with gr.TabItem("Captain's Overview"):
-                create_captain_tab(context_manager, ai_manager, captain_ai)
+                create_captain_tab(app, sessions)
 
-        # TODO: Implement loading saved state on app start
-        # TODO: Implement saving state on app close
+        # Session state is loaded on first use and every change is committed to its store as it happens
 
+    # Streaming handlers are generators, which Gradio only runs through the queue
+    app.queue()
     return app
 
 if __name__ == "__main__":
@@ -1,31 +1,93 @@
+import asyncio
 import gradio as gr
-from ai.captain_ai import CaptainAI
+from core.conversation_memory import CAPTAIN_SCOPE
+from ui.session import SessionRegistry
 
-def create_captain_tab(context_manager, ai_manager, captain_ai):
+def create_captain_tab(app: gr.Blocks, sessions: SessionRegistry):
     with gr.Column():
         gr.Markdown("## Captain's Overview")
         
-        overview_button = gr.Button("Generate Job Search Overview")
+        with gr.Row():
+            overview_button = gr.Button("Generate Job Search Overview")
+            full_report_button = gr.Button("Generate Full Report")
+            stats_button = gr.Button("Show Application Stats")
+        with gr.Row():
+            section_choice = gr.Dropdown(
+                label="Report Section",
+                choices=["Weekend Project", "Skill Improvement", "Long-Term Career Plan"],
+                value="Weekend Project"
+            )
+            section_button = gr.Button("Generate Section")
         overview_output = gr.Markdown()
+        stats_output = gr.JSON(label="Application Stats")
         
         gr.Markdown("## Captain Chat")
         chatbot = gr.Chatbot()
         msg = gr.Textbox()
         clear = gr.Button("Clear")
 
-    def generate_overview():
-        overview = captain_ai.generate_job_search_overview()
-        return overview
+    def generate_overview(request: gr.Request):
+        overview = ""
+        with sessions.use(request) as session:
+            for chunk in session.captain_ai.stream_job_search_overview():
+                overview += chunk
+                yield overview
 
-    def chat(message, history):
-        response = captain_ai.ai_manager.chat(message)
-        history.append((message, response))
-        return "", history
+    def generate_section(label, request: gr.Request):
+        # Each numbered section is rendered as soon as the next one starts streaming
+        name = label.lower().replace(" ", "_").replace("-", "_")
+        parts = []
+        with sessions.use(request) as session:
+            for title, body in session.captain_ai.stream_report_section(name):
+                parts.append(f"**{title}**\n\n{body}")
+                yield "\n\n".join(parts)
 
-    def clear_chat():
-        captain_ai.ai_manager.memory.clear()
+    async def generate_full_report(request: gr.Request):
+        # Loading a session reads its store, so it is kept off the event loop
+        session = await asyncio.to_thread(sessions.acquire, request)
+        try:
+            report = await session.captain_ai.agenerate_full_report()
+        finally:
+            sessions.release(session)
+        return format_report(report)
+
+    def format_report(report):
+        parts = []
+        for name, section in report["sections"].items():
+            parts.append(f"### {name.replace('_', ' ').title()}")
+            if isinstance(section, dict):
+                for title, body in section.items():
+                    body = "\n".join(body) if isinstance(body, list) else body
+                    parts.append(f"**{title.strip()}**\n\n{body.strip()}")
+            elif isinstance(section, list):
+                parts.append("\n".join(section))
+            else:
+                parts.append(section)
+        for name, error in report["errors"].items():
+            parts.append(f"*{name.replace('_', ' ').title()} unavailable: {error}*")
+        return "\n\n".join(parts)
+
+    def show_stats(request: gr.Request):
+        with sessions.use(request) as session:
+            return session.context_manager.get_application_stats()
+
+    def chat(message, history, request: gr.Request):
+        history = (history or []) + [(message, "")]
+        response = ""
+        with sessions.use(request) as session:
+            for chunk in session.ai_manager.stream_chat(message, CAPTAIN_SCOPE):
+                response += chunk
+                history[-1] = (message, response)
+                yield "", history
+
+    def clear_chat(request: gr.Request):
+        with sessions.use(request) as session:
+            session.ai_manager.conversations.clear(CAPTAIN_SCOPE)
         return None
 
     overview_button.click(generate_overview, outputs=[overview_output])
+    section_button.click(generate_section, inputs=[section_choice], outputs=[overview_output])
+    full_report_button.click(generate_full_report, outputs=[overview_output])
+    stats_button.click(show_stats, outputs=[stats_output])
     msg.submit(chat, [msg, chatbot], [msg, chatbot])
     clear.click(clear_chat, outputs=[chatbot])
@@ -1,38 +1,133 @@
 # ui/job_applications_tab.py
 
+import uuid
 import gradio as gr
-from core.context_manager import CAPTAINContextManager
-from core.ai_manager import AIManager
-from ai.job_opportunity_ai import JobOpportunityAI
+from config import JOB_LIST_PAGE_SIZE
+from ui.session import SessionRegistry
 
-def create_job_applications_tab(context_manager: CAPTAINContextManager, ai_manager: AIManager):
-    job_ai = JobOpportunityAI(ai_manager, context_manager)
+APPLICATION_STATUSES = ["Not Started", "Applied", "Interview Scheduled", "Offer Received", "Rejected"]
+
+
+def job_choice_label(job_id, application):
+    return f"{application.get('position', 'Unknown position')} at {application.get('company', 'Unknown company')} #{job_id}"
+
+
+def job_id_from_choice(choice):
+    return choice.rsplit("#", 1)[1] if choice and "#" in choice else None
+
+
+def create_job_applications_tab(app: gr.Blocks, sessions: SessionRegistry):
+    def job_choices(session, statuses=None, company=None):
+        # Served from the secondary indexes: only one page of the most recently updated matches is materialized
+        applications = session.context_manager.query_applications(status=statuses or None, company=company.strip() if company else None,
+                                                          sort_by="updated_at", limit=JOB_LIST_PAGE_SIZE)
+        return [job_choice_label(job_id, application) for job_id, application in applications]
 
     with gr.Column():
         gr.Markdown("## Job Applications")
-        
+
         with gr.Row():
             with gr.Column():
                 company_input = gr.Textbox(label="Company")
                 position_input = gr.Textbox(label="Position")
                 job_description_input = gr.Textbox(label="Job Description", lines=5)
                 add_job_button = gr.Button("Add Job Application")
-            
+
             with gr.Column():
+                with gr.Row():
+                    status_filter = gr.Dropdown(choices=APPLICATION_STATUSES, multiselect=True, label="Filter by status")
+                    company_filter = gr.Textbox(label="Filter by company")
                 job_list = gr.Dropdown(choices=[], label="Select a job application")
-                status_dropdown = gr.Dropdown(choices=["Not Started", "Applied", "Interview Scheduled", "Offer Received", "Rejected"], label="Application Status")
+                status_dropdown = gr.Dropdown(choices=APPLICATION_STATUSES, label="Application Status")
                 update_status_button = gr.Button("Update Status")
-        
+                status_output = gr.Markdown()
+
+        with gr.Row():
+            rank_button = gr.Button("Rank Jobs Against My Resume")
+        ranking_output = gr.Markdown()
+
         # Chatbot for job-specific interactions
         chatbot = gr.Chatbot()
         msg = gr.Textbox(label="Chat with Job AI")
         clear = gr.Button("Clear Chat")
 
-    def chat(message, history):
-        # Use ai_manager to generate a response
-        response = ai_manager.chat(message)
-        history.append((message, response))
-        return "", history
+    def refresh_job_list(statuses, company, request: gr.Request):
+        with sessions.use(request) as session:
+            return gr.update(choices=job_choices(session, statuses, company), value=None)
+
+    def add_job(company, position, job_description, statuses, company_filter_value, request: gr.Request):
+        if not company.strip() or not position.strip():
+            return gr.update(), "Company and position are required."
+        job_id = uuid.uuid4().hex[:8]
+        with sessions.use(request) as session:
+            session.context_manager.add_job_application(job_id, {
+                "company": company.strip(),
+                "position": position.strip(),
+                "description": job_description,
+                "status": "Not Started"
+            })
+            choices = job_choices(session, statuses, company_filter_value)
+            label = job_choice_label(job_id, session.context_manager.get_job_application(job_id))
+        return gr.update(choices=choices, value=label), f"Added {position} at {company}."
+
+    def select_job(choice, request: gr.Request):
+        # The chat pane is per job; the selected job's history lives in its own memory scope
+        job_id = job_id_from_choice(choice)
+        if not job_id:
+            return None, None
+        with sessions.use(request) as session:
+            return session.context_manager.get_job_application(job_id).get("status"), None
+
+    def clear_chat(choice, request: gr.Request):
+        job_id = job_id_from_choice(choice)
+        if job_id:
+            with sessions.use(request) as session:
+                session.job_ai.clear_navigator_chat(job_id)
+        return None
+
+    def update_status(choice, new_status, statuses, company, request: gr.Request):
+        job_id = job_id_from_choice(choice)
+        if not job_id or not new_status:
+            return gr.update(), "Select a job application and a status first."
+        with sessions.use(request) as session:
+            try:
+                result = session.job_ai.update_application_status(job_id, new_status)
+            except Exception as e:
+                return gr.update(), f"Error updating status: {str(e)}"
+            notes = "\n\n".join(f"**{key.replace('_', ' ').title()}**: {value}" for key, value in result.items())
+            return gr.update(choices=job_choices(session, statuses, company), value=choice), notes
+
+    def rank_jobs(statuses, request: gr.Request):
+        with sessions.use(request) as session:
+            ranked = session.job_ai.rank_jobs(top_k=JOB_LIST_PAGE_SIZE, status=statuses or None)
+        if not ranked:
+            return "Add a resume and some job applications to rank them."
+        rows = [f"| {job['score']:.3f} | {job['position']} | {job['company']} | {job['status']} |" for job in ranked]
+        return "\n".join(["| Match | Position | Company | Status |", "|---|---|---|---|"] + rows)
+
+    def chat(message, history, choice, request: gr.Request):
+        # Stream the reply so the first tokens show up as soon as they are generated
+        history = (history or []) + [(message, "")]
+        job_id = job_id_from_choice(choice)
+        if not job_id:
+            history[-1] = (message, "Select a job application to chat about it.")
+            yield "", history
+            return
+        response = ""
+        with sessions.use(request) as session:
+            for chunk in session.job_ai.stream_navigator_chat(job_id, message):
+                response += chunk
+                history[-1] = (message, response)
+                yield "", history
 
-    msg.submit(chat, inputs=[msg, chatbot], outputs=[msg, chatbot])
-    clear.click(lambda: None, None, chatbot, queue=False)
+    app.load(refresh_job_list, inputs=[status_filter, company_filter], outputs=[job_list])
+    status_filter.change(refresh_job_list, inputs=[status_filter, company_filter], outputs=[job_list])
+    company_filter.submit(refresh_job_list, inputs=[status_filter, company_filter], outputs=[job_list])
+    add_job_button.click(add_job, inputs=[company_input, position_input, job_description_input, status_filter, company_filter],
+                         outputs=[job_list, status_output])
+    rank_button.click(rank_jobs, inputs=[status_filter], outputs=[ranking_output])
+    job_list.change(select_job, inputs=[job_list], outputs=[status_dropdown, chatbot])
+    update_status_button.click(update_status, inputs=[job_list, status_dropdown, status_filter, company_filter],
+                               outputs=[job_list, status_output])
+    msg.submit(chat, inputs=[msg, chatbot, job_list], outputs=[msg, chatbot])
+    clear.click(clear_chat, inputs=[job_list], outputs=[chatbot], queue=False)
@@ -1,14 +1,13 @@
 # ui/resume_tab.py
 
+import time
 import gradio as gr
-from core.context_manager import CAPTAINContextManager
-from core.ai_manager import AIManager
-from core.resume_manager import ResumeManager
-from ai.resume_ai import ResumeAI
-from langchain_community.document_loaders import TextLoader
-from langchain_text_splitters import CharacterTextSplitter
-
-def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIManager, resume_manager: ResumeManager, resume_ai: ResumeAI):
+from config import RESUME_HISTORY_LIST_SIZE
+from core.conversation_memory import RESUME_SCOPE
+from core.resume_ingestion import ResumeIngestionError, get_resume_ingestor
+from ui.session import SessionRegistry
+
+def create_resume_tab(app: gr.Blocks, sessions: SessionRegistry):
     with gr.Blocks() as resume_tab:
         resume_status = gr.Markdown("Resume Status: Not uploaded")
         
@@ -21,9 +20,8 @@ def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIMana
 
             with gr.Column(scale=1):
                 gr.Markdown("## Current Resume")
-                resume_display = gr.Markdown(value=context_manager.get_master_resume())
+                resume_display = gr.Markdown()
                 resume_editor = gr.TextArea(
-                    value=context_manager.get_master_resume(),
                     label="Edit Your Resume (Markdown)",
                     lines=20,
                     max_lines=30,
@@ -37,71 +35,103 @@ def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIMana
         with gr.Accordion("Resume Input", open=False):
             with gr.Row():
                 with gr.Column(scale=1):
-                    resume_file = gr.File(label="Upload Resume (PDF or TXT)")
+                    resume_file = gr.File(label="Upload Resume (PDF, DOCX or TXT)", file_types=[".pdf", ".docx", ".txt", ".md"])
                 with gr.Column(scale=1):
                     resume_text_input = gr.Textbox(label="Or paste your resume here", lines=5)
             add_resume_button = gr.Button("Add Resume")
 
-    def process_resume(file_or_text):
+        with gr.Accordion("Resume History", open=False):
+            with gr.Row():
+                version_dropdown = gr.Dropdown(label="Version", choices=[], interactive=True)
+                refresh_versions_btn = gr.Button("Refresh")
+            with gr.Row():
+                show_changes_btn = gr.Button("Show Changes Since Version")
+                restore_version_btn = gr.Button("Restore Version")
+            version_diff = gr.Markdown()
+
+    def load_resume(request: gr.Request):
+        with sessions.use(request) as session:
+            resume = session.context_manager.get_master_resume()
+        return resume, resume
+
+    def format_resume(session, content):
+        return session.resume_ai.format_resume(content)
+
+    def process_resume(session, file_or_text):
+        # Yields status messages while working; the last item is (status, formatted_resume)
         if file_or_text is None:
-            return "No resume content provided.", ""
-
-        if isinstance(file_or_text, str):
-            # Text input
-            content = file_or_text
-        elif hasattr(file_or_text, 'name'):  # Check if it's a file object
-            # File input
-            try:
-                content = file_or_text.read().decode('utf-8')
-            except AttributeError:
-                return "Invalid file format.", ""
-        else:
-            return "Invalid input type.", ""
+            yield "No resume content provided.", ""
+            return
 
-        # Use AI to convert and format the resume
         try:
-            formatted_resume = ai_manager.generate_response("format_resume", {"resume_content": content})
-            resume_ai.update_resume(formatted_resume)
-            context_manager.update_master_resume(formatted_resume)
-            return "Resume processed successfully.", formatted_resume
+            if isinstance(file_or_text, str):
+                # Text input
+                formatted_resume = format_resume(session, file_or_text)
+            elif getattr(file_or_text, 'name', ''):
+                # Gradio hands uploads over as temp files; only the path is passed on, never the contents
+                ingestor = get_resume_ingestor()
+                yield "Resume Status: Extracting text...", None
+                extracted = ingestor.extract(file_or_text.name)
+                if extracted["formatted"] is None:
+                    yield "Resume Status: Formatting...", None
+                formatted_resume = ingestor.format(file_or_text.name,
+                                                   lambda text: format_resume(session, text))["formatted"]
+            else:
+                yield "Invalid input type.", ""
+                return
+            session.resume_ai.update_resume(formatted_resume, "Uploaded resume")
+            yield "Resume processed successfully.", formatted_resume
+        except ResumeIngestionError as e:
+            yield f"Error processing resume: {str(e)}", ""
         except Exception as e:
             print(f"Error processing resume: {str(e)}")  # For debugging
-            return f"Error processing resume: {str(e)}", ""
+            yield f"Error processing resume: {str(e)}", ""
 
-    def add_resume(file, text):
-        try:
-            if file is not None and file.name != '':
-                status, formatted_resume = process_resume(file)
-            elif text:
-                status, formatted_resume = process_resume(text)
-            else:
-                status, formatted_resume = "No resume content provided.", ""
-            
-            if formatted_resume:
-                context_manager.update_master_resume(formatted_resume)
-                resume_manager.update_resume(formatted_resume)
-                resume_ai.update_resume(formatted_resume)
-            
-            print(f"Resume added. Length: {len(formatted_resume)}")  # Debug print
-            return status, formatted_resume, formatted_resume
-        except Exception as e:
-            error_message = f"Error processing resume: {str(e)}"
-            return error_message, "", ""
-
-    def chat(message, history, current_content):
-        if message.lower().startswith(("edit", "change", "update", "modify")):
-            updated_resume, explanation = handle_resume_edit(message, current_content)
-            response = f"I've made the following changes:\n\n{explanation}"
-            if updated_resume != current_content:
-                current_content = updated_resume
-                status = f"Resume Status: Updated (Length: {len(current_content)})"
-            else:
-                status = gr.update()  # No change in status
+    def add_resume(file, text, request: gr.Request):
+        if file is not None and file.name != '':
+            source = file
+        elif text:
+            source = text
         else:
-            response = resume_ai.chat_about_resume(message)
-            status = gr.update()  # No change in status
-        history.append((message, response))
-        return "", history, current_content, current_content, status
+            yield "No resume content provided.", gr.update(), gr.update()
+            return
+
+        with sessions.use(request) as session:
+            for status, formatted_resume in process_resume(session, source):
+                if formatted_resume is None:
+                    yield status, gr.update(), gr.update()
+                elif formatted_resume:
+                    yield status, formatted_resume, formatted_resume
+                else:
+                    yield status, gr.update(), gr.update()
+
+    def chat(message, history, current_content, request: gr.Request):
+        history = history or []
+        with sessions.use(request) as session:
+            if message.lower().startswith(("edit", "change", "update", "modify")):
+                updated_resume, explanation = handle_resume_edit(session, message, current_content)
+                response = f"I've made the following changes:\n\n{explanation}"
+                if updated_resume != current_content:
+                    current_content = updated_resume
+                    status = f"Resume Status: Updated (Length: {len(current_content)})"
+                else:
+                    status = gr.update()  # No change in status
+                history.append((message, response))
+                yield "", history, current_content, current_content, status
+                return
+
+            # Plain questions are streamed; the resume itself is untouched
+            history = history + [(message, "")]
+            response = ""
+            for chunk in session.resume_ai.stream_chat_about_resume(message):
+                response += chunk
+                history[-1] = (message, response)
+                yield "", history, current_content, current_content, gr.update()
+
+    def clear_chat(request: gr.Request):
+        with sessions.use(request) as session:
+            session.ai_manager.conversations.clear(RESUME_SCOPE)
+        return None
 
     def toggle_freeze(is_frozen):
         return (
@@ -109,13 +139,13 @@ def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIMana
             gr.update(visible=not is_frozen),  # resume_editor
         )
 
-    def update_resume(content):
+    def update_resume(content, request: gr.Request):
         # Extract only the markdown content
         markdown_content = extract_markdown(content)
     
         # Update the resume with only the markdown content
-        context_manager.update_master_resume(markdown_content)
-        resume_manager.update_resume(markdown_content)
+        with sessions.use(request) as session:
+            session.resume_ai.update_resume(markdown_content, "Edited in the resume editor")
     
         return (
             markdown_content,  # update resume_display
@@ -123,6 +153,41 @@ def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIMana
             f"Resume Status: Updated (Length: {len(markdown_content)})"
         )
 
+    def version_label(entry):
+        label = f"v{entry['version']} - {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['created_at']))}"
+        return f"{label} - {entry['message'][:60]}" if entry.get("message") else label
+
+    def list_versions(request: gr.Request):
+        with sessions.use(request) as session:
+            versions = session.context_manager.resume_versions.log(limit=RESUME_HISTORY_LIST_SIZE)
+        choices = [version_label(entry) for entry in versions]
+        return gr.update(choices=choices, value=choices[0] if choices else None)
+
+    def selected_version(label):
+        return int(label.split(" ", 1)[0][1:]) if label else None
+
+    def show_changes(label, request: gr.Request):
+        version = selected_version(label)
+        if version is None:
+            return "Select a version first."
+        with sessions.use(request) as session:
+            versions = session.context_manager.resume_versions
+            head = versions.head()
+            if version == head:
+                return "This is the current version."
+            diff = versions.diff(version, head)
+        return f"```diff\n{diff}```" if diff else "No changes."
+
+    def restore_version(label, request: gr.Request):
+        version = selected_version(label)
+        if version is None:
+            return gr.update(), gr.update(), "Select a version first."
+        with sessions.use(request) as session:
+            # Restoring adds the old text as the newest version, so nothing in between is lost
+            content = session.context_manager.resume_versions.checkout(version)
+            session.resume_ai.update_resume(content, f"Restored v{version}")
+        return content, content, f"Restored v{version}."
+
     def extract_markdown(content):
         # Split the content by lines
         lines = content.split('\n')
@@ -133,27 +198,33 @@ def create_resume_tab(context_manager: CAPTAINContextManager, ai_manager: AIMana
         # Join the filtered lines back into a single string
         return '\n'.join(markdown_lines)
 
-    def handle_resume_edit(edit_request, current_content):
-        result = resume_ai.edit_resume(edit_request)
+    def handle_resume_edit(session, edit_request, current_content):
+        # edit_resume commits the edit itself; on failure the stored resume is shown, never the editor's text
+        result = session.resume_ai.edit_resume(edit_request)
         if isinstance(result, dict):
-            updated_resume = result.get('Updated Resume', current_content)
-            explanation = result.get('Edit Explanation', 'No changes made.')
-            
-            # Update the resume content
-            context_manager.update_master_resume(updated_resume)
-            resume_manager.update_resume(updated_resume)
-            
+            updated_resume = result.get('Updated Resume', session.context_manager.get_master_resume())
+            explanation = result.get('Explanation of Changes', result.get('error', 'No changes made.'))
+            if result.get('Diff'):
+                explanation += f"\n\n```diff\n{result['Diff']}```"
             return updated_resume, explanation
         else:
             return current_content, "Error: Unexpected response format from AI."
 
     # Event handlers
 
+    app.load(load_resume, outputs=[resume_display, resume_editor])
+
     add_resume_button.click(add_resume, inputs=[resume_file, resume_text_input], outputs=[resume_status, resume_display, resume_editor])
     resume_text_input.submit(add_resume, inputs=[resume_file, resume_text_input], outputs=[resume_status, resume_display, resume_editor])
     
     msg.submit(chat, inputs=[msg, chatbot, resume_editor], outputs=[msg, chatbot, resume_editor, resume_display, resume_status])
-    clear.click(lambda: None, None, chatbot, queue=False)
+    clear.click(clear_chat, outputs=[chatbot], queue=False)
+
+    app.load(list_versions, outputs=[version_dropdown])
+    refresh_versions_btn.click(list_versions, outputs=[version_dropdown])
+    show_changes_btn.click(show_changes, inputs=[version_dropdown], outputs=[version_diff])
+    restore_version_btn.click(restore_version, inputs=[version_dropdown], outputs=[resume_display, resume_editor, version_diff]) \
+        .then(list_versions, outputs=[version_dropdown])
 
     is_frozen.change(toggle_freeze, inputs=[is_frozen], outputs=[resume_display, resume_editor])
     update_resume_btn.click(update_resume, inputs=[resume_editor], outputs=[resume_display, resume_editor, resume_status])
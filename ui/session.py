@@ -0,0 +1,234 @@
+# ui/session.py
+
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from config import (SESSION_DATA_DIR, SESSION_MAX_ACTIVE, SESSION_IDLE_SECONDS, SESSION_PER_BROWSER,
+                    SESSION_COOKIE_NAME, SESSION_COOKIE_MAX_AGE_DAYS)
+from core.ai_manager import AIManager
+from core.context_manager import CAPTAINContextManager
+from core.data_manager import DataManager
+from core.resume_manager import ResumeManager
+from ai.resume_ai import ResumeAI
+from ai.captain_ai import CaptainAI
+from ai.job_opportunity_ai import JobOpportunityAI
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION_ID = "default"
+_UNSAFE_ID_CHARS = re.compile(r"[^A-Za-z0-9_-]")
+
+# Gives the browser a random, long-lived id the first time the page is opened; it is sent with every request
+SESSION_COOKIE_SCRIPT = f"""
+<script>
+if (!document.cookie.split("; ").some((c) => c.startsWith("{SESSION_COOKIE_NAME}="))) {{
+    const id = Array.from(crypto.getRandomValues(new Uint8Array(16)), (b) => b.toString(16).padStart(2, "0")).join("");
+    document.cookie = "{SESSION_COOKIE_NAME}=" + id + "; max-age={SESSION_COOKIE_MAX_AGE_DAYS * 24 * 60 * 60}; path=/; SameSite=Lax";
+}}
+</script>
+"""
+
+
+def session_id_for(request, per_browser: bool = SESSION_PER_BROWSER) -> str:
+    # gr.Request.session_hash changes on every page load, so it is never used: the id has to survive a refresh
+    if request is None:
+        return DEFAULT_SESSION_ID
+    username = getattr(request, "username", None)
+    if username:
+        return "user-" + hashlib.sha256(username.encode("utf-8")).hexdigest()[:32]
+    if per_browser:
+        try:
+            cookies = request.cookies
+        except AttributeError:
+            cookies = None
+        browser_id = _UNSAFE_ID_CHARS.sub("", str(cookies.get(SESSION_COOKIE_NAME) or ""))[:64] if cookies else ""
+        if browser_id:
+            return "browser-" + browser_id
+        # No cookie yet (or cookies disabled): keep the page to itself rather than sharing the default store
+        page_id = _UNSAFE_ID_CHARS.sub("", str(getattr(request, "session_hash", None) or ""))[:64]
+        if page_id:
+            return "page-" + page_id
+    return DEFAULT_SESSION_ID
+
+
+class Session:
+    """Per-user state: applications, resume and chat memory, backed by the session's own store."""
+
+    def __init__(self, session_id: str, shared_ai: AIManager, data_dir: Optional[str] = None):
+        self.session_id = session_id
+        self.context_manager = CAPTAINContextManager()
+        self.data_manager = DataManager(self.context_manager, data_dir=data_dir)
+        self.data_manager.load_state()
+        self.ai_manager = AIManager(response_cache=shared_ai.response_cache, prompt_registry=shared_ai.prompt_registry,
+                                    llm=shared_ai.llm, resume_summarizer=shared_ai.resume_summarizer,
+                                    transport=shared_ai.transport, single_flight=shared_ai.single_flight)
+        self.ai_manager.conversations.attach_store(self.data_manager.store)
+        # Summarize each new resume version in the background, before any prompt needs it
+        self.context_manager.add_resume_listener(self.ai_manager.resume_summarizer.schedule)
+        self.ai_manager.resume_summarizer.schedule(self.context_manager.get_master_resume())
+        self.resume_manager = ResumeManager()
+        self.resume_manager.update_resume(self.context_manager.get_resume_document())
+        self.resume_ai = ResumeAI(self.ai_manager, self.context_manager, self.resume_manager)
+        self.captain_ai = CaptainAI(self.ai_manager, self.context_manager)
+        self.job_ai = JobOpportunityAI(self.ai_manager, self.context_manager)
+        self.last_used = time.time()
+        # Handlers currently using the session (it is only evicted at zero) and spills still running.
+        # Both are guarded by the registry lock
+        self.users = 0
+        self.pending_spills = 0
+
+    def spill(self) -> None:
+        # Saves the snapshot and embeddings and folds the WAL, so the session can be dropped from memory
+        # and reloaded from disk when it comes back
+        self.data_manager.save_state()
+        self.data_manager.store.checkpoint()
+
+    def close(self) -> None:
+        self.data_manager.store.close()
+
+
+class SessionRegistry:
+    """Sessions keyed by user (see session_id_for), sharing one LLM client, response cache and prompt registry.
+
+    At most max_sessions stay in memory; idle ones, then the least recently used, are spilled to their store.
+    Sessions a handler is still using are never evicted. Requests without an identity use the single-user
+    data layout under DATA_DIR.
+    """
+
+    def __init__(self, shared_ai: Optional[AIManager] = None, base_dir: str = SESSION_DATA_DIR,
+                 max_sessions: int = SESSION_MAX_ACTIVE, idle_seconds: float = SESSION_IDLE_SECONDS,
+                 per_browser: bool = SESSION_PER_BROWSER):
+        self.shared_ai = shared_ai if shared_ai is not None else AIManager()
+        self.base_dir = base_dir
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.per_browser = per_browser
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        # Evicted sessions whose spill has not finished yet; a request for one revives it instead of
+        # loading a second copy on top of the same files
+        self._spilling: Dict[str, Session] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        if not per_browser:
+            logger.warning("SESSION_PER_BROWSER is off: visitors without a login share the single-user store")
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def head_html(self) -> Optional[str]:
+        # Markup for gr.Blocks(head=...) that gives each browser its session cookie
+        return SESSION_COOKIE_SCRIPT if self.per_browser else None
+
+    @contextmanager
+    def use(self, request=None) -> Iterator[Session]:
+        session = self.acquire(request)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def acquire(self, request=None) -> Session:
+        # Every acquire must be paired with release(); use() does both
+        session_id = session_id_for(request, self.per_browser)
+        with self._lock:
+            session = self._checkout(session_id)
+            load_lock = None if session is not None else self._load_locks.setdefault(session_id, threading.Lock())
+        if session is None:
+            # Loading reads the session's store, so it happens outside the registry lock; the per-id lock
+            # keeps two requests for the same session from loading it twice
+            with load_lock:
+                with self._lock:
+                    session = self._checkout(session_id)
+                if session is None:
+                    data_dir = None if session_id == DEFAULT_SESSION_ID else os.path.join(self.base_dir, session_id)
+                    loaded = Session(session_id, self.shared_ai, data_dir)
+                    with self._lock:
+                        session = self._checkout(session_id)
+                        if session is None:
+                            session = loaded
+                            session.users += 1
+                            self._sessions[session_id] = session
+                        self._load_locks.pop(session_id, None)
+        with self._lock:
+            evicted = self._collect_evictions()
+        for old_session in evicted:
+            self._spill(old_session)
+        return session
+
+    def release(self, session: Session) -> None:
+        with self._lock:
+            session.users = max(0, session.users - 1)
+            session.last_used = time.time()
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            evicted = self._collect_evictions()
+        for session in evicted:
+            self._spill(session)
+        return len(evicted)
+
+    def _checkout(self, session_id: str) -> Optional[Session]:
+        # Called with the lock held
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._spilling.get(session_id)
+            if session is None:
+                return None
+            self._sessions[session_id] = session
+        self._sessions.move_to_end(session_id)
+        session.users += 1
+        session.last_used = time.time()
+        return session
+
+    def _collect_evictions(self) -> List[Session]:
+        # Called with the lock held. Only sessions nobody is using are evicted, oldest first
+        cutoff = time.time() - self.idle_seconds
+        excess = len(self._sessions) - self.max_sessions
+        evicted = []
+        for session_id, session in list(self._sessions.items()):
+            if session.users > 0:
+                continue
+            if excess <= 0 and session.last_used >= cutoff:
+                break
+            del self._sessions[session_id]
+            self._spilling[session_id] = session
+            session.pending_spills += 1
+            evicted.append(session)
+            excess -= 1
+        return evicted
+
+    def _spill(self, session: Session) -> None:
+        dropped = False
+        try:
+            session.spill()
+        except Exception:
+            logger.exception("Error saving session %s", session.session_id)
+        finally:
+            with self._lock:
+                session.pending_spills -= 1
+                if session.pending_spills == 0 and self._spilling.get(session.session_id) is session:
+                    del self._spilling[session.session_id]
+                    # A request may have revived the session while it was being saved; it keeps its store then
+                    dropped = self._sessions.get(session.session_id) is not session
+        if dropped:
+            try:
+                session.close()
+            except Exception:
+                logger.exception("Error closing session %s", session.session_id)
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+            for session in sessions:
+                self._spilling[session.session_id] = session
+                session.pending_spills += 1
+        for session in sessions:
+            self._spill(session)
@@ -0,0 +1,188 @@
+# utils/document_text.py
+#
+# Text extraction for uploaded documents. Kept free of application imports so it
+# loads quickly in extraction worker processes.
+
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional
+
+try:
+    from PyPDF2 import PdfReader
+except ImportError:
+    PdfReader = None
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_TEXT_CHUNK_CHARS = 64 * 1024
+
+_LIGATURES = {"ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl", " ": " ",
+              "‐": "-", "‑": "-", "­": ""}
+_LIGATURE_PATTERN = re.compile("|".join(_LIGATURES))
+_BULLET = re.compile(r"^[•●▪◦‣⁃·■–—*]\s*")
+_PAGE_NUMBER = re.compile(r"^(?:page\s+)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?$", re.I)
+_HYPHENATED_BREAK = re.compile(r"(\w)-\n(\w)")
+_SENTENCE_END = re.compile(r"[.:;!?)\]]$")
+_SPACES = re.compile(r"[ \t]+")
+
+
+class DocumentTextError(ValueError):
+    pass
+
+
+def detect_format(path: str) -> str:
+    with open(path, "rb") as f:
+        head = f.read(8)
+    if head.startswith(b"%PDF"):
+        return "pdf"
+    if head.startswith(b"PK") and zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            if "word/document.xml" in archive.namelist():
+                return "docx"
+        raise DocumentTextError("Zip archive is not a Word document")
+    return "text"
+
+
+def iter_pdf_pages(path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    # Pages are parsed one at a time from the open file; only the current page's objects are in memory
+    if PdfReader is None:
+        raise DocumentTextError("PDF support requires the PyPDF2 package")
+    with open(path, "rb") as f:
+        reader = PdfReader(f)
+        if reader.is_encrypted:
+            raise DocumentTextError("Encrypted PDFs are not supported")
+        for number, page in enumerate(reader.pages):
+            if max_pages is not None and number >= max_pages:
+                return
+            yield page.extract_text() or ""
+
+
+def iter_docx_pages(path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    # document.xml is streamed out of the archive and each paragraph is discarded once read
+    lines: List[str] = []
+    pages = 0
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+        paragraph: List[str] = []
+        prefix = ""
+        for event, element in ET.iterparse(document, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == _WORD_NS + "p":
+                    paragraph, prefix = [], ""
+                continue
+            if tag == _WORD_NS + "t":
+                paragraph.append(element.text or "")
+            elif tag == _WORD_NS + "tab":
+                paragraph.append("\t")
+            elif tag == _WORD_NS + "br" and element.get(_WORD_NS + "type") != "page":
+                paragraph.append("\n")
+            elif tag == _WORD_NS + "pStyle":
+                style = element.get(_WORD_NS + "val", "")
+                if style.lower().startswith("heading") and style[-1:].isdigit():
+                    prefix = "#" * min(int(style[-1]), 6) + " "
+                elif style.lower() == "title":
+                    prefix = "# "
+            elif tag == _WORD_NS + "numPr":
+                prefix = prefix or "- "
+            elif tag == _WORD_NS + "p":
+                text = "".join(paragraph).strip()
+                if text:
+                    lines.append(prefix + text)
+                element.clear()
+            if (tag == _WORD_NS + "br" and element.get(_WORD_NS + "type") == "page") or tag == _WORD_NS + "sectPr":
+                if lines:
+                    yield "\n".join(lines)
+                    lines, pages = [], pages + 1
+                    if max_pages is not None and pages >= max_pages:
+                        return
+            elif tag == _WORD_NS + "body":
+                element.clear()
+    if lines:
+        yield "\n".join(lines)
+
+
+def iter_text_pages(path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    # Plain text has no pages; it is read in bounded chunks cut at line ends
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        carry = ""
+        while True:
+            chunk = f.read(_TEXT_CHUNK_CHARS)
+            if not chunk:
+                break
+            chunk = carry + chunk
+            cut = chunk.rfind("\n") + 1 or len(chunk)
+            carry = chunk[cut:]
+            yield chunk[:cut]
+        if carry:
+            yield carry
+
+
+def iter_document_pages(path: str, max_pages: Optional[int] = None) -> Iterator[str]:
+    extractors = {"pdf": iter_pdf_pages, "docx": iter_docx_pages, "text": iter_text_pages}
+    return extractors[detect_format(path)](path, max_pages)
+
+
+def _strip_running_lines(pages: List[List[str]]) -> None:
+    # Lines repeated at the top or bottom of most pages are headers/footers, not resume content
+    if len(pages) < 3:
+        return
+    edges = Counter()
+    for lines in pages:
+        edges.update({line for line in lines[:2] + lines[-2:]})
+    running = {line for line, count in edges.items() if count >= len(pages) // 2 + 1}
+    for lines in pages:
+        for position in (0, 1, -1, -2):
+            if lines and -len(lines) <= position < len(lines) and lines[position] in running:
+                lines[position] = ""
+
+
+def clean_document_text(pages: Iterable[str]) -> str:
+    """Layout cleanup for extracted text: drops page numbers and running headers/footers, undoes
+    hyphenation and hard line wraps, and turns bullet glyphs into Markdown list items."""
+    split_pages = []
+    for page in pages:
+        page = _LIGATURE_PATTERN.sub(lambda m: _LIGATURES[m.group(0)], page.replace("\r\n", "\n").replace("\r", "\n"))
+        page = _HYPHENATED_BREAK.sub(r"\1\2", page)
+        lines = [_SPACES.sub(" ", line).strip() for line in page.split("\n")]
+        split_pages.append([line for line in lines if not _PAGE_NUMBER.match(line)])
+    _strip_running_lines(split_pages)
+
+    paragraphs: List[str] = []
+    current: List[str] = []
+    for lines in split_pages:
+        for line in lines:
+            if not line:
+                if current:
+                    paragraphs.append(" ".join(current))
+                    current = []
+                continue
+            bullet = _BULLET.match(line)
+            if bullet or line.startswith("#"):
+                if current:
+                    paragraphs.append(" ".join(current))
+                current = ["- " + line[bullet.end():] if bullet else line]
+                if line.startswith("#"):
+                    paragraphs.append(current.pop())
+                continue
+            # A wrapped line continues the previous one when that did not end a sentence and this starts lowercase
+            if current and not _SENTENCE_END.search(current[-1]) and line[:1].islower():
+                current.append(line)
+            else:
+                if current:
+                    paragraphs.append(" ".join(current))
+                current = [line]
+    if current:
+        paragraphs.append(" ".join(current))
+    return "\n".join(paragraphs).strip()
+
+
+def extract_document_text(path: str, max_pages: Optional[int] = None) -> str:
+    # Entry point for extraction workers: pages stream straight into the cleanup pass. Parser errors on
+    # malformed files are reported as DocumentTextError so callers have one exception to handle
+    try:
+        return clean_document_text(iter_document_pages(path, max_pages))
+    except DocumentTextError:
+        raise
+    except Exception as e:
+        raise DocumentTextError(f"The file could not be read: {str(e)}") from e
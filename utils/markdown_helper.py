@@ -0,0 +1,37 @@
+# utils/markdown_helper.py
+
+import hashlib
+import re
+from typing import List, Tuple
+
+_HEADING_PATTERNS = {}
+
+
+def heading_pattern(level: int):
+    # Matches a heading of exactly this level ("## Skills" but not "### Skills")
+    if level not in _HEADING_PATTERNS:
+        _HEADING_PATTERNS[level] = re.compile(rf'^#{{{level}}}(?!#)[ \t]+(.+?)[ \t#]*$', re.M)
+    return _HEADING_PATTERNS[level]
+
+
+def split_markdown_sections(text: str, level: int = 2) -> List[Tuple[str, str]]:
+    """Split Markdown into (title, block) pairs at headings of the given level.
+
+    Each block keeps its heading line, and any text before the first heading is
+    returned with an empty title, so joining the blocks reproduces the input.
+    """
+    matches = list(heading_pattern(level).finditer(text))
+    if not matches:
+        return [("", text)] if text else []
+
+    sections = []
+    if matches[0].start() > 0:
+        sections.append(("", text[:matches[0].start()]))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections.append((match.group(1).strip(), text[match.start():end]))
+    return sections
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()